@@ -21,6 +21,14 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DECODE_RESPONSES: bool = True
+    REDIS_CLUSTER_MODE: bool = False  # REDIS_HOST/PORT is then any cluster seed node
+
+    # === SESSION STORE ===
+    SESSION_STORE_BACKEND: str = "redis"  # "redis" or "memory" (in-process, single node)
+    SESSION_STORE_TICK_MS: int = 100  # Expiry resolution of the in-process store
+
+    # === SESSION ENCODING ===
+    SESSION_CODEC: str = "hash"  # "hash" (readable HASH layout) or "msgpack" (compact binary)
 
     # === LANGGRAPH CONFIGURATION ===
     LANGGRAPH_CHECKPOINT_NS: str = "mcd_311_sessions"
@@ -31,9 +39,70 @@ class Settings(BaseSettings):
     OLLAMA_MODEL_DEEP: str = "neural-chat"  # Deep reasoning model
     OLLAMA_TIMEOUT: int = 30
 
+    # === TEXT-TO-SPEECH ===
+    TTS_ENGINE: str = "auto"  # "auto" (first local engine), "espeak", "pyttsx3" or "gtts" (network, legacy)
+    TTS_VOICE: str = "en"  # Engine voice name or language code (e.g. "hi" for Hindi)
+    TTS_RATE_WPM: int = 165  # Speaking rate, words per minute
+    TTS_TIMEOUT: int = 10  # Seconds allowed to synthesize one utterance
+    TTS_WORKERS: int = 0  # Synthesis threads (0 = one per core)
+    TTS_QUEUE_MAX: int = 256  # Queued utterances before submitters wait
+    PHRASE_CACHE_MAX_ENTRIES: int = 512  # Cached dynamic phrases (fixed prompts are pinned on top)
+    CLIP_LANGUAGES: str = "en,hi"  # Languages with pre-rendered digit / letter clips for spliced ids
+
+    # === AUDIO CODEC ===
+    OPUS_ENABLED: bool = True  # Offer Opus on /ws/call (needs opuslib + libopus); off = WAV / PCM only
+    OPUS_BITRATE_OUT: int = 24000  # Speech to the caller, bits/s
+    OPUS_BITRATE_IN: int = 16000  # Caller's microphone, bits/s (the browser encodes at this rate)
+
+    # === SPEECH-TO-TEXT ===
+    STT_ENABLED: bool = True  # Listen to the caller (needs faster-whisper); off = demo grievance text
+    STT_MODEL: str = "small"  # Whisper model size or path of a converted CTranslate2 model
+    STT_COMPUTE_TYPE: str = "int8"  # Quantization of the model weights on CPU
+    STT_CPU_THREADS: int = 2  # Threads per decoding pass
+    STT_MODEL_WORKERS: int = 2  # Decoding passes the model runs in parallel
+    STT_LANGUAGE: str = ""  # Whisper language code, e.g. "hi" ("" = detect per utterance)
+    STT_BEAM_SIZE: int = 1  # 1 = greedy decoding (fastest)
+    STT_PARTIAL_INTERVAL_MS: int = 600  # New audio between partial hypotheses
+    STT_MAX_BUFFER_SECONDS: int = 15  # Audio re-decoded per pass before trimming at the last commit
+    STT_LISTEN_TIMEOUT_SECONDS: int = 20  # How long listen_grievance waits for the caller
+    AUDIO_RING_SECONDS: int = 10  # Inbound audio buffered per call ahead of VAD / STT
+    AUDIO_RING_OVERFLOW: str = "drop_oldest"  # When full: drop_oldest | drop_newest (STT pool: always drop_newest)
+    STT_PROCESS_POOL: bool = True  # Decode in worker processes (all cores); off = threads in the server
+    STT_POOL_MIN_WORKERS: int = 1  # Workers started with the server (each loads the model)
+    STT_POOL_MAX_WORKERS: int = 0  # Upper bound when scaling up (0 = cores / STT_CPU_THREADS)
+    STT_POOL_SESSIONS_PER_WORKER: int = 4  # Calls on a worker before new calls get a new worker
+    STT_POOL_SCALE_UP_BACKLOG_SECONDS: float = 2.0  # Undecoded audio on a worker that also scales up
+    STT_POOL_IDLE_SECONDS: int = 120  # Workers above the minimum are stopped after this long without calls
+    VAD_ENERGY_MARGIN_DB: float = 12.0  # Frame energy above the noise floor that can be speech
+    VAD_MAX_FLATNESS: float = 0.45  # Spectral flatness above which a frame is noise (1 = white noise)
+    VAD_ONSET_FRAMES: int = 3  # Consecutive 20 ms speech frames that start an utterance
+    VAD_HANGOVER_MS: int = 300  # Speech held after the last speech frame (keeps word gaps)
+    VAD_END_OF_TURN_MS: int = 700  # Silence that ends the caller's turn
+
+    # === TRANSCRIPT WINDOW ===
+    TRANSCRIPT_WINDOW_TURNS: int = 12  # Turns kept verbatim; older ones are summarized (0 = unbounded)
+    TRANSCRIPT_SUMMARY_MAX_TOKENS: int = 120  # Budget of the rolling summary of evicted turns
+    PROMPT_CONTEXT_MAX_TOKENS: int = 400  # Budget of summary + recent turns in a prompt
+
+    # === ESCALATION POLICY ===
+    ESCALATION_POLICY_ENABLED: bool = True  # Decide routine complaints without the deep model
+    ESCALATION_SHADOW_SAMPLE_RATE: float = 0.05  # Share of policy decisions re-checked by the deep model
+
+    # === BATCH PROCESSING ===
+    BATCH_WORKERS: int = 2  # Worker processes for offline (text) grievances
+    BATCH_LLM_CONCURRENCY: int = 8  # Total in-flight LLM calls across all workers
+    BATCH_CHUNK_SIZE: int = 16  # Records handed to a worker at a time
+
+    # === PROFILING ===
+    PROFILING_ENABLED: bool = True  # Timing spans around nodes, LLM and Redis calls
+    PROFILE_WINDOW: int = 1000  # Samples kept per span for the rolling percentiles
+
     # === SESSION MANAGEMENT ===
     SESSION_TIMEOUT_SECONDS: int = 3600  # 1 hour session timeout
     SESSION_DATA_RETENTION_SECONDS: int = 10  # Auto-wipe after call ends
+    SESSION_FLUSH_POLICY: str = "node"  # Write-behind flush point: node, call or interval
+    SESSION_FLUSH_INTERVAL_MS: int = 250  # Used when SESSION_FLUSH_POLICY=interval
+    BULK_WIPE_BATCH_SIZE: int = 500  # Sessions per pipelined UNLINK batch
 
     # === LOGGING ===
     LOG_LEVEL: str = "INFO"
@@ -42,8 +111,14 @@ class Settings(BaseSettings):
 
     # === SYSTEM BEHAVIOR ===
     ENABLE_MEMORY_AUDIT: bool = True
+    AUDIT_STREAM_KEY: str = "audit:wipes"  # Capped stream of wipe events
+    AUDIT_RETENTION_SECONDS: int = 86400  # Keep audit 24 hours for compliance
+    AUDIT_STREAM_MAXLEN: int = 100000  # Hard cap on stream length during bursts
     ENABLE_DATA_SHREDDING: bool = True
     MAX_CALL_DURATION_SECONDS: int = 600  # 10 minute max call
+    CALL_BUDGET_FAST_MODEL_BELOW_SECONDS: int = 20  # Fast model replaces deep below this
+    CALL_BUDGET_TEMPLATE_BELOW_SECONDS: int = 5  # Template answers replace the LLM below this
+    CALL_BUDGET_WIPE_RESERVE_SECONDS: int = 2  # Kept for the wipe; skip straight to it below this
 
     class Config:
         env_file = ".env"
@@ -1,7 +1,7 @@
 import React, { useEffect, useRef } from 'react';
 
 interface AudioPlayerProps {
-  audioChunks: string[]; // Base64 encoded audio chunks
+  audioChunks: ArrayBuffer[]; // Audio frame payloads (WAV, or Opus decoded to WAV)
   isPlaying: boolean;
 }
 
@@ -16,15 +16,10 @@ export const AudioPlayer: React.FC<AudioPlayerProps> = ({ audioChunks, isPlaying
 
     if (audioChunks.length === 0) return;
 
-    const playAudioChunk = async (base64: string) => {
+    const playAudioChunk = async (chunk: ArrayBuffer) => {
       try {
-        const binaryString = atob(base64);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-          bytes[i] = binaryString.charCodeAt(i);
-        }
-
-        const audioBuffer = await audioContextRef.current!.decodeAudioData(bytes.buffer);
+        // decodeAudioData detaches its input; keep the chunk in state intact
+        const audioBuffer = await audioContextRef.current!.decodeAudioData(chunk.slice(0));
         const source = audioContextRef.current!.createBufferSource();
         source.buffer = audioBuffer;
         source.connect(audioContextRef.current!.destination);
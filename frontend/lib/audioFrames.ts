@@ -0,0 +1,107 @@
+// Binary audio frames on /ws/call (mirror of src/audio_frames.py).
+// 28-byte little-endian header, then the payload:
+//   magic "AU" | version u8 | codec u8 | sequence u32 | sampleRate u32 |
+//   timestamp u64 (ms) | session id (8 ASCII bytes, NUL padded)
+
+export const HEADER_SIZE = 28;
+const FRAME_VERSION = 1;
+const SESSION_ID_SIZE = 8;
+
+export enum Codec {
+  PCM16 = 0,
+  PCM_F32 = 1,
+  WAV = 2,
+  MP3 = 3,
+  OPUS = 4,
+}
+
+export interface AudioFrame {
+  sessionId: string;
+  sequence: number;
+  codec: Codec;
+  sampleRate: number;
+  timestampMs: number;
+  payload: ArrayBuffer;
+}
+
+export function encodeFrame(
+  sessionId: string,
+  sequence: number,
+  codec: Codec,
+  payload: ArrayBufferView,
+  sampleRate = 0
+): ArrayBuffer {
+  const frame = new Uint8Array(HEADER_SIZE + payload.byteLength);
+  const view = new DataView(frame.buffer);
+  frame[0] = 0x41; // 'A'
+  frame[1] = 0x55; // 'U'
+  view.setUint8(2, FRAME_VERSION);
+  view.setUint8(3, codec);
+  view.setUint32(4, sequence >>> 0, true);
+  view.setUint32(8, sampleRate, true);
+  view.setBigUint64(12, BigInt(Date.now()), true);
+  for (let i = 0; i < Math.min(sessionId.length, SESSION_ID_SIZE); i++) {
+    frame[20 + i] = sessionId.charCodeAt(i);
+  }
+  frame.set(new Uint8Array(payload.buffer, payload.byteOffset, payload.byteLength), HEADER_SIZE);
+  return frame.buffer;
+}
+
+export function decodeFrame(message: ArrayBuffer): AudioFrame | null {
+  if (message.byteLength < HEADER_SIZE) return null;
+  const view = new DataView(message);
+  if (view.getUint8(0) !== 0x41 || view.getUint8(1) !== 0x55) return null;
+  if (view.getUint8(2) !== FRAME_VERSION) return null;
+  const session = new Uint8Array(message, 20, SESSION_ID_SIZE);
+  let sessionId = '';
+  for (let i = 0; i < session.length && session[i] !== 0; i++) {
+    sessionId += String.fromCharCode(session[i]);
+  }
+  return {
+    sessionId,
+    sequence: view.getUint32(4, true),
+    codec: view.getUint8(3),
+    sampleRate: view.getUint32(8, true),
+    timestampMs: Number(view.getBigUint64(12, true)),
+    payload: message.slice(HEADER_SIZE),
+  };
+}
+
+// Web Audio float samples -> 16-bit PCM (half the bytes of Float32)
+export function floatTo16BitPCM(samples: Float32Array): Int16Array {
+  const pcm = new Int16Array(samples.length);
+  for (let i = 0; i < samples.length; i++) {
+    const s = Math.max(-1, Math.min(1, samples[i]));
+    pcm[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+  }
+  return pcm;
+}
+
+// Opus payloads: length-prefixed packets ([u16 LE length][packet] ...),
+// mirror of pack_packets / unpack_packets in src/opus_codec.py
+export function packPackets(packets: Uint8Array[]): Uint8Array {
+  const size = packets.reduce((total, packet) => total + 2 + packet.byteLength, 0);
+  const payload = new Uint8Array(size);
+  const view = new DataView(payload.buffer);
+  let offset = 0;
+  for (const packet of packets) {
+    view.setUint16(offset, packet.byteLength, true);
+    payload.set(packet, offset + 2);
+    offset += 2 + packet.byteLength;
+  }
+  return payload;
+}
+
+export function unpackPackets(payload: ArrayBuffer): Uint8Array[] {
+  const view = new DataView(payload);
+  const packets: Uint8Array[] = [];
+  let offset = 0;
+  while (offset + 2 <= payload.byteLength) {
+    const length = view.getUint16(offset, true);
+    offset += 2;
+    if (offset + length > payload.byteLength) break;
+    packets.push(new Uint8Array(payload, offset, length));
+    offset += length;
+  }
+  return packets;
+}
@@ -0,0 +1,137 @@
+// Opus in the browser, through WebCodecs. Used when the server negotiates
+// Opus on /ws/call (see pages/index.tsx); otherwise the call stays on
+// 16-bit PCM up and WAV down.
+// Payloads are length-prefixed 20 ms packets (packPackets / unpackPackets).
+
+import { packPackets, unpackPackets } from './audioFrames';
+
+const DECODE_SAMPLE_RATE = 48000;
+const PACKET_US = 20000; // Server packets are 20 ms (src/opus_codec.py FRAME_MS)
+
+export function opusSupported(): boolean {
+  return typeof window !== 'undefined' && 'AudioEncoder' in window && 'AudioDecoder' in window;
+}
+
+// Microphone -> Opus. Encoding is asynchronous: the packets produced so far
+// are taken with takePayload() and sent as one frame.
+export class OpusMicEncoder {
+  private encoder: AudioEncoder;
+  private packets: Uint8Array[] = [];
+  private timestampUs = 0;
+
+  constructor(private sampleRate: number, bitrate: number) {
+    this.encoder = new AudioEncoder({
+      output: (chunk) => {
+        const packet = new Uint8Array(chunk.byteLength);
+        chunk.copyTo(packet);
+        this.packets.push(packet);
+      },
+      error: (error) => console.error('Opus encoder error:', error),
+    });
+    this.encoder.configure({ codec: 'opus', sampleRate, numberOfChannels: 1, bitrate });
+  }
+
+  encode(samples: Float32Array) {
+    // AudioData copies the samples (the ScriptProcessor reuses its buffer)
+    const data = new AudioData({
+      format: 'f32-planar',
+      sampleRate: this.sampleRate,
+      numberOfFrames: samples.length,
+      numberOfChannels: 1,
+      timestamp: this.timestampUs,
+      data: samples,
+    });
+    this.timestampUs += (samples.length / this.sampleRate) * 1e6;
+    this.encoder.encode(data);
+    data.close();
+  }
+
+  takePayload(): Uint8Array | null {
+    if (this.packets.length === 0) return null;
+    const payload = packPackets(this.packets);
+    this.packets = [];
+    return payload;
+  }
+
+  close() {
+    if (this.encoder.state !== 'closed') this.encoder.close();
+  }
+}
+
+// Opus frames from the server -> WAV for the AudioPlayer. Frames are decoded
+// one after another, so each utterance comes out whole and in order.
+export class OpusPlayerDecoder {
+  private decoder: AudioDecoder;
+  private decoded: Float32Array[] = [];
+  private timestampUs = 0;
+  private queue: Promise<unknown> = Promise.resolve();
+
+  constructor() {
+    this.decoder = new AudioDecoder({
+      output: (data) => {
+        const samples = new Float32Array(data.numberOfFrames);
+        data.copyTo(samples, { planeIndex: 0, format: 'f32-planar' });
+        this.decoded.push(samples);
+        data.close();
+      },
+      error: (error) => console.error('Opus decoder error:', error),
+    });
+    this.decoder.configure({ codec: 'opus', sampleRate: DECODE_SAMPLE_RATE, numberOfChannels: 1 });
+  }
+
+  decode(payload: ArrayBuffer): Promise<ArrayBuffer> {
+    const result = this.queue.then(() => this.decodeFrame(payload));
+    this.queue = result.catch(() => undefined);
+    return result;
+  }
+
+  private async decodeFrame(payload: ArrayBuffer): Promise<ArrayBuffer> {
+    for (const packet of unpackPackets(payload)) {
+      this.decoder.decode(
+        new EncodedAudioChunk({ type: 'key', timestamp: this.timestampUs, data: packet })
+      );
+      this.timestampUs += PACKET_US;
+    }
+    await this.decoder.flush();
+    const length = this.decoded.reduce((total, part) => total + part.length, 0);
+    const samples = new Float32Array(length);
+    let offset = 0;
+    for (const part of this.decoded) {
+      samples.set(part, offset);
+      offset += part.length;
+    }
+    this.decoded = [];
+    return encodeWav(samples, DECODE_SAMPLE_RATE);
+  }
+
+  close() {
+    if (this.decoder.state !== 'closed') this.decoder.close();
+  }
+}
+
+// 16-bit mono WAV, which AudioContext.decodeAudioData plays
+function encodeWav(samples: Float32Array, sampleRate: number): ArrayBuffer {
+  const buffer = new ArrayBuffer(44 + samples.length * 2);
+  const view = new DataView(buffer);
+  const writeText = (offset: number, text: string) => {
+    for (let i = 0; i < text.length; i++) view.setUint8(offset + i, text.charCodeAt(i));
+  };
+  writeText(0, 'RIFF');
+  view.setUint32(4, 36 + samples.length * 2, true);
+  writeText(8, 'WAVE');
+  writeText(12, 'fmt ');
+  view.setUint32(16, 16, true);
+  view.setUint16(20, 1, true); // PCM
+  view.setUint16(22, 1, true); // Mono
+  view.setUint32(24, sampleRate, true);
+  view.setUint32(28, sampleRate * 2, true);
+  view.setUint16(32, 2, true);
+  view.setUint16(34, 16, true);
+  writeText(36, 'data');
+  view.setUint32(40, samples.length * 2, true);
+  for (let i = 0; i < samples.length; i++) {
+    const s = Math.max(-1, Math.min(1, samples[i]));
+    view.setInt16(44 + i * 2, s < 0 ? s * 0x8000 : s * 0x7fff, true);
+  }
+  return buffer;
+}
@@ -5,6 +5,8 @@ import { IntelligenceFeed } from '../components/IntelligenceFeed';
 import { SovereigntyMeter } from '../components/SovereigntyMeter';
 import { AudioPlayer } from '../components/AudioPlayer';
 import { LiveGrievanceReport } from '../components/LiveGrievanceReport';
+import { Codec, decodeFrame, encodeFrame, floatTo16BitPCM } from '../lib/audioFrames';
+import { OpusMicEncoder, OpusPlayerDecoder, opusSupported } from '../lib/opusCodec';
 
 interface SummaryItem {
   type: 'intent' | 'entity' | 'action';
@@ -18,12 +20,18 @@ export default function Home() {
   const [isLoading, setIsLoading] = useState(false);
   const [summaryItems, setSummaryItems] = useState<SummaryItem[]>([]);
   const [websocketMessages, setWebsocketMessages] = useState<any[]>([]);
-  const [audioChunks, setAudioChunks] = useState<string[]>([]);
+  const [audioChunks, setAudioChunks] = useState<ArrayBuffer[]>([]);
   const [isProcessing, setIsProcessing] = useState(false);
   const [isWipingMemory, setIsWipingMemory] = useState(false);
   const [dataPointsStored, setDataPointsStored] = useState(0);
   const socketRef = useRef<WebSocket | null>(null);
   const mediaStreamRef = useRef<MediaStream | null>(null);
+  const sessionIdRef = useRef('');
+  const audioSequenceRef = useRef(0);
+  // Negotiated Opus: bitrate for the microphone (0 = send PCM), decoder for playback
+  const opusInBitrateRef = useRef(0);
+  const micEncoderRef = useRef<OpusMicEncoder | null>(null);
+  const opusPlayerRef = useRef<OpusPlayerDecoder | null>(null);
 
   // Initialize WebSocket
   useEffect(() => {
@@ -46,6 +54,8 @@ export default function Home() {
 
     try {
       socketRef.current = new WebSocket(wsUrl);
+      // Audio arrives as binary frames; JSON is for control messages only
+      socketRef.current.binaryType = 'arraybuffer';
 
       socketRef.current.onopen = () => {
         console.log('WebSocket connected');
@@ -55,12 +65,40 @@ export default function Home() {
       };
 
       socketRef.current.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          const frame = decodeFrame(event.data);
+          if (frame && frame.codec === Codec.OPUS && opusPlayerRef.current) {
+            opusPlayerRef.current
+              .decode(frame.payload)
+              .then((wav) => setAudioChunks((prev) => [...prev, wav]))
+              .catch((error) => console.error('Error decoding Opus audio:', error));
+          } else if (frame) {
+            setAudioChunks((prev) => [...prev, frame.payload]);
+          }
+          return;
+        }
+
         const data = JSON.parse(event.data);
 
         // Store all messages for LiveGrievanceReport
         setWebsocketMessages((prev) => [...prev, data]);
 
-        if (data.type === 'text_chunk') {
+        if (data.type === 'session_started') {
+          sessionIdRef.current = data.session;
+          audioSequenceRef.current = 0;
+          // Codecs we can handle, preferred first; the server answers with 'codec'
+          socketRef.current?.send(
+            JSON.stringify({
+              type: 'negotiate',
+              codecs: opusSupported() ? ['opus', 'pcm16', 'wav'] : ['pcm16', 'wav'],
+            })
+          );
+        } else if (data.type === 'codec') {
+          if (data.outbound === 'opus' && !opusPlayerRef.current) {
+            opusPlayerRef.current = new OpusPlayerDecoder();
+          }
+          opusInBitrateRef.current = data.inbound === 'opus' ? data.inbound_bitrate : 0;
+        } else if (data.type === 'text_chunk') {
           setSummaryItems((prev) => [
             ...prev,
             {
@@ -70,8 +108,6 @@ export default function Home() {
               timestamp: Date.now(),
             },
           ]);
-        } else if (data.type === 'audio_chunk') {
-          setAudioChunks((prev) => [...prev, data.audio]);
         } else if (data.type === 'data_count') {
           setDataPointsStored(data.count);
         } else if (data.type === 'memory_wipe_start') {
@@ -104,6 +140,11 @@ export default function Home() {
       socketRef.current.close();
       socketRef.current = null;
     }
+    micEncoderRef.current?.close();
+    micEncoderRef.current = null;
+    opusPlayerRef.current?.close();
+    opusPlayerRef.current = null;
+    opusInBitrateRef.current = 0;
     if (mediaStreamRef.current) {
       mediaStreamRef.current.getTracks().forEach((track) => track.stop());
       mediaStreamRef.current = null;
@@ -122,16 +163,43 @@ export default function Home() {
       source.connect(processor);
       processor.connect(audioContext.destination);
 
+      // Opus encoder, once the server has agreed to it (PCM until then, or if it fails)
+      const micEncoder = () => {
+        if (!micEncoderRef.current && opusInBitrateRef.current) {
+          try {
+            micEncoderRef.current = new OpusMicEncoder(audioContext.sampleRate, opusInBitrateRef.current);
+          } catch (error) {
+            // The server drops frames outside the negotiated codec: renegotiate without Opus
+            console.error('Opus encoder unavailable, sending PCM:', error);
+            opusInBitrateRef.current = 0;
+            socketRef.current?.send(JSON.stringify({ type: 'negotiate', codecs: ['pcm16', 'wav'] }));
+          }
+        }
+        return micEncoderRef.current;
+      };
+
       processor.onaudioprocess = (event) => {
         const audioData = event.inputBuffer.getChannelData(0);
-        const base64Audio = btoa(String.fromCharCode(...new Uint8Array(audioData.buffer)));
 
-        if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
+        if (!socketRef.current || socketRef.current.readyState !== WebSocket.OPEN) return;
+        const encoder = micEncoder();
+        if (encoder) {
+          encoder.encode(audioData);
+          const payload = encoder.takePayload();
+          if (payload) {
+            socketRef.current.send(
+              encodeFrame(sessionIdRef.current, audioSequenceRef.current++, Codec.OPUS, payload)
+            );
+          }
+        } else {
           socketRef.current.send(
-            JSON.stringify({
-              type: 'audio_chunk',
-              audio: base64Audio,
-            })
+            encodeFrame(
+              sessionIdRef.current,
+              audioSequenceRef.current++,
+              Codec.PCM16,
+              floatTo16BitPCM(audioData),
+              audioContext.sampleRate
+            )
           );
         }
       };
@@ -3,10 +3,28 @@ MCD 311 Sovereign Voice AI - Core Modules
 Implements local LLM + zero-persistence memory architecture
 """
 
+import importlib
+
 from src.agent_state import AgentState, CallState, GrievanceCategory
-from src.memory_manager import memory_manager
-from src.llm_integration import sovereign_llm
-from src.workflow import create_sovereign_voice_ai_workflow
+
+# The service singletons connect to Redis/Ollama when their module is imported,
+# so they are resolved lazily. This keeps lightweight submodules (codecs,
+# benchmarks) importable without a running backend.
+_LAZY_EXPORTS = {
+    "memory_manager": "src.memory_manager",
+    "sovereign_llm": "src.llm_integration",
+    "redis_checkpointer": "src.checkpointer",
+    "create_sovereign_voice_ai_workflow": "src.workflow",
+    "get_compiled_workflow": "src.workflow",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    return getattr(importlib.import_module(module_name), name)
+
 
 __all__ = [
     "AgentState",
@@ -14,5 +32,7 @@ __all__ = [
     "GrievanceCategory",
     "memory_manager",
     "sovereign_llm",
+    "redis_checkpointer",
     "create_sovereign_voice_ai_workflow",
+    "get_compiled_workflow",
 ]
@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
+from src.transcript import Transcript
+
 
 class CallState(str, Enum):
     """Enumeration of possible call states in the FSM."""
@@ -36,11 +38,14 @@ class GrievanceCategory(str, Enum):
     OTHER = "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """
     Complete state object for a single citizen call session.
     This is the single source of truth for all session data.
+
+    Slotted (no per-instance __dict__) and the transcript is columnar
+    (src.transcript), so thousands of live sessions per worker stay small.
     
     Key Privacy Feature:
     - All data stored in Redis with TTL = SESSION_DATA_RETENTION_SECONDS
@@ -52,6 +57,7 @@ class AgentState:
     session_id: str
     call_timestamp: str
     call_duration_seconds: float = 0.0
+    call_deadline: float = 0.0  # Epoch seconds; 0 = no budget (see call_budget)
 
     # === CITIZEN DATA (ZERO-PERSISTENCE) ===
     citizen_phone: Optional[str] = None
@@ -74,30 +80,39 @@ class AgentState:
     assigned_department: str = ""
 
     # === INTERACTION TRANSCRIPT ===
-    # This is the only "log" - exists only in RAM
-    transcript: List[Dict[str, str]] = field(default_factory=list)
+    # This is the only "log" - exists only in RAM.
+    # Reads and appends like a list of entry dicts (a list is converted).
+    transcript: Transcript = field(default_factory=Transcript)
 
     # === REDIS CHECKPOINT ===
     # References to LangGraph checkpoint IDs
-    checkpoint_id: Optional[str] = None
+    # ("checkpoint_id" itself is reserved by LangGraph for its config keys)
+    graph_checkpoint_id: Optional[str] = None
     checkpoint_timestamp: Optional[str] = None
 
     # === METADATA ===
     system_metadata: Dict[str, Any] = field(default_factory=dict)
     error_logs: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        if not isinstance(self.transcript, Transcript):
+            self.transcript = Transcript(self.transcript)
+
+    @property
+    def checkpoint_id(self) -> Optional[str]:
+        """Former name of graph_checkpoint_id, kept for existing callers."""
+        return self.graph_checkpoint_id
+
+    @checkpoint_id.setter
+    def checkpoint_id(self, value: Optional[str]) -> None:
+        self.graph_checkpoint_id = value
+
     def add_transcript_entry(
         self, speaker: str, message: str, timestamp: str, confidence: float = 1.0
     ):
         """Add an entry to the session transcript."""
-        self.transcript.append(
-            {
-                "timestamp": timestamp,
-                "speaker": speaker,  # "citizen", "agent", "system"
-                "message": message,
-                "confidence": confidence,
-            }
-        )
+        # speaker: "citizen", "agent", "system"
+        self.transcript.add(speaker, message, timestamp, confidence)
 
     def to_redis_dict(self) -> Dict[str, Any]:
         """
@@ -108,6 +123,7 @@ class AgentState:
             "session_id": self.session_id,
             "call_timestamp": self.call_timestamp,
             "call_duration_seconds": self.call_duration_seconds,
+            "call_deadline": self.call_deadline,
             "citizen_phone": self.citizen_phone or "",
             "citizen_name": self.citizen_name or "",
             "citizen_location": self.citizen_location or "",
@@ -122,8 +138,8 @@ class AgentState:
             "confidence_score": self.confidence_score,
             "requires_escalation": str(self.requires_escalation),
             "assigned_department": self.assigned_department,
-            "transcript_count": len(self.transcript),
-            "checkpoint_id": self.checkpoint_id or "",
+            "transcript_count": self.transcript.total_turns,
+            "checkpoint_id": self.graph_checkpoint_id or "",
         }
 
     @staticmethod
@@ -135,6 +151,7 @@ class AgentState:
             session_id=data.get("session_id", ""),
             call_timestamp=data.get("call_timestamp", ""),
             call_duration_seconds=float(data.get("call_duration_seconds", 0)),
+            call_deadline=float(data.get("call_deadline", 0)),
             citizen_phone=data.get("citizen_phone") or None,
             citizen_name=data.get("citizen_name") or None,
             citizen_location=data.get("citizen_location") or None,
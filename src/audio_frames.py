@@ -0,0 +1,112 @@
+"""
+Binary Audio Frames for MCD 311 Sovereign Voice AI
+Wire format for audio on the /ws/call WebSocket, in both directions. Audio
+travels as binary WebSocket messages; JSON text messages carry control
+events only.
+
+Every frame is a fixed 28-byte little-endian header followed by the payload:
+
+    offset  size  field
+    0       2     magic        b"AU"
+    2       1     version      FRAME_VERSION
+    3       1     codec        Codec (PCM16, PCM_F32, WAV, MP3, OPUS)
+    4       4     sequence     uint32, per session and direction, from 0
+    8       4     sample_rate  uint32, Hz (0 for self-describing codecs)
+    12      8     timestamp    uint64, sender clock, ms since the epoch
+    20      8     session      ASCII session id, NUL padded
+
+decode_frame() does not copy: the payload is a memoryview into the
+received message. Consumers that keep audio beyond the call to their
+handler must copy it themselves (bytes(frame.payload)).
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Union
+
+MAGIC = b"AU"
+FRAME_VERSION = 1
+HEADER = struct.Struct("<2sBBIIQ8s")
+HEADER_SIZE = HEADER.size  # 28 bytes
+SESSION_ID_SIZE = 8
+
+
+class Codec(IntEnum):
+    """Payload encoding. Values are fixed by the wire format."""
+
+    PCM16 = 0  # Raw 16-bit little-endian mono PCM
+    PCM_F32 = 1  # Raw 32-bit float mono PCM (Web Audio's native format)
+    WAV = 2  # WAV container
+    MP3 = 3
+    OPUS = 4
+
+
+class FrameError(ValueError):
+    """A binary message that is not a valid audio frame."""
+
+
+@dataclass
+class AudioFrame:
+    """One decoded audio frame. payload is a view into the received message."""
+
+    session_id: str
+    sequence: int
+    codec: Codec
+    sample_rate: int
+    timestamp_ms: int
+    payload: memoryview
+
+
+def encode_frame(
+    session_id: str,
+    sequence: int,
+    codec: Codec,
+    payload: Union[bytes, bytearray, memoryview],
+    sample_rate: int = 0,
+    timestamp_ms: int = None,
+) -> bytes:
+    """Header + payload as one message (the payload is copied once, into the message)."""
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)
+    header = HEADER.pack(
+        MAGIC,
+        FRAME_VERSION,
+        int(codec),
+        sequence & 0xFFFFFFFF,
+        sample_rate,
+        timestamp_ms,
+        session_id.encode("ascii")[:SESSION_ID_SIZE],
+    )
+    return b"".join((header, payload))
+
+
+def decode_frame(message: Union[bytes, bytearray, memoryview]) -> AudioFrame:
+    """
+    Parse a binary message without copying the payload.
+
+    Raises:
+        FrameError: If the message is too short, has the wrong magic or
+            version, or an unknown codec
+    """
+    view = memoryview(message)
+    if view.nbytes < HEADER_SIZE:
+        raise FrameError(f"Audio frame too short: {view.nbytes} bytes")
+    magic, version, codec, sequence, sample_rate, timestamp_ms, session = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise FrameError("Not an audio frame (bad magic)")
+    if version != FRAME_VERSION:
+        raise FrameError(f"Unsupported audio frame version: {version}")
+    try:
+        codec = Codec(codec)
+    except ValueError:
+        raise FrameError(f"Unknown audio codec: {codec}")
+    return AudioFrame(
+        session_id=session.rstrip(b"\0").decode("ascii", "replace"),
+        sequence=sequence,
+        codec=codec,
+        sample_rate=sample_rate,
+        timestamp_ms=timestamp_ms,
+        payload=view[HEADER_SIZE:],
+    )
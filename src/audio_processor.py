@@ -5,10 +5,13 @@ Handles Text-to-Speech (TTS) and Speech-to-Text (STT) operations.
 
 import logging
 import base64
-import io
-import os
 import sys
-from gtts import gTTS
+
+from config.settings import settings
+from src.audio_frames import Codec
+from src.stt_engine import stt_engine, to_float32
+from src.tts_engines import SynthesizedAudio, TTSEngine, get_tts_engine
+from src.vad import VoiceActivityDetector
 
 # Windows-specific beep import
 if sys.platform == 'win32':
@@ -20,43 +23,58 @@ class AudioProcessor:
     """
     Handles audio processing operations.
     Current implementation:
-    - TTS: Uses gTTS (Google Text-to-Speech)
-    - STT: Placeholder/Mock (Frontend currently simulates text)
+    - TTS: Local engine selected by settings.TTS_ENGINE (see src/tts_engines.py)
+    - STT: Local Whisper via faster-whisper (see src/stt_engine.py)
     """
 
-    def __init__(self):
-        self.language = 'en'
-        self.tld = 'co.in' # Indian accent
-        logger.info("[OK] AudioProcessor initialized (gTTS)")
+    def __init__(self, engine: TTSEngine = None):
+        self.tts_engine = engine
+        if self.tts_engine is None:
+            try:
+                self.tts_engine = get_tts_engine(settings.TTS_ENGINE)
+            except (RuntimeError, ValueError) as e:
+                # The call flow still works as text; only the voice is missing
+                logger.error(f"TTS disabled: {e}")
+        engine_name = self.tts_engine.name if self.tts_engine else "none"
+        logger.info(f"[OK] AudioProcessor initialized (TTS: {engine_name})")
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        """
+        Synthesize text in memory.
+
+        Raises:
+            RuntimeError: If no TTS engine is available
+        """
+        if self.tts_engine is None:
+            raise RuntimeError("No TTS engine available")
+        return self.tts_engine.synthesize(text)
 
     def text_to_speech(self, text: str) -> str:
         """
-        Convert text to speech and return as base64 encoded string.
+        Convert text to speech and return as base64 encoded string (WAV).
         """
         try:
-            # Generate audio in memory
-            mp3_fp = io.BytesIO()
-            tts = gTTS(text=text, lang=self.language, tld=self.tld, slow=False)
-            tts.write_to_fp(mp3_fp)
-            
-            # Reset pointer
-            mp3_fp.seek(0)
-            
-            # Encode to base64
-            audio_bytes = mp3_fp.read()
-            audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
-            
-            return audio_b64
+            audio_bytes = self.synthesize(text).to_wav()
+            return base64.b64encode(audio_bytes).decode('utf-8')
         except Exception as e:
             logger.error(f"TTS Error: {e}")
             return None
 
-    def speech_to_text(self, audio_data: bytes) -> str:
+    def speech_to_text(self, audio_data: bytes, sample_rate: int = 16000) -> str:
         """
-        Convert audio bytes to text (STT).
-        Placeholder for future local Whisper implementation.
+        Convert 16-bit mono PCM to text (STT), locally.
+        Silence is stripped first (src/vad.py), so only speech is decoded.
+        Streaming calls use speech_inputs instead (src/stt_engine.py).
         """
-        pass
+        try:
+            samples = to_float32(audio_data, Codec.PCM16, sample_rate)
+            speech = VoiceActivityDetector().voiced(samples)
+            if speech.size == 0:
+                return ""
+            return stt_engine.transcribe_text(speech).text
+        except Exception as e:
+            logger.error(f"STT Error: {e}")
+            return None
 
     def play_status_beep(self, beep_type: str = 'start') -> None:
         """
@@ -0,0 +1,225 @@
+"""
+Inbound Audio Ring Buffer for MCD 311 Sovereign Voice AI
+Fixed-capacity, preallocated store for one call's microphone audio, between
+the WebSocket and the VAD / STT.
+
+- write() takes a frame payload as-is (bytes or memoryview, PCM16 or
+  PCM_F32) and converts it straight into the ring: 48 / 32 kHz audio is
+  decimated to 16 kHz by averaging into the ring's own storage, so no
+  per-frame arrays or bytes concatenation are created. Other rates fall
+  back to to_float32()'s interpolation.
+- peek() returns the unread audio as ONE contiguous, read-only NumPy view,
+  also across the wrap-around: the storage is twice the capacity and every
+  write is mirrored into the other half.
+- When the reader falls behind by more than the capacity, the overflow
+  policy decides: "drop_oldest" (keep the latest audio) or "drop_newest"
+  (keep what is queued, discard the incoming).
+- wipe() zeroes the storage (end of call, memory wipe).
+- The storage can live in a caller-provided buffer (a SharedMemory block,
+  see src/stt_pool.py): the writer and a reader in another process then
+  share the samples, and only positions travel between them. Such rings
+  use "drop_newest": the reader only reports what it consumed afterwards,
+  so the writer must not reclaim space it has not been given back.
+
+Not thread-safe: one writer and one reader on the same thread (SpeechInput
+uses it under its lock), or positions exchanged by message.
+"""
+
+import logging
+from typing import Union
+
+import numpy as np
+
+from config.settings import settings
+from src.audio_frames import Codec
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # Rate of the audio in the ring (Whisper's input rate)
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+
+def to_float32(payload, codec: Codec, sample_rate: int) -> np.ndarray:
+    """
+    Audio frame payload (PCM16 or PCM_F32) as 16 kHz float32.
+    Other rates are resampled by linear interpolation.
+
+    Raises:
+        ValueError: For codecs that need decoding first (WAV, MP3, OPUS)
+    """
+    if codec == Codec.PCM16:
+        samples = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+    elif codec == Codec.PCM_F32:
+        samples = np.frombuffer(payload, dtype="<f4")
+    else:
+        raise ValueError(f"Speech input needs raw PCM, got {codec.name}")
+    if sample_rate and sample_rate != SAMPLE_RATE and samples.size:
+        length = int(round(samples.size * SAMPLE_RATE / sample_rate))
+        positions = np.linspace(0, samples.size - 1, length, dtype=np.float64)
+        samples = np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+    return samples
+
+
+class AudioRingBuffer:
+    """One call's inbound audio: 16 kHz float32, fixed capacity."""
+
+    def __init__(self, capacity_seconds: float = None, overflow: str = None, buffer=None):
+        seconds = settings.AUDIO_RING_SECONDS if capacity_seconds is None else capacity_seconds
+        self.overflow = overflow or settings.AUDIO_RING_OVERFLOW
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown audio ring overflow policy '{self.overflow}'. "
+                f"Available: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.capacity = int(seconds * SAMPLE_RATE)
+        # Second half mirrors the first
+        if buffer is None:
+            self._storage = np.zeros(2 * self.capacity, dtype=np.float32)
+        else:
+            self._storage = np.ndarray((2 * self.capacity,), dtype=np.float32, buffer=buffer)
+        self._start = 0  # Samples ever read (absolute)
+        self._end = 0  # Samples ever written (absolute)
+        self._carry_sum = 0.0  # Input samples of a decimation group split across frames
+        self._carry_count = 0
+        self._carry_rate = 0
+        self.dropped_samples = 0  # Lost to overflow
+
+    @staticmethod
+    def storage_bytes(capacity_seconds: float) -> int:
+        """Size of the buffer a ring of this capacity needs."""
+        return 2 * int(capacity_seconds * SAMPLE_RATE) * np.dtype(np.float32).itemsize
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def read_position(self) -> int:
+        """Samples ever read (absolute stream position)."""
+        return self._start
+
+    @property
+    def write_position(self) -> int:
+        """Samples ever written (absolute stream position)."""
+        return self._end
+
+    def write(
+        self,
+        payload: Union[bytes, bytearray, memoryview, np.ndarray],
+        codec: Codec = Codec.PCM_F32,
+        sample_rate: int = SAMPLE_RATE,
+    ) -> None:
+        """
+        Add one frame's audio.
+
+        Raises:
+            ValueError: For codecs that need decoding first (WAV, MP3, OPUS)
+        """
+        rate = sample_rate or SAMPLE_RATE
+        if codec == Codec.PCM16:
+            source, scale = np.frombuffer(payload, dtype="<i2"), 1 / 32768.0
+        elif codec == Codec.PCM_F32:
+            source, scale = np.frombuffer(payload, dtype="<f4"), 1.0
+        else:
+            raise ValueError(f"Speech input needs raw PCM, got {codec.name}")
+
+        if rate % SAMPLE_RATE:
+            # No integer ratio (e.g. 44.1 kHz): interpolate, then store
+            self._store(to_float32(payload, codec, rate).reshape(-1, 1), 1.0)
+            return
+        step = rate // SAMPLE_RATE
+        if self._carry_rate != rate:
+            self._carry_sum, self._carry_count, self._carry_rate = 0.0, 0, rate
+
+        if self._carry_count:
+            # Complete the decimation group left open by the previous frame
+            head = source[: step - self._carry_count]
+            self._carry_sum += float(head.sum(dtype=np.float32)) * scale
+            self._carry_count += head.size
+            source = source[head.size :]
+            if self._carry_count < step:
+                return
+            self._store(np.array([[self._carry_sum]], dtype=np.float32), 1 / step)
+            self._carry_sum, self._carry_count = 0.0, 0
+
+        whole = source.size - source.size % step
+        if whole:
+            self._store(source[:whole].reshape(-1, step), scale / step)
+        if whole < source.size:
+            self._carry_sum = float(source[whole:].sum(dtype=np.float32)) * scale
+            self._carry_count = source.size - whole
+
+    def _store(self, groups: np.ndarray, scale: float) -> None:
+        """Write mean(group) * step * scale per row of groups, converting in place."""
+        count = groups.shape[0]
+        free = self.capacity - len(self)
+        if count > free:
+            dropped = self.dropped_samples
+            if self.overflow == "drop_newest":
+                self.dropped_samples += count - free
+                groups, count = groups[:free], free
+            else:
+                if count > self.capacity:
+                    self.dropped_samples += count - self.capacity
+                    groups, count = groups[-self.capacity :], self.capacity
+                lost = count - (self.capacity - len(self))
+                if lost > 0:
+                    self.dropped_samples += lost
+                    self._start += lost
+            logger.debug(
+                f"Audio ring overflow ({self.overflow}): "
+                f"{self.dropped_samples - dropped} samples dropped"
+            )
+        if count == 0:
+            return
+
+        position = self._end % self.capacity
+        target = self._storage[position : position + count]
+        np.add.reduce(groups, axis=1, dtype=np.float32, out=target)
+        if scale != 1.0:
+            target *= scale
+        # Mirror into the other half, so any window of <= capacity is contiguous
+        split = min(count, self.capacity - position)
+        self._storage[position + self.capacity : position + self.capacity + split] = target[:split]
+        if split < count:
+            self._storage[: count - split] = target[split:]
+        self._end += count
+
+    def peek(self, max_samples: int = None) -> np.ndarray:
+        """
+        The unread audio, oldest first, as a contiguous read-only view into the
+        ring. Valid until the next write(); advance() past what was used.
+        """
+        available = len(self)
+        if max_samples is not None:
+            available = min(available, max_samples)
+        return self.window(self._start, available)
+
+    def window(self, start: int, count: int) -> np.ndarray:
+        """
+        Read-only contiguous view of count samples from absolute position start
+        (count <= capacity). Used by readers that track their own position.
+        """
+        position = start % self.capacity
+        view = self._storage[position : position + count]
+        view.flags.writeable = False
+        return view
+
+    def advance(self, samples: int) -> None:
+        """Mark samples as read."""
+        self._start += min(samples, len(self))
+
+    def advance_to(self, position: int) -> None:
+        """Mark everything before absolute position as read."""
+        self._start = max(self._start, min(position, self._end))
+
+    def wipe(self) -> None:
+        """Zero all audio and forget the read / write positions."""
+        self._storage.fill(0.0)
+        self._start = self._end = 0
+        self._carry_sum, self._carry_count = 0.0, 0
+
+    def release(self) -> None:
+        """Wipe, then let go of the storage (so a shared buffer can be closed)."""
+        self.wipe()
+        self._storage = np.zeros(0, dtype=np.float32)
+        self.capacity = 0
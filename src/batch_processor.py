@@ -0,0 +1,396 @@
+"""
+Offline Batch Processor for MCD 311 Sovereign Voice AI
+Runs text grievances (SMS, web forms, email exports) through the FSM of voice
+calls, minus detail collection (TextGrievanceWorkflow): categorize ->
+escalation decision -> resolution -> memory wipe. A record's phone and
+location are its own; nothing is filled in.
+
+Input is streamed from a JSONL or CSV file, one grievance per record:
+    id, text (or description), location, phone, language, channel
+Only id and text are required.
+
+- Worker processes (BATCH_WORKERS, at most BATCH_LLM_CONCURRENCY) each run
+  one event loop and one compiled graph; every worker keeps at most
+  BATCH_LLM_CONCURRENCY // workers calls in flight, so the LLM pool never
+  sees more than BATCH_LLM_CONCURRENCY.
+- The parent reads the input lazily and keeps at most two chunks per worker
+  queued, so memory stays flat for any input size.
+- Each record gets its own session and ends in memory_wipe, exactly like a
+  call. A record that fails mid-graph is wiped explicitly.
+- A worker process that dies (e.g. out of memory) fails only the chunks it
+  had in flight: their records are written as failed and the pool is
+  restarted.
+- Results go to a JSONL sink as records complete. The sink holds outcomes
+  only (category, department, escalation) - never the text, phone or
+  location. Re-running with the same sink skips records that succeeded in
+  it; failed ones (status "failed") are retried.
+
+Usage:
+    python -m src.batch_processor grievances.jsonl --out results.jsonl
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNKS_PER_WORKER = 2  # Queued chunks per worker (bounds parent memory)
+TEXT_FIELDS = ("text", "description", "grievance")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one record. PII-free: safe to keep after the wipe."""
+
+    record_id: str
+    status: str  # "ok" or "failed"
+    channel: str = "text"
+    category: str = ""
+    confidence: float = 0.0
+    requires_escalation: bool = False
+    assigned_department: str = ""
+    escalation_path: str = ""
+    wiped: bool = False
+    latency_ms: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class BatchReport:
+    """Throughput summary for one run."""
+
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0  # Succeeded in an earlier run (in the sink)
+    pool_restarts: int = 0  # Worker process died, pool rebuilt
+    not_wiped: int = 0
+    escalated: int = 0
+    elapsed_seconds: float = 0.0
+    by_category: Dict[str, int] = field(default_factory=dict)
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    def add(self, result: BatchResult) -> None:
+        self.processed += 1
+        if result.status != "ok":
+            self.failed += 1
+        if not result.wiped:
+            self.not_wiped += 1
+        if result.requires_escalation:
+            self.escalated += 1
+        if result.category:
+            self.by_category[result.category] = self.by_category.get(result.category, 0) + 1
+        self.latencies_ms.append(result.latency_ms)
+
+    @property
+    def records_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2) if ordered else 0.0
+
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "pool_restarts": self.pool_restarts,
+            "not_wiped": self.not_wiped,
+            "escalated": self.escalated,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "records_per_second": round(self.records_per_second, 2),
+            "latency_p50_ms": pct(0.50),
+            "latency_p95_ms": pct(0.95),
+            "by_category": dict(self.by_category),
+        }
+
+
+# === INPUT / SINK ===
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream records from a .jsonl or .csv file, adding an id if missing."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            rows: Iterator[Dict[str, Any]] = csv.DictReader(handle)
+        else:
+            rows = (json.loads(line) for line in handle if line.strip())
+        for line_no, row in enumerate(rows, start=1):
+            row = {key: value for key, value in row.items() if value not in (None, "")}
+            row["id"] = str(row.get("id") or row.get("record_id") or f"line-{line_no}")
+            yield row
+
+
+def completed_ids(sink_path: str) -> Set[str]:
+    """Ids of records that succeeded in the sink (the resume point)."""
+    done: Set[str] = set()
+    if not os.path.exists(sink_path):
+        return done
+    with open(sink_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # Torn last line from an interrupted run
+            if result.get("status") == "ok" and "record_id" in result:
+                done.add(result["record_id"])
+    return done
+
+
+# === WORKER PROCESS ===
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_semaphore: Optional[asyncio.Semaphore] = None
+_worker_graph = None  # TextGrievanceWorkflow, compiled on first use
+
+
+def _init_worker(concurrency: int) -> None:
+    """Process pool initializer: one event loop per worker, reused for every chunk."""
+    global _worker_loop, _worker_semaphore
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_semaphore = asyncio.Semaphore(concurrency)
+
+
+def _process_chunk(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run one chunk of records in this worker. Returns BatchResult dicts."""
+    results = _worker_loop.run_until_complete(
+        asyncio.gather(*(_process_record(record) for record in records))
+    )
+    return [asdict(result) for result in results]
+
+
+async def _process_record(record: Dict[str, Any]) -> BatchResult:
+    """One record through the FSM, always ending in a wipe."""
+    global _worker_graph
+    # Imported in the worker: the graph and store clients are per process
+    from src.agent_state import AgentState, CallState
+    from src.checkpointer import redis_checkpointer
+    from src.session_cache import session_cache
+    from src.workflow import TextGrievanceWorkflow, run_call
+
+    channel = record.get("channel", "text")
+    text = next((record[key] for key in TEXT_FIELDS if record.get(key)), "")
+    if not text:
+        return BatchResult(record["id"], "failed", channel, wiped=True, error="empty grievance text")
+
+    state = AgentState(
+        session_id=f"batch_{uuid.uuid4().hex[:12]}",
+        call_timestamp=datetime.now().isoformat(),
+        citizen_phone=record.get("phone"),
+        citizen_location=record.get("location"),
+        citizen_language=record.get("language", "hindi"),
+        grievance_description=text,
+        system_metadata={"channel": channel},
+    )
+
+    async with _worker_semaphore:
+        start = time.perf_counter()
+        try:
+            if _worker_graph is None:
+                _worker_graph = TextGrievanceWorkflow().compile_graph()
+            final = await run_call(state, _worker_graph)
+        except Exception as e:
+            logger.error(f"✗ Batch record {record['id']} failed: {e}")
+            # Same guarantee as a call: nothing of this record may survive
+            await asyncio.to_thread(session_cache.memory_wipe_node, state)
+            await asyncio.to_thread(redis_checkpointer.mark_wiped, state.session_id)
+            return BatchResult(
+                record["id"],
+                "failed",
+                channel,
+                wiped=True,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                error=type(e).__name__,
+            )
+        latency_ms = (time.perf_counter() - start) * 1000
+
+    category = final.get("grievance_category")
+    return BatchResult(
+        record_id=record["id"],
+        status="ok",
+        channel=channel,
+        category=category.value if category else "",
+        confidence=final.get("confidence_score", 0.0),
+        requires_escalation=final.get("requires_escalation", False),
+        assigned_department=final.get("assigned_department", ""),
+        escalation_path=final.get("system_metadata", {}).get("escalation_path", ""),
+        wiped=final.get("current_state") == CallState.WIPED,
+        latency_ms=round(latency_ms, 2),
+    )
+
+
+# === PARENT ===
+
+
+class BatchProcessor:
+    """Streams an input file through a pool of workers into a results sink."""
+
+    def __init__(
+        self,
+        workers: int = None,
+        llm_concurrency: int = None,
+        chunk_size: int = None,
+        progress_every: int = 500,
+    ):
+        self.llm_concurrency = llm_concurrency or settings.BATCH_LLM_CONCURRENCY
+        # A worker keeps at least one call in flight: more workers than the
+        # LLM concurrency would exceed it
+        self.workers = min(workers or settings.BATCH_WORKERS, self.llm_concurrency)
+        self.per_worker = self.llm_concurrency // self.workers  # In-flight calls per worker
+        self.chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+        self.progress_every = progress_every
+
+    def run(self, input_path: str, sink_path: str) -> BatchReport:
+        """
+        Process every record of input_path that has not succeeded in sink_path.
+
+        Returns:
+            BatchReport for this run (skipped = records done by earlier runs)
+        """
+        report = BatchReport()
+        done = completed_ids(sink_path)
+        max_queued = self.workers * CHUNKS_PER_WORKER
+
+        logger.info(
+            f"Batch: {self.workers} workers x {self.per_worker} in-flight calls, "
+            f"{len(done)} records already done"
+        )
+
+        start = time.perf_counter()
+        # Chunk and the pool it was submitted to, per in-flight future
+        pending: Dict[Future, Tuple[List[Dict[str, Any]], ProcessPoolExecutor]] = {}
+        pool = self._new_pool()
+        try:
+            with open(sink_path, "a", encoding="utf-8") as sink:
+                for chunk in self._chunks(input_path, done, report):
+                    while len(pending) >= max_queued:
+                        pool = self._drain(pool, pending, sink, report, start)
+                    pool = self._submit(pool, chunk, pending, report)
+                while pending:
+                    pool = self._drain(pool, pending, sink, report, start)
+        finally:
+            pool.shutdown()
+
+        report.elapsed_seconds = time.perf_counter() - start
+        logger.info(f"✓ Batch complete: {report.to_dict()}")
+        return report
+
+    def _chunks(
+        self, input_path: str, done: Set[str], report: BatchReport
+    ) -> Iterator[List[Dict[str, Any]]]:
+        chunk: List[Dict[str, Any]] = []
+        for record in read_records(input_path):
+            if record["id"] in done:
+                report.skipped += 1
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.per_worker,)
+        )
+
+    def _restart(self, pool: ProcessPoolExecutor, report: BatchReport) -> ProcessPoolExecutor:
+        """Replace a pool whose worker process died."""
+        logger.error("✗ Batch worker process died, restarting the pool")
+        pool.shutdown(wait=False, cancel_futures=True)
+        report.pool_restarts += 1
+        return self._new_pool()
+
+    def _submit(
+        self, pool: ProcessPoolExecutor, chunk: List[Dict[str, Any]], pending, report: BatchReport
+    ) -> ProcessPoolExecutor:
+        try:
+            future = pool.submit(_process_chunk, chunk)
+        except BrokenProcessPool:
+            pool = self._restart(pool, report)
+            future = pool.submit(_process_chunk, chunk)
+        pending[future] = (chunk, pool)
+        return pool
+
+    def _drain(
+        self, pool: ProcessPoolExecutor, pending, sink, report: BatchReport, start: float
+    ) -> ProcessPoolExecutor:
+        """
+        Wait for a chunk, write what finished to the sink (a line there marks
+        the record done) and return the pool to use from now on. A chunk that
+        raised, or whose worker died, is written as failed, so the next run
+        retries it.
+        """
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            chunk, owner = pending.pop(future)
+            try:
+                results = future.result()
+            except BrokenProcessPool as e:
+                results = _failed_results(chunk, e)
+                if owner is pool:
+                    pool = self._restart(pool, report)
+            except Exception as e:
+                logger.error(f"✗ Batch chunk of {len(chunk)} records failed: {e}")
+                results = _failed_results(chunk, e)
+            for result in results:
+                sink.write(json.dumps(result) + "\n")
+                report.add(BatchResult(**result))
+                if report.processed % self.progress_every == 0:
+                    report.elapsed_seconds = time.perf_counter() - start
+                    logger.info(
+                        f"Batch progress: {report.processed} records, "
+                        f"{report.records_per_second:.1f}/s, {report.failed} failed"
+                    )
+        sink.flush()
+        return pool
+
+
+def _failed_results(chunk: List[Dict[str, Any]], error: Exception) -> List[Dict[str, Any]]:
+    """
+    Results for a chunk that never came back. Its records may not have reached
+    their wipe, so they are not reported as wiped (their keys expire by TTL).
+    """
+    return [
+        asdict(
+            BatchResult(record["id"], "failed", record.get("channel", "text"), error=type(error).__name__)
+        )
+        for record in chunk
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process a file of text grievances")
+    parser.add_argument("input", help="JSONL or CSV file of grievances")
+    parser.add_argument("--out", required=True, help="JSONL results sink (also the resume point)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--llm-concurrency", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    report = BatchProcessor(args.workers, args.llm_concurrency, args.chunk_size).run(
+        args.input, args.out
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
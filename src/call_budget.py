@@ -0,0 +1,203 @@
+"""
+Call Latency Budget for MCD 311 Sovereign Voice AI
+Every call carries a deadline (AgentState.call_deadline, wall-clock epoch
+seconds so it survives a checkpoint resume on another worker). The deadline
+is min(MAX_CALL_DURATION_SECONDS, SESSION_TIMEOUT_SECONDS) after the call
+starts, and nodes, LLM calls and Redis calls consult it.
+
+As the remaining budget shrinks the call degrades step by step:
+    NORMAL     full pipeline, deep model for escalation
+    FAST       below CALL_BUDGET_FAST_MODEL_BELOW_SECONDS: fast model instead of deep
+    TEMPLATE   below CALL_BUDGET_TEMPLATE_BELOW_SECONDS: no LLM, template answers
+    EXHAUSTED  within CALL_BUDGET_WIPE_RESERVE_SECONDS: skip straight to the wipe
+
+LLM and session-store calls are also cut off (asyncio.wait_for) so they
+always leave the wipe reserve. A call that still overruns is cancelled by the runner and
+force-wiped, so no call holds a worker past its deadline.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from config.settings import settings
+from src.agent_state import AgentState
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Escalation decision when there is no time left to ask a model:
+# a human officer follows up
+TEMPLATE_ESCALATION = {
+    "requires_escalation": True,
+    "escalation_reason": "Call time budget exhausted - routed to an officer",
+    "assigned_department": "MCD",
+}
+
+# Degradation stages, mildest first
+NORMAL = "normal"
+FAST = "fast"
+TEMPLATE = "template"
+EXHAUSTED = "exhausted"
+
+
+class CallBudget:
+    """Deadline bookkeeping and degradation counters for all calls."""
+
+    def __init__(
+        self,
+        budget_seconds: float = None,
+        fast_below_seconds: float = None,
+        template_below_seconds: float = None,
+        wipe_reserve_seconds: float = None,
+    ):
+        if budget_seconds is None:
+            budget_seconds = min(
+                settings.MAX_CALL_DURATION_SECONDS, settings.SESSION_TIMEOUT_SECONDS
+            )
+        self.budget_seconds = budget_seconds
+        self.fast_below_seconds = (
+            settings.CALL_BUDGET_FAST_MODEL_BELOW_SECONDS
+            if fast_below_seconds is None
+            else fast_below_seconds
+        )
+        self.template_below_seconds = (
+            settings.CALL_BUDGET_TEMPLATE_BELOW_SECONDS
+            if template_below_seconds is None
+            else template_below_seconds
+        )
+        self.wipe_reserve_seconds = (
+            settings.CALL_BUDGET_WIPE_RESERVE_SECONDS
+            if wipe_reserve_seconds is None
+            else wipe_reserve_seconds
+        )
+
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "calls": 0,
+            "fast_model": 0,  # Deep model swapped for the fast one
+            "template": 0,  # LLM call replaced by a template answer
+            "llm_timeouts": 0,  # LLM call cut off at the budget
+            "store_timeouts": 0,  # Session-store call cut off at the budget
+            "forced_wipes": 0,  # Reached the wipe with the budget exhausted
+            "overruns": 0,  # Runner had to cancel the graph
+        }
+
+    def start(self, state: AgentState) -> None:
+        """Give the call its deadline, unless it already has one (resume)."""
+        if state.call_deadline:
+            return
+        state.call_deadline = time.time() + self.budget_seconds
+        self.count("calls")
+
+    def remaining(self, state: AgentState) -> float:
+        """Seconds left before the deadline (inf if the call has none)."""
+        if not state.call_deadline:
+            return math.inf
+        return state.call_deadline - time.time()
+
+    def stage(self, state: AgentState) -> str:
+        """Current degradation stage of the call."""
+        remaining = self.remaining(state)
+        if remaining <= self.wipe_reserve_seconds:
+            return EXHAUSTED
+        if remaining < self.template_below_seconds:
+            return TEMPLATE
+        if remaining < self.fast_below_seconds:
+            return FAST
+        return NORMAL
+
+    def session_ttl(self, state: AgentState) -> int:
+        """
+        Redis TTL for the session: the rest of the budget plus the normal
+        retention, so Redis expires the data even if this worker dies.
+        """
+        remaining = self.remaining(state)
+        if math.isinf(remaining):
+            return settings.SESSION_DATA_RETENTION_SECONDS
+        return max(0, math.ceil(remaining)) + settings.SESSION_DATA_RETENTION_SECONDS
+
+    def hard_timeout(self, state: AgentState) -> float:
+        """How long the runner waits for the graph before force-wiping."""
+        return max(0.0, self.remaining(state))
+
+    @staticmethod
+    def elapsed(state: AgentState) -> float:
+        """Seconds since initiate_call stamped the call."""
+        try:
+            started = datetime.fromisoformat(state.call_timestamp)
+        except (TypeError, ValueError):
+            return state.call_duration_seconds
+        return (datetime.now() - started).total_seconds()
+
+    async def run_llm(
+        self,
+        state: AgentState,
+        call: Callable[[], Awaitable[T]],
+        fallback: Callable[[], T],
+        name: str,
+    ) -> T:
+        """
+        Run an LLM call within the budget, leaving the wipe reserve.
+        Falls back to the template answer if there is no time to start it
+        or it does not finish in time.
+        """
+        timeout = self.remaining(state) - self.wipe_reserve_seconds
+        if self.stage(state) in (TEMPLATE, EXHAUSTED):
+            self.count("template")
+            logger.warning(f"⏱ {name}: {timeout:.1f}s left, using template answer")
+            return fallback()
+        try:
+            return await asyncio.wait_for(call(), timeout=None if math.isinf(timeout) else timeout)
+        except asyncio.TimeoutError:
+            self.count("llm_timeouts")
+            logger.warning(f"⏱ {name}: LLM call cut off at the call budget")
+            return fallback()
+
+    async def run_store(
+        self,
+        state: AgentState,
+        call: Callable[[], Awaitable[T]],
+        name: str,
+        reserve: bool = True,
+    ) -> Optional[T]:
+        """
+        Run a session-store (Redis) call within the budget. With reserve the
+        call leaves the wipe reserve and is skipped (None) if there is no time
+        for it; the write-behind cache still holds the state for the wipe.
+        The wipe's own calls (reserve=False) may use all that is left, and a
+        cut-off raises TimeoutError so the runner force-wipes.
+        """
+        timeout = self.remaining(state) - (self.wipe_reserve_seconds if reserve else 0.0)
+        if math.isinf(timeout):
+            return await call()
+        try:
+            if reserve and timeout <= 0:
+                raise asyncio.TimeoutError
+            return await asyncio.wait_for(call(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            self.count("store_timeouts")
+            if not reserve:
+                raise
+            logger.warning(f"⏱ {name}: session store call cut off at the call budget")
+            return None
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get_budget_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        stats["budget_seconds"] = self.budget_seconds
+        return stats
+
+
+# Global call budget
+call_budget = CallBudget()
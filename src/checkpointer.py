@@ -0,0 +1,596 @@
+"""
+Redis-backed LangGraph Checkpointer for MCD 311 Sovereign Voice AI
+Lets an in-flight call resume on another worker after a crash, without
+replaying the LLM calls of nodes that already finished.
+
+All checkpoints for a call live in ONE Redis hash, checkpoint:{session_id}
+(the thread_id is the session_id), so:
+- the hash shares the session's hash tag and slot on a cluster,
+- it gets the session TTL (the rest of the call budget plus the retention,
+  as CallBudget.session_ttl) and is hard-deleted by memory_wipe_node with
+  the rest of the session keys,
+- loading the latest checkpoint is a single HGETALL.
+
+Hash fields (prefixed with settings.LANGGRAPH_CHECKPOINT_NS):
+    <ns>/cp/<checkpoint_ns>/<checkpoint_id>                      checkpoint + metadata + parent
+    <ns>/blob/<checkpoint_ns>/<version>/<channel>                one channel value
+    <ns>/writes/<checkpoint_ns>/<checkpoint_id>/<task_id>/<idx>  pending write
+
+Checkpoints are stored as incremental deltas: a checkpoint record holds only
+channel versions, and a put writes blobs only for the channels that changed
+in that step. Nodes here return the whole AgentState, so LangGraph bumps the
+version of every field on every step; a blob whose bytes match the channel's
+previous value is stored as a short reference to it instead of a copy.
+
+Transcript channel values are stored in their own columnar binary form
+(SessionSerializer); everything else goes through LangGraph's serializer.
+
+Nothing is written to disk. A checkpoint whose state is WIPED is never
+stored - the thread is deleted instead, so the final checkpoint after
+memory_wipe cannot bring citizen data back.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from config.settings import settings
+from src.agent_state import CallState
+from src.memory_manager import memory_manager
+from src.profiling import profiler
+from src.session_keys import checkpoint_key
+from src.transcript import Transcript
+
+logger = logging.getLogger(__name__)
+
+FIELD_SEP = "/"
+VALUE_SEP = b"\x00"
+REF_TYPE = "ref"  # Blob value that points at an identical earlier version
+TRANSCRIPT_TYPE = "transcript"  # Blob value holding Transcript.to_bytes()
+
+# Threads tracked in-process (delta digests, write fields, wipe tombstones)
+MAX_TRACKED_THREADS = 10000
+
+
+def _pack(*parts: bytes) -> bytes:
+    """Join header parts and a trailing binary payload into one hash value."""
+    return VALUE_SEP.join(parts)
+
+
+def _unpack(value: bytes, parts: int) -> List[bytes]:
+    """Split a hash value packed by _pack (the payload may contain separators)."""
+    return value.split(VALUE_SEP, parts - 1)
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _pack_typed(typed: Tuple[str, bytes]) -> bytes:
+    return _pack(typed[0].encode(), typed[1])
+
+
+def _unpack_typed(value: bytes) -> Tuple[str, bytes]:
+    type_, data = _unpack(value, 2)
+    return type_.decode(), data
+
+
+@dataclass
+class _ThreadState:
+    """What this worker remembers about a thread it is checkpointing."""
+
+    # (checkpoint_ns, channel) -> (digest, version holding the full bytes)
+    last_blobs: Dict[Tuple[str, str], Tuple[bytes, str]] = field(default_factory=dict)
+    # checkpoint_id -> pending-write fields stored against it
+    write_fields: Dict[str, List[str]] = field(default_factory=dict)
+    call_deadline: float = 0.0  # Last seen AgentState.call_deadline (sets the TTL)
+
+
+class SessionSerializer(JsonPlusSerializer):
+    """LangGraph's serializer, plus the columnar Transcript."""
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        if isinstance(obj, Transcript):
+            return TRANSCRIPT_TYPE, obj.to_bytes()
+        return super().dumps_typed(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        if data[0] == TRANSCRIPT_TYPE:
+            return Transcript.from_bytes(data[1])
+        return super().loads_typed(data)
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpoint saver storing each call's checkpoints in one
+    RAM-only Redis hash. Mirrors the semantics of LangGraph's InMemorySaver.
+
+    The client must return raw bytes (decode_responses=False), e.g.
+    MemoryManager.binary_client. Any SessionStore works, including the
+    in-process store.
+    """
+
+    def __init__(
+        self,
+        client,
+        namespace: str = None,
+        ttl_seconds: int = None,
+        serde=None,
+    ):
+        super().__init__(serde=serde or SessionSerializer())
+        self.client = client
+        self.namespace = namespace or settings.LANGGRAPH_CHECKPOINT_NS
+        # Retention after the call deadline (as CallBudget.session_ttl), refreshed
+        # on every put; the whole TTL for calls without a deadline
+        self.ttl_seconds = ttl_seconds or settings.SESSION_DATA_RETENTION_SECONDS
+
+        self._threads: "OrderedDict[str, _ThreadState]" = OrderedDict()
+        # Wiped threads: late (async) checkpoint writes for them are dropped
+        self._wiped: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.blobs_written = 0
+        self.blobs_deduplicated = 0
+
+    # === IN-PROCESS BOOKKEEPING ===
+
+    def _thread(self, thread_id: str) -> _ThreadState:
+        """Bookkeeping for a thread (caller holds the lock). LRU-capped."""
+        thread = self._threads.get(thread_id)
+        if thread is None:
+            thread = self._threads[thread_id] = _ThreadState()
+            while len(self._threads) > MAX_TRACKED_THREADS:
+                self._threads.popitem(last=False)
+        else:
+            self._threads.move_to_end(thread_id)
+        return thread
+
+    def _is_wiped(self, thread_id: str) -> bool:
+        with self._lock:
+            return thread_id in self._wiped
+
+    def mark_wiped(self, thread_id: str) -> None:
+        """
+        Called by the memory wipe. Deletes the thread's checkpoints and drops
+        any checkpoint write for it that LangGraph flushes after the wipe.
+        """
+        with self._lock:
+            self._wiped[thread_id] = None
+            while len(self._wiped) > MAX_TRACKED_THREADS:
+                self._wiped.popitem(last=False)
+        self.delete_thread(thread_id)
+
+    def _ttl(self, thread_id: str) -> int:
+        """Hash TTL: the rest of the call's budget plus the retention."""
+        with self._lock:
+            deadline = self._thread(thread_id).call_deadline
+        if not deadline:
+            return self.ttl_seconds
+        return max(0, math.ceil(deadline - time.time())) + self.ttl_seconds
+
+    # === FIELD LAYOUT ===
+
+    def _field(self, kind: str, *parts: str) -> str:
+        return FIELD_SEP.join((self.namespace, kind, *parts))
+
+    def _load_thread(self, thread_id: str) -> Dict[str, Dict]:
+        """
+        Read a thread's hash in one round trip and group it by field kind.
+
+        Returns:
+            {"cp": {(ns, id): value}, "blob": {(ns, channel, version): value},
+             "writes": {(ns, id): {(task_id, idx): value}}}
+        """
+        raw = self.client.hgetall(checkpoint_key(thread_id)) or {}
+        grouped: Dict[str, Dict] = {"cp": {}, "blob": {}, "writes": {}}
+        prefix = self.namespace + FIELD_SEP
+
+        for hash_field, value in raw.items():
+            hash_field = _text(hash_field)
+            if not hash_field.startswith(prefix):
+                continue
+            kind, rest = hash_field[len(prefix) :].split(FIELD_SEP, 1)
+            if kind == "cp":
+                checkpoint_ns, checkpoint_id = rest.split(FIELD_SEP)
+                grouped["cp"][(checkpoint_ns, checkpoint_id)] = value
+            elif kind == "blob":
+                checkpoint_ns, version, channel = rest.split(FIELD_SEP, 2)
+                grouped["blob"][(checkpoint_ns, channel, version)] = value
+            elif kind == "writes":
+                checkpoint_ns, checkpoint_id, task_id, idx = rest.split(FIELD_SEP)
+                grouped["writes"].setdefault((checkpoint_ns, checkpoint_id), {})[
+                    (task_id, int(idx))
+                ] = value
+        return grouped
+
+    def _load_blobs(
+        self, blobs: Dict, checkpoint_ns: str, versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        """Channel values for a checkpoint, following delta references."""
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            value = blobs.get((checkpoint_ns, channel, str(version)))
+            if value is None:
+                continue
+            type_, data = _unpack_typed(value)
+            if type_ == REF_TYPE:
+                value = blobs.get((checkpoint_ns, channel, data.decode()))
+                if value is None:
+                    continue
+                type_, data = _unpack_typed(value)
+            if type_ == "empty":
+                continue
+            values[channel] = self.serde.loads_typed((type_, data))
+        return values
+
+    def _pending_writes(self, writes: Dict) -> List[Tuple[str, str, Any]]:
+        """Pending writes in LangGraph's canonical order."""
+        unpacked = []
+        for (task_id, idx), value in writes.items():
+            channel, task_path, type_, data = _unpack(value, 4)
+            unpacked.append((task_id, idx, channel.decode(), task_path.decode(), type_, data))
+        unpacked.sort(key=lambda w: (w[3], w[0], w[1]))
+        return [
+            (task_id, channel, self.serde.loads_typed((type_.decode(), data)))
+            for task_id, _, channel, _, type_, data in unpacked
+        ]
+
+    def _build_tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        grouped: Dict[str, Dict],
+    ) -> CheckpointTuple:
+        checkpoint, metadata, parent_checkpoint_id = self.serde.loads_typed(
+            _unpack_typed(grouped["cp"][(checkpoint_ns, checkpoint_id)])
+        )
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    grouped["blob"], checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=metadata,
+            pending_writes=self._pending_writes(
+                grouped["writes"].get((checkpoint_ns, checkpoint_id), {})
+            ),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    # === BaseCheckpointSaver API ===
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Latest checkpoint for the thread, or the one named in the config."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        grouped = self._load_thread(thread_id)
+
+        checkpoint_id = get_checkpoint_id(config)
+        if not checkpoint_id:
+            ids = [cid for (ns, cid) in grouped["cp"] if ns == checkpoint_ns]
+            if not ids:
+                return None
+            checkpoint_id = max(ids)
+        elif (checkpoint_ns, checkpoint_id) not in grouped["cp"]:
+            return None
+
+        return self._build_tuple(thread_id, checkpoint_ns, checkpoint_id, grouped)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Checkpoints of one thread, newest first. Listing across all threads
+        is not supported: it would need a keyspace SCAN over citizen data.
+        """
+        if not config:
+            raise ValueError("RedisCheckpointSaver.list needs a thread_id in the config")
+
+        thread_id = config["configurable"]["thread_id"]
+        config_checkpoint_ns = config["configurable"].get("checkpoint_ns")
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_checkpoint_id = get_checkpoint_id(before) if before else None
+        grouped = self._load_thread(thread_id)
+
+        for checkpoint_ns, checkpoint_id in sorted(
+            grouped["cp"], key=lambda k: k[1], reverse=True
+        ):
+            if config_checkpoint_ns is not None and checkpoint_ns != config_checkpoint_ns:
+                continue
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+            if before_checkpoint_id and checkpoint_id >= before_checkpoint_id:
+                continue
+
+            result = self._build_tuple(thread_id, checkpoint_ns, checkpoint_id, grouped)
+            if filter and not all(
+                result.metadata.get(key) == value for key, value in filter.items()
+            ):
+                continue
+
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield result
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store one checkpoint: its record plus blobs for the channels that
+        changed (new_versions), in a single pipelined round trip.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        next_config = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        # Never checkpoint a wiped session
+        if self._is_wiped(thread_id):
+            return next_config
+        if values.get("current_state") == CallState.WIPED:
+            self.mark_wiped(thread_id)
+            return next_config
+
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+        with self._lock:
+            thread = self._thread(thread_id)
+            thread.call_deadline = values.get("call_deadline") or thread.call_deadline
+            superseded = list(thread.write_fields.get(parent_checkpoint_id, []))
+        ttl = self._ttl(thread_id)
+        mapping, stored = self._blob_mapping(thread_id, checkpoint_ns, new_versions, values)
+        mapping[self._field("cp", checkpoint_ns, checkpoint["id"])] = _pack_typed(
+            self.serde.dumps_typed(
+                (
+                    c,
+                    get_checkpoint_metadata(config, metadata),
+                    parent_checkpoint_id,
+                )
+            )
+        )
+
+        key = checkpoint_key(thread_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.hset(key, mapping=mapping)
+        # The parent's pending writes are now folded into this checkpoint
+        if superseded:
+            pipe.hdel(key, *superseded)
+        pipe.expire(key, ttl)
+        existed = pipe.execute()[0]
+        with self._lock:
+            self._thread(thread_id).write_fields.pop(parent_checkpoint_id, None)
+
+        if not existed and parent_checkpoint_id:
+            # The hash expired between steps: earlier blobs (and anything our
+            # references point at) are gone, so write every current value in full
+            logger.warning(f"Checkpoints for session {thread_id} expired mid-call; rewriting")
+            with self._lock:
+                self._thread(thread_id).last_blobs.clear()
+            mapping, stored = self._blob_mapping(
+                thread_id, checkpoint_ns, c["channel_versions"], values
+            )
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, ttl)
+            pipe.execute()
+
+        self._remember_blobs(thread_id, stored)
+        return next_config
+
+    def _blob_mapping(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        versions: ChannelVersions,
+        values: Dict[str, Any],
+    ) -> Tuple[Dict[str, bytes], Dict[Tuple[str, str], Optional[Tuple[bytes, str]]]]:
+        """
+        Hash fields for the given channel versions. A value identical to the
+        channel's last stored value becomes a reference to that version.
+
+        Returns:
+            (mapping, stored): stored holds the last_blobs entries to record
+            once the mapping is written (None: channel now empty)
+        """
+        mapping: Dict[str, bytes] = {}
+        stored: Dict[Tuple[str, str], Optional[Tuple[bytes, str]]] = {}
+        with self._lock:
+            last_blobs = self._thread(thread_id).last_blobs
+            for channel, version in versions.items():
+                version = str(version)
+                hash_field = self._field("blob", checkpoint_ns, version, channel)
+                if channel not in values:
+                    mapping[hash_field] = _pack(b"empty", b"")
+                    stored[(checkpoint_ns, channel)] = None
+                    continue
+
+                value = _pack_typed(self.serde.dumps_typed(values[channel]))
+                digest = hashlib.blake2b(value, digest_size=16).digest()
+                previous = last_blobs.get((checkpoint_ns, channel))
+                if previous is not None and previous[0] == digest:
+                    mapping[hash_field] = _pack(REF_TYPE.encode(), previous[1].encode())
+                    self.blobs_deduplicated += 1
+                else:
+                    mapping[hash_field] = value
+                    stored[(checkpoint_ns, channel)] = (digest, version)
+                    self.blobs_written += 1
+        return mapping, stored
+
+    def _remember_blobs(
+        self, thread_id: str, stored: Dict[Tuple[str, str], Optional[Tuple[bytes, str]]]
+    ) -> None:
+        """Record blobs as the targets of later references (after they were written)."""
+        with self._lock:
+            last_blobs = self._thread(thread_id).last_blobs
+            for channel_key, blob in stored.items():
+                if blob is None:
+                    last_blobs.pop(channel_key, None)
+                else:
+                    last_blobs[channel_key] = blob
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store a task's pending writes against the current checkpoint."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        if not writes or self._is_wiped(thread_id):
+            return
+
+        key = checkpoint_key(thread_id)
+        fields: List[str] = []
+        pipe = self.client.pipeline(transaction=False)
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            hash_field = self._field("writes", checkpoint_ns, checkpoint_id, task_id, str(idx))
+            fields.append(hash_field)
+            type_, data = self.serde.dumps_typed(value)
+            packed = _pack(channel.encode(), task_path.encode(), type_.encode(), data)
+            # Regular writes are kept on retry; special ones (errors,
+            # interrupts) are overwritten, as in InMemorySaver
+            if idx >= 0:
+                pipe.hsetnx(key, hash_field, packed)
+            else:
+                pipe.hset(key, hash_field, packed)
+        pipe.expire(key, self._ttl(thread_id))
+        pipe.execute()
+
+        with self._lock:
+            self._thread(thread_id).write_fields.setdefault(checkpoint_id, []).extend(fields)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and write of a thread (one key)."""
+        with self._lock:
+            self._threads.pop(thread_id, None)
+        self.client.delete(checkpoint_key(thread_id))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """Monotonic string versions, as in InMemorySaver."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # === ASYNC API (Redis calls run in a worker thread) ===
+
+    @profiler.timed("redis:checkpoint_get")
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for result in results:
+            yield result
+
+    @profiler.timed("redis:checkpoint_put")
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    @profiler.timed("redis:checkpoint_put_writes")
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_checkpoint_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            tracked = len(self._threads)
+        return {
+            "namespace": self.namespace,
+            "blobs_written": self.blobs_written,
+            "blobs_deduplicated": self.blobs_deduplicated,
+            "tracked_threads": tracked,
+        }
+
+
+# Global checkpointer on the session store's raw-bytes client
+redis_checkpointer = RedisCheckpointSaver(memory_manager.binary_client)
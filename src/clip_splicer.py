@@ -0,0 +1,350 @@
+"""
+Clip Splicer for MCD 311 Sovereign Voice AI
+Speaks ticket ids, reference codes and numbers by splicing pre-rendered
+clips instead of running TTS on them.
+
+- ClipLibrary.prerender() renders, once at startup, every digit, letter
+  name and number word for each language in CLIP_LANGUAGES, plus the fixed
+  carrier phrases around identifiers ("Ticket ID is"). Letter names are
+  English in every language, so they are rendered with the English voice.
+  Each clip is trimmed of silence and normalized to the same loudness, so
+  spliced sequences have an even level and rhythm whatever the identifier.
+- compose() turns a sentence into one utterance: identifiers and numbers
+  found by split_identifiers() are spoken from clips, carrier phrases
+  inside the sentence come from the library, and only the remaining free
+  text goes through the synthesis pool.
+  The pieces are joined with fixed pauses and short crossfades (numpy), and
+  the result is one PCM buffer for the output codec.
+
+Splicing needs PCM from one engine at one sample rate. With a network or
+compressed engine (gtts) the library stays empty, and compose() returns
+None so the caller falls back to plain TTS.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from config.settings import settings
+from src.audio_processor import audio_processor
+from src.synthesis_service import PROMPT, synthesis_service
+from src.tts_engines import SynthesizedAudio
+
+logger = logging.getLogger(__name__)
+
+SILENCE_THRESHOLD = 0.02  # Share of full scale below which clip edges are trimmed
+TARGET_RMS = 0.12  # Loudness every clip is normalized to (share of full scale)
+CROSSFADE_MS = 8  # Overlap between adjoining segments, removes clicks
+CHARACTER_GAP_MS = 40  # Between spelled characters
+GROUP_GAP_MS = 220  # At "-", "/" and spaces inside an identifier
+PHRASE_GAP_MS = 120  # Between free text and an identifier
+
+DIGIT_WORDS = {
+    "en": ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"],
+    "hi": ["शून्य", "एक", "दो", "तीन", "चार", "पाँच", "छह", "सात", "आठ", "नौ"],
+}
+
+# Letter names as Indian English speakers say them; used (in the English
+# voice) for every language
+LETTER_WORDS = dict(
+    zip(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+        [
+            "ay", "bee", "see", "dee", "ee", "ef", "jee", "aitch", "eye", "jay",
+            "kay", "el", "em", "en", "oh", "pee", "cue", "aar", "ess", "tee",
+            "you", "vee", "double you", "ex", "why", "zed",
+        ],
+    )
+)
+
+# Number words for speaking quantities ("48" -> forty eight), English only
+TEEN_WORDS = [
+    "ten", "eleven", "twelve", "thirteen", "fourteen",
+    "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+]
+TENS_WORDS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+SCALE_WORDS = ["hundred", "thousand"]
+RANGE_WORD = "to"  # "5-7 days" -> five to seven days
+
+# Fixed text spoken around identifiers (matched without edge punctuation)
+CARRIER_PHRASES = ("Reference", "Ticket ID is", "Initiating memory wipe")
+_EDGE_PUNCTUATION = " .,:;"
+
+# Upper-case tokens (optionally dash-joined) that mix letters and digits
+_IDENTIFIER = re.compile(r"\b[A-Z0-9]+(?:[-/][A-Z0-9]+)*\b")
+# Standalone whole numbers and ranges ("48", "5-7"); not decimals or parts of words
+_NUMBER = re.compile(r"(?<![\w.])(\d+)(?:\s*-\s*(\d+))?(?![\w]|\.\d)")
+# Carrier phrases inside a sentence (the group keeps them in re.split's output)
+_CARRIER = re.compile(
+    r"\b(" + "|".join(re.escape(phrase) for phrase in CARRIER_PHRASES) + r")\b"
+)
+
+
+@dataclass(frozen=True)
+class Spelled:
+    """An identifier spoken character by character."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class Number:
+    """A quantity spoken as number words (digit by digit where words are missing)."""
+
+    value: int
+
+
+Part = Union[str, Spelled, Number]
+
+
+def _digits(token: str) -> Part:
+    """A digit run: a Number, or Spelled if leading zeros must be kept ("007")."""
+    return Spelled(token) if len(token) > 1 and token[0] == "0" else Number(int(token))
+
+
+def _split_free_text(text: str) -> List[Part]:
+    """Numbers and carrier phrases out of free text; the rest stays text."""
+    parts: List[Part] = []
+    position = 0
+    for match in _NUMBER.finditer(text):
+        parts.extend(_CARRIER.split(text[position : match.start()]))
+        parts.append(_digits(match.group(1)))
+        if match.group(2):
+            parts += [RANGE_WORD, _digits(match.group(2))]
+        position = match.end()
+    parts.extend(_CARRIER.split(text[position:]))
+    return parts
+
+
+def split_identifiers(text: str) -> List[Part]:
+    """
+    Split text into Spelled identifiers (tokens mixing letters and digits),
+    Numbers, carrier phrases and the free text between them.
+    """
+    parts: List[Part] = []
+    position = 0
+    for match in _IDENTIFIER.finditer(text):
+        token = match.group(0)
+        if not (any(c.isdigit() for c in token) and any(c.isalpha() for c in token)):
+            continue
+        parts.extend(_split_free_text(text[position : match.start()]))
+        parts.append(Spelled(token))
+        position = match.end()
+    parts.extend(_split_free_text(text[position:]))
+    # Drop what is left of the punctuation between parts
+    return [
+        part
+        for part in parts
+        if not isinstance(part, str) or any(c.isalnum() for c in part)
+    ]
+
+
+def number_words(value: int) -> List[str]:
+    """English number words for 0 <= value < 10000."""
+    if value < 10:
+        return [DIGIT_WORDS["en"][value]]
+    if value < 20:
+        return [TEEN_WORDS[value - 10]]
+    if value < 100:
+        tens, ones = divmod(value, 10)
+        return [TENS_WORDS[tens]] + (number_words(ones) if ones else [])
+    if value < 1000:
+        hundreds, rest = divmod(value, 100)
+        return number_words(hundreds) + ["hundred"] + (number_words(rest) if rest else [])
+    thousands, rest = divmod(value, 1000)
+    return number_words(thousands) + ["thousand"] + (number_words(rest) if rest else [])
+
+
+def _to_float(audio: SynthesizedAudio) -> np.ndarray:
+    return np.frombuffer(audio.data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def prepare_clip(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Trim leading/trailing silence and normalize loudness."""
+    loud = np.flatnonzero(np.abs(samples) > SILENCE_THRESHOLD)
+    if loud.size == 0:
+        return np.zeros(0, dtype=np.float32)
+    # Keep a few ms either side so consonants are not clipped
+    pad = int(sample_rate * 0.005)
+    samples = samples[max(0, loud[0] - pad) : loud[-1] + pad + 1]
+    rms = float(np.sqrt(np.mean(samples**2)))
+    if rms > 0:
+        samples = samples * (TARGET_RMS / rms)
+    return np.clip(samples, -1.0, 1.0).astype(np.float32)
+
+
+def splice(segments: Sequence[np.ndarray], gaps_ms: Sequence[float], sample_rate: int) -> np.ndarray:
+    """
+    Join segments, with gaps_ms[i] of silence after segments[i]. Adjoining
+    segments overlap by CROSSFADE_MS with linear fades, so no joint clicks.
+    """
+    fade = int(sample_rate * CROSSFADE_MS / 1000)
+    ramp_in = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+    ramp_out = ramp_in[::-1]
+
+    out = np.zeros(0, dtype=np.float32)
+    for index, segment in enumerate(segments):
+        segment = segment.copy()
+        n = min(fade, segment.size // 2)
+        if n:
+            segment[:n] *= ramp_in[fade - n :]
+            segment[-n:] *= ramp_out[:n]
+        overlap = min(n, out.size)
+        if overlap:
+            out[-overlap:] += segment[:overlap]
+            segment = segment[overlap:]
+        out = np.concatenate((out, segment))
+        gap = gaps_ms[index] if index < len(gaps_ms) else 0
+        if gap and index < len(segments) - 1:
+            # The next segment fades in over the end of the gap
+            out = np.concatenate((out, np.zeros(int(sample_rate * gap / 1000), dtype=np.float32)))
+    return out
+
+
+class ClipLibrary:
+    """Pre-rendered, normalized clips per language."""
+
+    def __init__(self, languages: Sequence[str] = None):
+        self.languages = list(
+            languages
+            if languages is not None
+            else [code.strip() for code in settings.CLIP_LANGUAGES.split(",") if code.strip()]
+        )
+        self.sample_rate: Optional[int] = None
+        self._clips: Dict[str, Dict[str, np.ndarray]] = {}  # language -> word -> samples
+
+    @property
+    def ready(self) -> bool:
+        return self.sample_rate is not None
+
+    def _words(self, language: str) -> List[str]:
+        words = list(DIGIT_WORDS.get(language, [])) + list(LETTER_WORDS.values())
+        if language == "en":
+            words += TEEN_WORDS + [word for word in TENS_WORDS if word] + SCALE_WORDS
+            words += [RANGE_WORD] + list(CARRIER_PHRASES)
+        return words
+
+    def _engine_for(self, language: str):
+        """The configured engine, with its voice switched to the language if needed."""
+        engine = audio_processor.tts_engine
+        if language == "en" or not hasattr(engine, "voice"):
+            return engine
+        return type(engine)(voice=language)
+
+    async def prerender(self) -> int:
+        """Render every clip for every language. Returns the number of clips."""
+        engine = audio_processor.tts_engine
+        if engine is None or not engine.local:
+            logger.warning("Clip library disabled: needs a local PCM TTS engine")
+            return 0
+
+        rendered = 0
+        letters = set(LETTER_WORDS.values())
+        for language in self.languages:
+            try:
+                lang_engine = self._engine_for(language)
+                english_engine = self._engine_for("en")
+                clips = {}
+                for word in self._words(language):
+                    word_engine = english_engine if word in letters else lang_engine
+                    audio = await asyncio.to_thread(word_engine.synthesize, word)
+                    if audio.format != "pcm":
+                        raise RuntimeError(f"engine returned {audio.format}, not PCM")
+                    if self.sample_rate is None:
+                        self.sample_rate = audio.sample_rate
+                    elif audio.sample_rate != self.sample_rate:
+                        raise RuntimeError("clips differ in sample rate")
+                    clips[word] = prepare_clip(_to_float(audio), audio.sample_rate)
+            except Exception as e:
+                logger.error(f"Clip library: skipping language '{language}': {e}")
+                continue
+            self._clips[language] = clips
+            rendered += len(clips)
+        logger.info(f"✓ Pre-rendered {rendered} clips ({', '.join(self._clips)})")
+        return rendered
+
+    def _clip(self, word: str, language: str) -> Optional[np.ndarray]:
+        clip = self._clips.get(language, {}).get(word)
+        if clip is None and language != "en":
+            clip = self._clips.get("en", {}).get(word)
+        return clip
+
+    def _spell(self, text: str, language: str):
+        """Clips and gaps for an identifier, or None if a character has no clip."""
+        digits = DIGIT_WORDS.get(language, DIGIT_WORDS["en"])
+        segments, gaps = [], []
+        for char in text.upper():
+            if char in "-/ ":
+                if gaps:
+                    gaps[-1] = GROUP_GAP_MS
+                continue
+            word = digits[int(char)] if char.isdigit() else LETTER_WORDS.get(char)
+            clip = self._clip(word, language) if word else None
+            if clip is None:
+                return None
+            segments.append(clip)
+            gaps.append(CHARACTER_GAP_MS)
+        return segments, gaps
+
+    def _number(self, value: int, language: str):
+        if language == "en" and 0 <= value < 10000:
+            words = number_words(value)
+        else:
+            words = [DIGIT_WORDS.get(language, DIGIT_WORDS["en"])[int(d)] for d in str(abs(value))]
+        segments = [self._clip(word, language) for word in words]
+        if any(segment is None for segment in segments):
+            return None
+        return segments, [CHARACTER_GAP_MS] * len(segments)
+
+    async def compose(
+        self,
+        parts: Sequence[Part],
+        language: str = "en",
+        priority: int = PROMPT,
+        session_id: Optional[str] = None,
+    ) -> Optional[SynthesizedAudio]:
+        """
+        One utterance from free text, Spelled identifiers and Numbers.
+        Free text that is not a carrier phrase is synthesized on the pool.
+
+        Returns:
+            PCM audio, or None if the library cannot splice this utterance
+            (not rendered, a missing clip, a cancelled request)
+        """
+        if not self.ready:
+            return None
+
+        segments: List[np.ndarray] = []
+        gaps: List[float] = []
+        for part in parts:
+            if isinstance(part, Spelled):
+                spelled = self._spell(part.text, language)
+            elif isinstance(part, Number):
+                spelled = self._number(part.value, language)
+            else:
+                text = part.strip(_EDGE_PUNCTUATION)
+                clip = self._clip(text, language)
+                if clip is None:
+                    audio = await synthesis_service.submit(text, priority, session_id=session_id)
+                    if audio is None or audio.format != "pcm" or audio.sample_rate != self.sample_rate:
+                        return None
+                    clip = prepare_clip(_to_float(audio), audio.sample_rate)
+                spelled = ([clip], [PHRASE_GAP_MS])
+            if spelled is None:
+                return None
+            if gaps:
+                gaps[-1] = max(gaps[-1], PHRASE_GAP_MS)
+            segments.extend(spelled[0])
+            gaps.extend(spelled[1])
+
+        samples = splice(segments, gaps, self.sample_rate)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        return SynthesizedAudio(pcm, self.sample_rate)
+
+
+# Global clip library
+clip_library = ClipLibrary()
@@ -0,0 +1,282 @@
+"""
+Escalation Policy for MCD 311 Sovereign Voice AI
+Deterministic escalation decisions for routine and urgent complaints, so the
+deep model only runs for the calls that actually need reasoning.
+
+The policy table decides a call when either:
+- the description names an unambiguous hazard ("live wire", "gas leak",
+  not negated) -> escalate immediately, or
+- the category is whitelisted and the categorization confidence is at or
+  above the category's band -> auto-resolve.
+Everything else is left to the deep model (escalation_check), including
+descriptions with a broad urgency word ("fire", "child", "accident"): those
+are as often routine ("pothole near my child's school").
+
+Metrics: the bypass rate (share of calls decided by the table) and, for a
+sample of bypassed calls, agreement between the table and the deep model,
+per rule (for urgent_keyword it is the precision of the hazard list). Calls
+deferred for a broad word are the negative examples: how often the deep
+model escalates them is counted too. The sampled deep-model check runs in
+the background, off the call path.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from config.settings import settings
+from src.agent_state import AgentState, GrievanceCategory
+
+logger = logging.getLogger(__name__)
+
+# Policy actions
+RESOLVE = "resolve"
+ESCALATE = "escalate"
+
+
+@dataclass(frozen=True)
+class CategoryRule:
+    """Auto-resolution rule for one whitelisted category."""
+
+    department: str
+    min_confidence: float  # Categorization confidence needed to skip the deep model
+
+
+# Whitelisted categories: routine, well-understood complaints
+POLICY_TABLE: Dict[GrievanceCategory, CategoryRule] = {
+    GrievanceCategory.STREET_LIGHT: CategoryRule("MCD Electrical", 0.85),
+    GrievanceCategory.ROAD: CategoryRule("MCD Roads", 0.85),
+    GrievanceCategory.SANITATION: CategoryRule("MCD Sanitation", 0.85),
+    GrievanceCategory.PARKING: CategoryRule("MCD Traffic Cell", 0.9),
+    GrievanceCategory.WATER_SUPPLY: CategoryRule("Delhi Jal Board", 0.9),
+}
+
+# Unambiguous hazards that always go to a human, in English, Hindi and Hinglish
+URGENCY_KEYWORDS = (
+    "live wire",
+    "nanga taar",
+    "khula taar",
+    "electric shock",
+    "electrocution",
+    "current lag gaya",
+    "gas leak",
+    "gas leakage",
+    "open manhole",
+    "khula manhole",
+    "building collapse",
+    "wall collapse",
+    "deewar gir gayi",
+    "imarat gir gayi",
+)
+# Broad words: urgent or routine depending on context, so the deep model decides
+URGENCY_HINTS = (
+    "fire",
+    "aag",
+    "spark",
+    "short circuit",
+    "collapse",
+    "gir gaya",
+    "accident",
+    "injured",
+    "hurt",
+    "ghayal",
+    "death",
+    "dead body",
+    "emergency",
+    "flood",
+    "drowning",
+    "child",
+    "bachcha",
+)
+URGENT_DEPARTMENT = "MCD Control Room"
+
+
+def _phrase_pattern(phrases) -> re.Pattern:
+    return re.compile(r"\b(" + "|".join(re.escape(p) for p in phrases) + r")\b", re.IGNORECASE)
+
+
+_URGENCY_PATTERN = _phrase_pattern(URGENCY_KEYWORDS)
+_HINT_PATTERN = _phrase_pattern(URGENCY_HINTS)
+# "no gas leak", "gas leak nahi hai": a negation next to the hazard
+_NEGATION_PATTERN = re.compile(r"\b(no|not|never|without|nahi|nahin|koi nahi)\b", re.IGNORECASE)
+NEGATION_WINDOW = 15  # Characters either side of the hazard searched for a negation
+
+
+@dataclass
+class PolicyDecision:
+    """A decision made by the table (action is RESOLVE or ESCALATE)."""
+
+    action: str
+    rule: str  # "urgent_keyword" or "whitelisted_category"
+    department: str
+    reason: str
+
+    @property
+    def requires_escalation(self) -> bool:
+        return self.action == ESCALATE
+
+
+class EscalationPolicy:
+    """Policy table lookup plus bypass and shadow-agreement counters."""
+
+    def __init__(self, enabled: bool = None, shadow_sample_rate: float = None):
+        self.enabled = settings.ESCALATION_POLICY_ENABLED if enabled is None else enabled
+        if shadow_sample_rate is None:
+            shadow_sample_rate = settings.ESCALATION_SHADOW_SAMPLE_RATE
+        self.shadow_sample_rate = shadow_sample_rate
+
+        self._lock = threading.Lock()
+        self._shadow_tasks: Set[asyncio.Task] = set()
+        self.decisions = 0
+        self.bypassed = 0
+        self.by_rule: Dict[str, int] = {}
+        self.shadow_checks = 0
+        self.shadow_agreements = 0
+        self.shadow_failures = 0  # No verdict from the deep model; not in the agreement rate
+        self.shadow_by_rule: Dict[str, Dict[str, int]] = {}  # rule -> checks, agreements
+        self.hint_deferred = 0  # Broad urgency word, left to the deep model
+        self.hint_escalated = 0  # ... and the deep model escalated it
+
+    def evaluate(self, state: AgentState) -> Optional[PolicyDecision]:
+        """
+        Look the call up in the policy table. Pure and deterministic.
+
+        Returns:
+            PolicyDecision, or None if the deep model should decide
+        """
+        if not self.enabled:
+            return None
+
+        description = state.grievance_description or ""
+        match = _URGENCY_PATTERN.search(description)
+        if match:
+            if _is_negated(description, match):
+                return None  # "no gas leak, just garbage": let the deep model read it
+            rule = POLICY_TABLE.get(state.grievance_category)
+            return PolicyDecision(
+                action=ESCALATE,
+                rule="urgent_keyword",
+                department=rule.department if rule else URGENT_DEPARTMENT,
+                reason=f"Urgent: '{match.group(1).lower()}' reported",
+            )
+        if self.urgency_hint(state):
+            return None
+
+        rule = POLICY_TABLE.get(state.grievance_category)
+        if rule is not None and state.confidence_score >= rule.min_confidence:
+            return PolicyDecision(
+                action=RESOLVE,
+                rule="whitelisted_category",
+                department=rule.department,
+                reason="",
+            )
+        return None
+
+    @staticmethod
+    def urgency_hint(state: AgentState) -> Optional[str]:
+        """The broad urgency word in the description, if any (lower case)."""
+        match = _HINT_PATTERN.search(state.grievance_description or "")
+        return match.group(1).lower() if match else None
+
+    def record_hint_verdict(self, escalated: bool) -> None:
+        """The deep model's verdict on a call deferred for a broad urgency word."""
+        with self._lock:
+            self.hint_deferred += 1
+            if escalated:
+                self.hint_escalated += 1
+
+    def record(self, decision: Optional[PolicyDecision]) -> None:
+        """Count one escalation decision (call once per call)."""
+        with self._lock:
+            self.decisions += 1
+            if decision is not None:
+                self.bypassed += 1
+                self.by_rule[decision.rule] = self.by_rule.get(decision.rule, 0) + 1
+
+    def maybe_shadow_check(self, decision: PolicyDecision, state_data: Dict[str, Any]) -> None:
+        """
+        For a sample of bypassed calls, ask the deep model in the background
+        and record whether it agrees with the table. Must be called from the
+        event loop. state_data holds the same fields escalation_check sends.
+        """
+        if self.shadow_sample_rate <= 0 or random.random() >= self.shadow_sample_rate:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._shadow_check(decision, dict(state_data))
+        )
+        # Keep a reference until done so the task is not garbage collected
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _shadow_check(self, decision: PolicyDecision, state_data: Dict[str, Any]) -> None:
+        # Imported here: the policy table itself needs no LLM connection
+        from src.llm_integration import DEEP_PATH_FALLBACK, sovereign_llm
+
+        try:
+            deep = await sovereign_llm.acheck_escalation_needed(state_data)
+        except Exception as e:
+            deep, error = None, str(e)
+        else:
+            error = "no verdict from the deep model"
+        # Model errors come back as DEEP_PATH_FALLBACK rather than raising
+        if deep is None or deep == DEEP_PATH_FALLBACK or "requires_escalation" not in deep:
+            with self._lock:
+                self.shadow_failures += 1
+            logger.warning(f"Shadow escalation check failed: {error}")
+            return
+        agreed = bool(deep.get("requires_escalation", False)) == decision.requires_escalation
+        with self._lock:
+            self.shadow_checks += 1
+            by_rule = self.shadow_by_rule.setdefault(decision.rule, {"checks": 0, "agreements": 0})
+            by_rule["checks"] += 1
+            if agreed:
+                self.shadow_agreements += 1
+                by_rule["agreements"] += 1
+        if not agreed:
+            logger.info(
+                f"Policy/deep model disagreement (rule={decision.rule}, "
+                f"category={state_data.get('category')})"
+            )
+
+    def get_policy_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "decisions": self.decisions,
+                "bypassed": self.bypassed,
+                "deep_model": self.decisions - self.bypassed,
+                "bypass_rate": round(self.bypassed / self.decisions, 4)
+                if self.decisions
+                else 0.0,
+                "by_rule": dict(self.by_rule),
+                "shadow_checks": self.shadow_checks,
+                "shadow_failures": self.shadow_failures,
+                "shadow_agreement_rate": round(
+                    self.shadow_agreements / self.shadow_checks, 4
+                )
+                if self.shadow_checks
+                else None,
+                "shadow_agreement_by_rule": {
+                    rule: round(counts["agreements"] / counts["checks"], 4)
+                    for rule, counts in self.shadow_by_rule.items()
+                },
+                "hint_deferred": self.hint_deferred,
+                "hint_escalation_rate": round(self.hint_escalated / self.hint_deferred, 4)
+                if self.hint_deferred
+                else None,
+            }
+
+
+def _is_negated(text: str, match: re.Match) -> bool:
+    """Whether a negation sits right before or after the matched hazard."""
+    window = text[max(0, match.start() - NEGATION_WINDOW) : match.end() + NEGATION_WINDOW]
+    return _NEGATION_PATTERN.search(window) is not None
+
+
+# Global escalation policy
+escalation_policy = EscalationPolicy()
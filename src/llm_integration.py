@@ -13,6 +13,26 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Fallbacks when a model call fails
+FAST_PATH_FALLBACK = "I'm having trouble understanding. Could you please rephrase?"
+RESPONSE_FALLBACK = "Thank you for reporting this. We will look into it."
+CATEGORIZATION_FALLBACK = {
+    "category": "OTHER",
+    "confidence": 0.0,
+    "rationale": "System error",
+}
+DEEP_PATH_FALLBACK = {
+    "reasoning": "System error in deep reasoning",
+    "decision": "ESCALATE",
+    "confidence": 0.0,
+    "requires_human": True,
+}
+DEEP_PATH_OPTIONS = {
+    "temperature": 0.5,
+    "top_p": 0.9,
+    "num_predict": 200,  # Allow more tokens for reasoning
+}
+
 
 class SovereignLLM:
     """
@@ -20,12 +40,17 @@ class SovereignLLM:
     Provides two paths:
     1. FAST_PATH: Quick response using lightweight model (Mistral)
     2. DEEP_PATH: Detailed reasoning using more capable model (Neural-Chat)
+
+    Every call has a blocking form (fast_path_response, ...) and an async
+    form (afast_path_response, ...) for the workflow's event loop. Both share
+    the same prompts and response parsing.
     """
 
     def __init__(self):
-        """Initialize Ollama client."""
+        """Initialize Ollama clients."""
         try:
             self.client = ollama.Client(host=settings.OLLAMA_BASE_URL)
+            self.async_client = ollama.AsyncClient(host=settings.OLLAMA_BASE_URL)
             # Test connection
             self.client.list()
             logger.info(f"[OK] Ollama connected at {settings.OLLAMA_BASE_URL}")
@@ -81,20 +106,32 @@ class SovereignLLM:
                 model=self.fast_model,
                 prompt=prompt,
                 stream=False,
-                options={
-                    "temperature": 0.3, 
-                    "top_p": 0.8,
-                    "num_predict": max_tokens
-                },
+                options=self._fast_options(max_tokens),
             )
+            return self._parse_fast(citizen_input, response)
+
+        except Exception as e:
+            logger.error(f"Fast Path error: {e}")
+            return FAST_PATH_FALLBACK
 
-            result = response["response"].strip()
-            logger.info(f"Fast Path: {citizen_input[:50]}... → {result[:50]}...")
-            return result
+    async def afast_path_response(
+        self, citizen_input: str, context: Dict[str, Any] = None, max_tokens: int = 100
+    ) -> str:
+        """Async version of fast_path_response."""
+        prompt = self._build_fast_prompt(citizen_input, context)
+
+        try:
+            response = await self.async_client.generate(
+                model=self.fast_model,
+                prompt=prompt,
+                stream=False,
+                options=self._fast_options(max_tokens),
+            )
+            return self._parse_fast(citizen_input, response)
 
         except Exception as e:
             logger.error(f"Fast Path error: {e}")
-            return "I'm having trouble understanding. Could you please rephrase?"
+            return FAST_PATH_FALLBACK
 
     def deep_path_reasoning(
         self, citizen_input: str, context: Dict[str, Any] = None
@@ -117,41 +154,35 @@ class SovereignLLM:
                 model=self.deep_model,
                 prompt=prompt,
                 stream=False,
-                options={
-                    "temperature": 0.5, 
-                    "top_p": 0.9,
-                    "num_predict": 200  # Allow more tokens for reasoning
-                },
+                options=DEEP_PATH_OPTIONS,
             )
+            return self._parse_deep(response)
+
+        except Exception as e:
+            logger.error(f"Deep Path error: {e}")
+            return dict(DEEP_PATH_FALLBACK)
+
+    async def adeep_path_reasoning(
+        self, citizen_input: str, context: Dict[str, Any] = None, model: str = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of deep_path_reasoning.
+        `model` overrides the deep model (e.g. the fast one when the call is short on time).
+        """
+        prompt = self._build_deep_prompt(citizen_input, context)
 
-            raw_response = response["response"].strip()
-
-            # Try to parse JSON response
-            try:
-                decision = json.loads(raw_response)
-            except json.JSONDecodeError:
-                # If not JSON, create structured response
-                decision = {
-                    "reasoning": raw_response,
-                    "decision": "ESCALATE",
-                    "confidence": 0.7,
-                    "requires_human": True,
-                }
-
-            logger.info(
-                f"Deep Path: Decision={decision.get('decision')}, "
-                f"Confidence={decision.get('confidence', 0)}"
+        try:
+            response = await self.async_client.generate(
+                model=model or self.deep_model,
+                prompt=prompt,
+                stream=False,
+                options=DEEP_PATH_OPTIONS,
             )
-            return decision
+            return self._parse_deep(response)
 
         except Exception as e:
             logger.error(f"Deep Path error: {e}")
-            return {
-                "reasoning": "System error in deep reasoning",
-                "decision": "ESCALATE",
-                "confidence": 0.0,
-                "requires_human": True,
-            }
+            return dict(DEEP_PATH_FALLBACK)
 
     def categorize_grievance(
         self, grievance_description: str, location: str = ""
@@ -166,25 +197,7 @@ class SovereignLLM:
         Returns:
             Dict with category, confidence, and rationale
         """
-        context = {"location": location}
-        prompt = f"""You are an MCD (Municipal Corporation of Delhi) grievance classification expert.
-Classify this citizen complaint into ONE of these categories:
-- WATER_SUPPLY: Water availability, quality, leakage, meter issues
-- SEWAGE: Overflow, blockage, smell, maintenance
-- ROAD: Pothole, damage, maintenance, safety
-- STREET_LIGHT: Non-functional lights, darkness
-- ILLEGAL_CONSTRUCTION: Unauthorized structures
-- SANITATION: Waste collection, cleanliness, pest control
-- PARKING: Illegal parking, space issues
-- NOISE_POLLUTION: Loud noise, disturbance
-- OTHER: Doesn't fit above categories
-
-Complaint: {grievance_description}
-Location: {location if location else 'Not provided'}
-
-Respond in JSON format:
-{{"category": "CATEGORY_NAME", "confidence": 0.95, "rationale": "Brief explanation"}}
-"""
+        prompt = self._build_categorize_prompt(grievance_description, location)
 
         try:
             response = self.client.generate(
@@ -193,30 +206,30 @@ Respond in JSON format:
                 stream=False,
                 options={"temperature": 0.2},
             )
+            return self._parse_categorization(response)
 
-            raw = response["response"].strip()
-            try:
-                result = json.loads(raw)
-            except json.JSONDecodeError:
-                result = {
-                    "category": "OTHER",
-                    "confidence": 0.5,
-                    "rationale": "Unable to classify",
-                }
-
-            logger.info(
-                f"Categorized as: {result.get('category')} "
-                f"(confidence: {result.get('confidence')})"
+        except Exception as e:
+            logger.error(f"Categorization error: {e}")
+            return dict(CATEGORIZATION_FALLBACK)
+
+    async def acategorize_grievance(
+        self, grievance_description: str, location: str = ""
+    ) -> Dict[str, Any]:
+        """Async version of categorize_grievance."""
+        prompt = self._build_categorize_prompt(grievance_description, location)
+
+        try:
+            response = await self.async_client.generate(
+                model=self.fast_model,
+                prompt=prompt,
+                stream=False,
+                options={"temperature": 0.2},
             )
-            return result
+            return self._parse_categorization(response)
 
         except Exception as e:
             logger.error(f"Categorization error: {e}")
-            return {
-                "category": "OTHER",
-                "confidence": 0.0,
-                "rationale": "System error",
-            }
+            return dict(CATEGORIZATION_FALLBACK)
 
     def generate_response(
         self, state_summary: str, next_action: str, language: str = "hindi"
@@ -232,16 +245,30 @@ Respond in JSON format:
         Returns:
             Natural language response
         """
-        prompt = f"""You are a helpful MCD 311 grievance redressal agent.
-Generate a brief, professional response in {language} (if hindi, use Hinglish mix).
+        prompt = self._build_response_prompt(state_summary, next_action, language)
 
-Current Status: {state_summary}
-Next Action: {next_action}
+        try:
+            response = self.client.generate(
+                model=self.fast_model,
+                prompt=prompt,
+                stream=False,
+                options={"temperature": 0.7},
+            )
 
-Keep it under 2 sentences. Be empathetic but professional."""
+            return response["response"].strip()
+
+        except Exception as e:
+            logger.error(f"Response generation error: {e}")
+            return RESPONSE_FALLBACK
+
+    async def agenerate_response(
+        self, state_summary: str, next_action: str, language: str = "hindi"
+    ) -> str:
+        """Async version of generate_response."""
+        prompt = self._build_response_prompt(state_summary, next_action, language)
 
         try:
-            response = self.client.generate(
+            response = await self.async_client.generate(
                 model=self.fast_model,
                 prompt=prompt,
                 stream=False,
@@ -252,7 +279,7 @@ Keep it under 2 sentences. Be empathetic but professional."""
 
         except Exception as e:
             logger.error(f"Response generation error: {e}")
-            return "Thank you for reporting this. We will look into it."
+            return RESPONSE_FALLBACK
 
     def check_escalation_needed(self, state_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -264,13 +291,110 @@ Keep it under 2 sentences. Be empathetic but professional."""
         Returns:
             Dict with escalation decision and reasoning
         """
-        prompt = f"""You are an MCD grievance escalation decision engine.
+        prompt = self._build_escalation_prompt(state_data)
+        return self.deep_path_reasoning(prompt, state_data)
+
+    async def acheck_escalation_needed(
+        self, state_data: Dict[str, Any], model: str = None
+    ) -> Dict[str, Any]:
+        """Async version of check_escalation_needed (optionally on another model)."""
+        prompt = self._build_escalation_prompt(state_data)
+        return await self.adeep_path_reasoning(prompt, state_data, model=model)
+
+    def summarize_conversation(
+        self, previous_summary: str, turns: str, max_tokens: int = 120
+    ) -> Optional[str]:
+        """
+        Fast Path: fold older conversation turns into the rolling call summary.
+
+        Args:
+            previous_summary: Summary so far ("" for the first fold)
+            turns: The evicted turns as "speaker: message" lines
+            max_tokens: Token budget of the new summary
+
+        Returns:
+            New summary, or None if the model call failed
+        """
+        prompt = self._build_summary_prompt(previous_summary, turns, max_tokens)
+
+        try:
+            response = self.client.generate(
+                model=self.fast_model,
+                prompt=prompt,
+                stream=False,
+                options=self._fast_options(max_tokens),
+            )
+            return response["response"].strip() or None
+
+        except Exception as e:
+            logger.error(f"Summary error: {e}")
+            return None
+
+    async def asummarize_conversation(
+        self, previous_summary: str, turns: str, max_tokens: int = 120
+    ) -> Optional[str]:
+        """Async version of summarize_conversation."""
+        prompt = self._build_summary_prompt(previous_summary, turns, max_tokens)
+
+        try:
+            response = await self.async_client.generate(
+                model=self.fast_model,
+                prompt=prompt,
+                stream=False,
+                options=self._fast_options(max_tokens),
+            )
+            return response["response"].strip() or None
+
+        except Exception as e:
+            logger.error(f"Summary error: {e}")
+            return None
+
+    # ===== PRIVATE METHODS =====
+
+    def _build_categorize_prompt(self, grievance_description: str, location: str) -> str:
+        """Build the categorization prompt."""
+        return f"""You are an MCD (Municipal Corporation of Delhi) grievance classification expert.
+Classify this citizen complaint into ONE of these categories:
+- WATER_SUPPLY: Water availability, quality, leakage, meter issues
+- SEWAGE: Overflow, blockage, smell, maintenance
+- ROAD: Pothole, damage, maintenance, safety
+- STREET_LIGHT: Non-functional lights, darkness
+- ILLEGAL_CONSTRUCTION: Unauthorized structures
+- SANITATION: Waste collection, cleanliness, pest control
+- PARKING: Illegal parking, space issues
+- NOISE_POLLUTION: Loud noise, disturbance
+- OTHER: Doesn't fit above categories
+
+Complaint: {grievance_description}
+Location: {location if location else 'Not provided'}
+
+Respond in JSON format:
+{{"category": "CATEGORY_NAME", "confidence": 0.95, "rationale": "Brief explanation"}}
+"""
+
+    def _build_response_prompt(
+        self, state_summary: str, next_action: str, language: str
+    ) -> str:
+        """Build the citizen response prompt."""
+        return f"""You are a helpful MCD 311 grievance redressal agent.
+Generate a brief, professional response in {language} (if hindi, use Hinglish mix).
+
+Current Status: {state_summary}
+Next Action: {next_action}
+
+Keep it under 2 sentences. Be empathetic but professional."""
+
+    def _build_escalation_prompt(self, state_data: Dict[str, Any]) -> str:
+        """Build the escalation decision prompt."""
+        return f"""You are an MCD grievance escalation decision engine.
 Based on the following information, decide if human escalation is needed.
 
 Grievance Category: {state_data.get('category', 'Unknown')}
 Description: {state_data.get('description', '')}
 Urgency: {state_data.get('urgency', 'Normal')}
 Previous Attempts: {state_data.get('previous_attempts', 0)}
+Conversation so far:
+{state_data.get('conversation') or 'Not available'}
 
 Respond with JSON:
 {{
@@ -282,9 +406,68 @@ Respond with JSON:
 }}
 """
 
-        return self.deep_path_reasoning(prompt, state_data)
+    def _build_summary_prompt(self, previous_summary: str, turns: str, max_tokens: int) -> str:
+        """Build the rolling conversation summary prompt."""
+        return f"""You are summarizing an ongoing MCD 311 grievance call for the agent.
+Update the summary with the new turns. Keep every fact needed to resolve the
+complaint (problem, place, dates, what the citizen asked for). Drop greetings.
+Stay under {max_tokens * 3 // 4} words. Reply with the summary only.
 
-    # ===== PRIVATE METHODS =====
+Summary so far: {previous_summary or 'None'}
+
+New turns:
+{turns}
+"""
+
+    @staticmethod
+    def _fast_options(max_tokens: int) -> Dict[str, Any]:
+        return {"temperature": 0.3, "top_p": 0.8, "num_predict": max_tokens}
+
+    @staticmethod
+    def _parse_fast(citizen_input: str, response) -> str:
+        result = response["response"].strip()
+        logger.info(f"Fast Path: {citizen_input[:50]}... → {result[:50]}...")
+        return result
+
+    @staticmethod
+    def _parse_deep(response) -> Dict[str, Any]:
+        raw_response = response["response"].strip()
+
+        # Try to parse JSON response
+        try:
+            decision = json.loads(raw_response)
+        except json.JSONDecodeError:
+            # If not JSON, create structured response
+            decision = {
+                "reasoning": raw_response,
+                "decision": "ESCALATE",
+                "confidence": 0.7,
+                "requires_human": True,
+            }
+
+        logger.info(
+            f"Deep Path: Decision={decision.get('decision')}, "
+            f"Confidence={decision.get('confidence', 0)}"
+        )
+        return decision
+
+    @staticmethod
+    def _parse_categorization(response) -> Dict[str, Any]:
+        raw = response["response"].strip()
+        try:
+            result = json.loads(raw)
+        except json.JSONDecodeError:
+            result = {
+                "category": "OTHER",
+                "confidence": 0.5,
+                "rationale": "Unable to classify",
+            }
+
+        logger.info(
+            f"Categorized as: {result.get('category')} "
+            f"(confidence: {result.get('confidence')})"
+        )
+        return result
 
     def _build_fast_prompt(
         self, citizen_input: str, context: Dict[str, Any] = None
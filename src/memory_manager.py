@@ -5,41 +5,166 @@ This is the CORE of data sovereignty.
 """
 
 import redis
+from redis.cluster import RedisCluster
 import logging
 import json
 import hashlib
-from typing import Dict, Any, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Iterable, List, Optional
 from datetime import datetime, timedelta
 from config.settings import settings
-from src.agent_state import AgentState
+from src.agent_state import AgentState, CallState
+from src.session_codec import get_session_codec
+from src.session_store import InProcessStore
+from src.wipe_audit import FAILED, NOT_FOUND, WIPED, WipeAuditEvent, WipeAuditTrail
+from src.session_keys import (
+    METADATA_PATTERN,
+    SESSION_PATTERN,
+    metadata_key,
+    session_id_from_key,
+    session_key as build_session_key,
+    session_keys,
+)
 
 logger = logging.getLogger(__name__)
 
+# States after which a session counts as ended (for bulk wipes)
+ENDED_STATES = {
+    CallState.RESOLVED.value,
+    CallState.ESCALATED.value,
+    CallState.COMPLETED.value,
+    CallState.WIPED.value,
+}
+
+
+@dataclass
+class BulkWipeReport:
+    """Outcome of a bulk wipe."""
+
+    requested: int = 0
+    wiped: List[str] = field(default_factory=list)
+    not_found: List[str] = field(default_factory=list)
+    stragglers: List[str] = field(default_factory=list)  # Still present after UNLINK
+    keys_unlinked: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def sessions_per_second(self) -> float:
+        """Wipe throughput."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.wiped) / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for logs and the monitoring dashboard (no citizen data)."""
+        return {
+            "requested": self.requested,
+            "wiped": len(self.wiped),
+            "not_found": len(self.not_found),
+            "stragglers": self.stragglers,
+            "keys_unlinked": self.keys_unlinked,
+            "batches": self.batches,
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "sessions_per_second": round(self.sessions_per_second, 1),
+        }
+
 
 class MemoryManager:
     """
     Manages ephemeral session storage in Redis.
     ALL citizen data is stored in RAM only, with automatic TTL-based deletion.
     No data is ever written to disk.
+
+    The backing store is pluggable (settings.SESSION_STORE_BACKEND): Redis by
+    default, or an in-process TTL store for single-node deployments. Both
+    expose the same command subset (see src.session_store.SessionStore).
     """
 
     def __init__(self):
-        """Initialize Redis connection with zero-persistence configuration."""
-        try:
-            self.redis_client = redis.Redis(
+        """Initialize the session store with zero-persistence configuration."""
+        self.backend = settings.SESSION_STORE_BACKEND.lower()
+        self.cluster_mode = settings.REDIS_CLUSTER_MODE and self.backend == "redis"
+        self.codec = get_session_codec(settings.SESSION_CODEC)
+
+        if self.backend == "memory":
+            # Single-node mode: one in-process store serves text and binary values
+            self.redis_client = InProcessStore(tick_ms=settings.SESSION_STORE_TICK_MS)
+            self.binary_client = self.redis_client
+            logger.info("[OK] In-process session store ready (NO REDIS, RAM ONLY)")
+        elif self.backend == "redis":
+            try:
+                self.redis_client = self._create_client(settings.REDIS_DECODE_RESPONSES)
+                # Test connection
+                self.redis_client.ping()
+                logger.info(
+                    "[OK] Redis connection established (IN-MEMORY MODE"
+                    f"{', CLUSTER' if self.cluster_mode else ''})"
+                )
+            except redis.ConnectionError as e:
+                logger.error(f"[ERROR] Failed to connect to Redis: {e}")
+                raise
+
+            # Binary values (msgpack sessions, graph checkpoints) need a client
+            # that hands back raw bytes
+            self.binary_client = (
+                self._create_client(decode_responses=False)
+                if settings.REDIS_DECODE_RESPONSES
+                else self.redis_client
+            )
+        else:
+            raise ValueError(
+                f"Unknown SESSION_STORE_BACKEND '{self.backend}'. Choose 'redis' or 'memory'"
+            )
+
+        logger.info(f"[OK] Session codec: {self.codec.name}")
+
+        self.audit_trail = WipeAuditTrail(self.redis_client)
+
+    def _create_client(self, decode_responses: bool):
+        """
+        Build a standalone or cluster-aware Redis client.
+        In cluster mode the client discovers the shard topology from the
+        seed node and routes each key to the shard that owns its slot.
+        """
+        if self.cluster_mode:
+            return RedisCluster(
                 host=settings.REDIS_HOST,
                 port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
                 password=settings.REDIS_PASSWORD,
-                decode_responses=settings.REDIS_DECODE_RESPONSES,
+                decode_responses=decode_responses,
                 socket_connect_timeout=5,
             )
-            # Test connection
-            self.redis_client.ping()
-            logger.info("[OK] Redis connection established (IN-MEMORY MODE)")
-        except redis.ConnectionError as e:
-            logger.error(f"[ERROR] Failed to connect to Redis: {e}")
-            raise
+        return redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=decode_responses,
+            socket_connect_timeout=5,
+        )
+
+    def _write_session(
+        self, session_key: str, state: AgentState, ttl_seconds: int
+    ) -> None:
+        """Write the encoded session under session_key with the given TTL."""
+        payload = self.codec.encode(state)
+        if self.codec.binary:
+            self.binary_client.set(session_key, payload, ex=ttl_seconds)
+        else:
+            self.redis_client.hset(session_key, mapping=payload)
+            self.redis_client.expire(session_key, ttl_seconds)
+
+    def _read_session(self, session_key: str) -> Optional[AgentState]:
+        """Read and decode the session under session_key, or None if absent."""
+        if self.codec.binary:
+            payload = self.binary_client.get(session_key)
+        else:
+            payload = self.redis_client.hgetall(session_key)
+        if not payload:
+            return None
+        return self.codec.decode(payload)
 
     def store_session(
         self, state: AgentState, ttl_seconds: int = None
@@ -58,28 +183,27 @@ class MemoryManager:
         if ttl_seconds is None:
             ttl_seconds = settings.SESSION_DATA_RETENTION_SECONDS
 
-        session_key = f"session:{state.session_id}"
+        session_key = build_session_key(state.session_id)
         try:
             # Store session data with TTL
-            session_dict = state.to_redis_dict()
-            self.redis_client.hset(session_key, mapping=session_dict)
-            self.redis_client.expire(session_key, ttl_seconds)
+            self._write_session(session_key, state, ttl_seconds)
 
             logger.info(
                 f"✓ Session {state.session_id} stored with TTL={ttl_seconds}s"
             )
 
             # Also store metadata for monitoring
-            metadata_key = f"metadata:{state.session_id}"
+            meta_key = metadata_key(state.session_id)
             self.redis_client.hset(
-                metadata_key,
+                meta_key,
                 mapping={
                     "created_at": datetime.now().isoformat(),
+                    "updated_at": datetime.now().isoformat(),
                     "ttl_seconds": str(ttl_seconds),
                     "state": state.current_state.value,
                 },
             )
-            self.redis_client.expire(metadata_key, ttl_seconds)
+            self.redis_client.expire(meta_key, ttl_seconds)
 
             return True
 
@@ -98,14 +222,13 @@ class MemoryManager:
         Returns:
             AgentState object or None if not found
         """
-        session_key = f"session:{session_id}"
+        session_key = build_session_key(session_id)
         try:
-            session_data = self.redis_client.hgetall(session_key)
-            if not session_data:
+            state = self._read_session(session_key)
+            if state is None:
                 logger.warning(f"Session {session_id} not found (may have expired)")
                 return None
 
-            state = AgentState.from_redis_dict(session_data)
             logger.info(f"✓ Retrieved session {session_id}")
             return state
 
@@ -124,18 +247,28 @@ class MemoryManager:
         Returns:
             True if update successful
         """
-        session_key = f"session:{state.session_id}"
+        session_key = build_session_key(state.session_id)
         try:
-            # Get remaining TTL
+            # Get remaining TTL (-1: no TTL, -2: key missing)
             ttl = self.redis_client.ttl(session_key)
-            if ttl == -1:
+            if ttl < 0:
                 ttl = settings.SESSION_DATA_RETENTION_SECONDS
 
             # Update session data
-            session_dict = state.to_redis_dict()
-            self.redis_client.hset(session_key, mapping=session_dict)
-            if ttl > 0:
-                self.redis_client.expire(session_key, ttl)
+            self._write_session(session_key, state, ttl)
+
+            # Keep monitoring metadata current (bulk wipes filter on it)
+            meta_key = metadata_key(state.session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(
+                meta_key,
+                mapping={
+                    "updated_at": datetime.now().isoformat(),
+                    "state": state.current_state.value,
+                },
+            )
+            pipe.expire(meta_key, ttl)
+            pipe.execute()
 
             logger.info(f"✓ Session {state.session_id} updated")
             return True
@@ -164,11 +297,10 @@ class MemoryManager:
         session_id = state.session_id
 
         try:
-            # 1. Get list of all keys related to this session
-            session_key = f"session:{session_id}"
-            metadata_key = f"metadata:{session_id}"
-            checkpoint_key = f"checkpoint:{session_id}"
-            transcript_key = f"transcript:{session_id}"
+            # 1. Get list of all keys related to this session.
+            # They share a hash tag, so the DELETE below stays single-slot on a cluster.
+            keys = session_keys(session_id)
+            session_key = keys[0]
 
             # 2. Verify session exists before deletion
             session_exists = self.redis_client.exists(session_key)
@@ -176,6 +308,10 @@ class MemoryManager:
                 logger.warning(
                     f"Session {session_id} not found for wipe (may have already expired)"
                 )
+                if settings.ENABLE_MEMORY_AUDIT:
+                    self.audit_trail.record(
+                        WipeAuditEvent(session_id=session_id, outcome=NOT_FOUND)
+                    )
                 return {
                     "transcript": [],
                     "status": "NOT_FOUND",
@@ -184,38 +320,40 @@ class MemoryManager:
                     "current_state": "wiped",
                 }
 
-            # 3. Capture summary for audit before deletion
-            audit_log = {
-                "wipe_timestamp": datetime.now().isoformat(),
-                "session_id": session_id,
-                "call_duration": state.call_duration_seconds,
-                "grievance_category": state.grievance_category.value
+            # 3. Capture summary for audit before deletion (no citizen data)
+            audit_event = WipeAuditEvent(
+                session_id=session_id,
+                outcome=WIPED,
+                grievance_category=state.grievance_category.value
                 if state.grievance_category
                 else "unknown",
-                "was_escalated": state.requires_escalation,
-                "transcript_entries": len(state.transcript),
-            }
-
-            # 4. Hard-delete all session data from Redis
-            deleted_count = self.redis_client.delete(
-                session_key, metadata_key, checkpoint_key, transcript_key
+                was_escalated=state.requires_escalation,
+                call_duration=state.call_duration_seconds,
+                transcript_entries=state.transcript.total_turns,
             )
 
+            # 4. Hard-delete all session data from Redis.
+            # 5. Append the audit event (optional, for compliance) in the same round trip.
+            # Only the DELETE decides the outcome: an audit command that fails
+            # (e.g. XADD MINID before Redis 6.2) must not report a done wipe as failed.
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(*keys)
+            if settings.ENABLE_MEMORY_AUDIT:
+                self.audit_trail.queue(pipe, audit_event)
+            deleted_count, *audit_results = pipe.execute(raise_on_error=False)
+            if isinstance(deleted_count, Exception):
+                raise deleted_count
+            for result in audit_results:
+                if isinstance(result, Exception):
+                    logger.error(f"✗ Wipe audit write failed for session {session_id}: {result}")
+
             logger.info(
                 f"✓ SUCCESS: Hard-deleted {deleted_count} keys for session {session_id}"
             )
-            logger.info(f"✓ Audit log: {json.dumps(audit_log, indent=2)}")
-
-            # 5. Store audit log (optional, for compliance - can be removed for pure zero-persistence)
-            if settings.ENABLE_MEMORY_AUDIT:
-                audit_key = f"audit:{session_id}:{datetime.now().timestamp()}"
-                self.redis_client.hset(audit_key, mapping=audit_log)
-                self.redis_client.expire(
-                    audit_key, 86400
-                )  # Keep audit 24 hours for compliance
+            logger.info(f"✓ Audit log: {json.dumps(audit_event.to_fields(), indent=2)}")
 
             # 6. Return cleared state
-            state.transcript = []
+            state.transcript.clear()
             state.citizen_phone = None
             state.citizen_name = None
             state.citizen_location = None
@@ -231,6 +369,16 @@ class MemoryManager:
 
         except Exception as e:
             logger.error(f"✗ WIPE_FAILED: {e}")
+            if settings.ENABLE_MEMORY_AUDIT:
+                self.audit_trail.record(
+                    WipeAuditEvent(
+                        session_id=session_id,
+                        outcome=FAILED,
+                        grievance_category=state.grievance_category.value
+                        if state.grievance_category
+                        else "unknown",
+                    )
+                )
             # Return state unchanged on error - fail safely
             return {
                 "transcript": state.transcript,
@@ -239,6 +387,142 @@ class MemoryManager:
                 "current_state": state.current_state.value,
             }
 
+    def bulk_wipe(
+        self,
+        session_ids: Optional[Iterable[str]] = None,
+        predicate: Optional[Callable[[Dict[str, str]], bool]] = None,
+        ended_before: Optional[datetime] = None,
+        batch_size: int = None,
+    ) -> BulkWipeReport:
+        """
+        Wipe many sessions at once (shift change, incident drills).
+
+        Targets are either explicit session_ids, or every live session whose
+        metadata matches `predicate` and/or ended before `ended_before`.
+        Keys are removed with UNLINK (memory is reclaimed off Redis' main
+        thread) in pipelined batches; each batch checks EXISTS on the same
+        keys in the same round trip, so sessions that survive the wipe are
+        reported as stragglers.
+
+        Args:
+            session_ids: Sessions to wipe
+            predicate: Called with each session's metadata hash (plus "session_id")
+            ended_before: Only sessions in an ended state last updated before this time
+            batch_size: Sessions per pipeline (default: BULK_WIPE_BATCH_SIZE)
+
+        Returns:
+            BulkWipeReport with throughput and stragglers
+        """
+        if batch_size is None:
+            batch_size = settings.BULK_WIPE_BATCH_SIZE
+        if session_ids is None:
+            if predicate is None and ended_before is None:
+                raise ValueError("bulk_wipe needs session_ids, a predicate or ended_before")
+            session_ids = self._select_sessions(predicate, ended_before, batch_size)
+
+        report = BulkWipeReport()
+        start = time.perf_counter()
+
+        batch: List[str] = []
+        for session_id in session_ids:
+            batch.append(session_id)
+            if len(batch) >= batch_size:
+                self._wipe_batch(batch, report)
+                batch = []
+        if batch:
+            self._wipe_batch(batch, report)
+
+        report.elapsed_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"✓ Bulk wipe: {len(report.wiped)}/{report.requested} sessions, "
+            f"{report.keys_unlinked} keys in {report.batches} batches "
+            f"({report.sessions_per_second:.0f} sessions/s)"
+        )
+        if report.stragglers:
+            logger.warning(
+                f"⚠ Bulk wipe stragglers (still present): {report.stragglers}"
+            )
+
+        if settings.ENABLE_MEMORY_AUDIT and report.requested:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self.audit_trail.queue(
+                pipe,
+                WipeAuditEvent(
+                    session_id="bulk",
+                    outcome=WIPED,
+                    sessions=len(report.wiped),
+                ),
+            )
+            if report.stragglers:
+                self.audit_trail.queue(
+                    pipe,
+                    WipeAuditEvent(
+                        session_id="bulk",
+                        outcome=FAILED,
+                        sessions=len(report.stragglers),
+                    ),
+                )
+            pipe.execute()
+
+        return report
+
+    def _wipe_batch(self, batch: List[str], report: BulkWipeReport) -> None:
+        """UNLINK a batch of sessions and verify non-existence in one round trip."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for session_id in batch:
+            pipe.unlink(*session_keys(session_id))
+        for session_id in batch:
+            pipe.exists(*session_keys(session_id))
+        results = pipe.execute()
+
+        unlinked, remaining = results[: len(batch)], results[len(batch) :]
+        for session_id, unlinked_count, remaining_count in zip(batch, unlinked, remaining):
+            if remaining_count:
+                report.stragglers.append(session_id)
+            elif unlinked_count:
+                report.wiped.append(session_id)
+            else:
+                report.not_found.append(session_id)
+            report.keys_unlinked += unlinked_count
+
+        report.requested += len(batch)
+        report.batches += 1
+
+    def _select_sessions(
+        self,
+        predicate: Optional[Callable[[Dict[str, str]], bool]],
+        ended_before: Optional[datetime],
+        batch_size: int,
+    ) -> List[str]:
+        """Scan session metadata and return the ids matching the filters."""
+        selected: List[str] = []
+        keys = list(self.redis_client.scan_iter(match=METADATA_PATTERN, count=batch_size))
+
+        for offset in range(0, len(keys), batch_size):
+            chunk = keys[offset : offset + batch_size]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in chunk:
+                pipe.hgetall(key)
+
+            for key, metadata in zip(chunk, pipe.execute()):
+                if not metadata:
+                    continue  # Expired between SCAN and HGETALL
+                metadata = dict(metadata)
+                metadata["session_id"] = session_id_from_key(key)
+
+                if ended_before is not None:
+                    if metadata.get("state") not in ENDED_STATES:
+                        continue
+                    updated_at = metadata.get("updated_at") or metadata.get("created_at")
+                    if not updated_at or datetime.fromisoformat(updated_at) >= ended_before:
+                        continue
+                if predicate is not None and not predicate(metadata):
+                    continue
+                selected.append(metadata["session_id"])
+
+        return selected
+
     def cleanup_expired_sessions(self) -> int:
         """
         Manually trigger cleanup of expired sessions.
@@ -248,24 +532,16 @@ class MemoryManager:
             Number of sessions cleaned up
         """
         try:
-            # Scan for all session keys
-            cursor = 0
+            # Scan for all session keys (scan_iter walks every shard in cluster mode)
             cleaned = 0
 
-            while True:
-                cursor, keys = self.redis_client.scan(
-                    cursor, match="session:*", count=100
-                )
-                for key in keys:
-                    ttl = self.redis_client.ttl(key)
-                    if ttl == -1:
-                        # Key exists but no TTL - delete it
-                        self.redis_client.delete(key)
-                        cleaned += 1
-                        logger.info(f"Cleaned up orphaned session key: {key}")
-
-                if cursor == 0:
-                    break
+            for key in self.redis_client.scan_iter(match=SESSION_PATTERN, count=100):
+                ttl = self.redis_client.ttl(key)
+                if ttl == -1:
+                    # Key exists but no TTL - delete it
+                    self.redis_client.delete(key)
+                    cleaned += 1
+                    logger.info(f"Cleaned up orphaned session key: {key}")
 
             logger.info(f"✓ Cleanup complete: {cleaned} orphaned sessions removed")
             return cleaned
@@ -283,19 +559,14 @@ class MemoryManager:
             Dictionary with memory stats
         """
         try:
-            info = self.redis_client.info("memory")
-            cursor = 0
-            session_count = 0
-
-            while True:
-                cursor, keys = self.redis_client.scan(cursor, match="session:*")
-                session_count += len(keys)
-                if cursor == 0:
-                    break
+            used_memory, peak_memory = self._memory_usage()
+            session_count = sum(
+                1 for _ in self.redis_client.scan_iter(match=SESSION_PATTERN)
+            )
 
             return {
-                "memory_used_mb": info["used_memory"] / 1024 / 1024,
-                "memory_peak_mb": info["used_memory_peak"] / 1024 / 1024,
+                "memory_used_mb": used_memory / 1024 / 1024,
+                "memory_peak_mb": peak_memory / 1024 / 1024,
                 "active_sessions": session_count,
                 "timestamp": datetime.now().isoformat(),
             }
@@ -304,6 +575,34 @@ class MemoryManager:
             logger.error(f"Failed to get Redis stats: {e}")
             return {"error": str(e)}
 
+    def get_audit_report(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """
+        Wipe/escalation/failure counts per category for [start, end],
+        read from the hourly audit rollups.
+        """
+        try:
+            return self.audit_trail.get_report(start, end)
+        except Exception as e:
+            logger.error(f"Failed to build audit report: {e}")
+            return {"error": str(e)}
+
+    def _memory_usage(self):
+        """Return (used, peak) memory in bytes, summed over shards in cluster mode."""
+        if not self.cluster_mode:
+            info = self.redis_client.info("memory")
+            return info["used_memory"], info["used_memory_peak"]
+
+        per_node = self.redis_client.info(
+            "memory", target_nodes=RedisCluster.PRIMARIES
+        )
+        if "used_memory" in per_node:
+            # Single-primary cluster: redis-py unwraps the per-node dict
+            per_node = {"primary": per_node}
+        return (
+            sum(info["used_memory"] for info in per_node.values()),
+            sum(info["used_memory_peak"] for info in per_node.values()),
+        )
+
 
 # Global memory manager instance
 memory_manager = MemoryManager()
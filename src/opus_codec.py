@@ -0,0 +1,171 @@
+"""
+Opus Audio Codec for MCD 311 Sovereign Voice AI
+Compressed audio on /ws/call for callers on slow mobile connections:
+speech at 16-24 kbit/s instead of ~256 kbit/s of 16 kHz PCM16 or 350 kbit/s
+of 22 kHz WAV.
+
+An OPUS audio frame (src/audio_frames.py) carries one or more 20 ms Opus
+packets, each prefixed with its length:
+
+    [u16 little-endian length][packet] [u16 length][packet] ...
+
+- encode_opus() / frame_audio():  TTS audio -> Opus payload (runs on the
+  synthesis threads; fixed prompts are encoded once, see src/phrase_cache.py)
+- OpusStreamDecoder: one call's inbound mic stream -> 16 kHz PCM16 (runs in
+  the call's STT worker process, or its decoding thread). Opus decodes
+  straight to 16 kHz whatever rate the browser encoded at, so the audio
+  needs no resampling.
+
+The codec is negotiated per call (see websocket_server_integrated.py): the
+client lists what it can play and encode, and the server picks Opus when
+both sides have it, raw PCM / WAV otherwise.
+"""
+
+import logging
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from src.audio_frames import Codec
+from src.tts_engines import SynthesizedAudio
+
+try:
+    import opuslib
+except Exception:  # Optional dependency; also fails to import without libopus
+    opuslib = None
+
+logger = logging.getLogger(__name__)
+
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)  # Rates an Opus encoder accepts
+FRAME_MS = 20
+DECODE_RATE = 16000  # Inbound audio goes to STT (src/audio_ring.py SAMPLE_RATE)
+MAX_PACKET_MS = 120  # Longest Opus packet
+_LENGTH = struct.Struct("<H")
+
+
+def opus_available() -> bool:
+    return settings.OPUS_ENABLED and opuslib is not None
+
+
+def output_codecs() -> List[Codec]:
+    """Codecs the server can send TTS audio in, preferred first."""
+    return [Codec.OPUS, Codec.WAV] if opus_available() else [Codec.WAV]
+
+
+def _require_opus() -> None:
+    if opuslib is None:
+        raise RuntimeError(
+            "Opus audio requires the 'opuslib' package and libopus: "
+            "pip install opuslib (and e.g. apt install libopus0)"
+        )
+
+
+def pack_packets(packets: Iterable[bytes]) -> bytes:
+    """Length-prefixed Opus packets, as one frame payload."""
+    return b"".join(_LENGTH.pack(len(packet)) + packet for packet in packets)
+
+
+def unpack_packets(payload) -> Iterator[memoryview]:
+    """
+    The Opus packets of a frame payload (views, not copies).
+
+    Raises:
+        ValueError: If a length prefix runs past the payload
+    """
+    view = memoryview(payload)
+    offset = 0
+    while offset < view.nbytes:
+        if offset + _LENGTH.size > view.nbytes:
+            raise ValueError("Truncated Opus packet length")
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if offset + length > view.nbytes:
+            raise ValueError("Truncated Opus packet")
+        yield view[offset : offset + length]
+        offset += length
+
+
+def encode_opus(audio: SynthesizedAudio, bitrate: int = None) -> bytes:
+    """
+    Opus payload of 16-bit mono PCM audio. Rates Opus does not take (e.g.
+    espeak's 22050 Hz) are resampled up to the next one it does.
+
+    Raises:
+        RuntimeError: If opuslib / libopus is not installed
+        ValueError: For audio that is not PCM (e.g. gTTS MP3)
+    """
+    _require_opus()
+    if audio.format != "pcm":
+        raise ValueError(f"Opus encoding needs PCM audio, got {audio.format}")
+    samples = np.frombuffer(audio.data, dtype="<i2")
+    rate = next((r for r in OPUS_RATES if r >= audio.sample_rate), OPUS_RATES[-1])
+    if rate != audio.sample_rate and samples.size:
+        length = int(round(samples.size * rate / audio.sample_rate))
+        positions = np.linspace(0, samples.size - 1, length)
+        samples = np.interp(positions, np.arange(samples.size), samples).astype("<i2")
+
+    frame = rate * FRAME_MS // 1000
+    padded = -samples.size % frame
+    if padded:
+        samples = np.concatenate((samples, np.zeros(padded, dtype="<i2")))
+
+    encoder = opuslib.Encoder(rate, 1, "voip")
+    encoder.bitrate = bitrate or settings.OPUS_BITRATE_OUT
+    packets: List[bytes] = [
+        encoder.encode(samples[offset : offset + frame].tobytes(), frame)
+        for offset in range(0, samples.size, frame)
+    ]
+    return pack_packets(packets)
+
+
+def frame_audio(audio: SynthesizedAudio, codec: Codec = Codec.WAV) -> Tuple[Codec, bytes]:
+    """
+    Frame codec and payload of TTS audio for a call's output codec: Opus
+    if negotiated, else SynthesizedAudio.to_frame() (WAV, or gtts MP3 as is).
+    Falls back to to_frame() if Opus encoding fails.
+    """
+    if codec == Codec.OPUS and audio.format == "pcm":
+        try:
+            return Codec.OPUS, encode_opus(audio)
+        except Exception as e:
+            logger.warning(f"Opus encoding failed, sending WAV: {e}")
+    return audio.to_frame()
+
+
+class OpusStreamDecoder:
+    """One call's inbound Opus stream (decoder state carries across frames)."""
+
+    def __init__(self):
+        _require_opus()
+        self._decoder = opuslib.Decoder(DECODE_RATE, 1)
+        self._max_frame = DECODE_RATE * MAX_PACKET_MS // 1000
+
+    def decode(self, payload) -> bytes:
+        """
+        One frame payload -> 16 kHz PCM16.
+
+        Raises:
+            ValueError: If the payload is not length-prefixed Opus packets
+        """
+        try:
+            return b"".join(
+                self._decoder.decode(bytes(packet), self._max_frame)
+                for packet in unpack_packets(payload)
+            )
+        except opuslib.OpusError as e:
+            raise ValueError(f"Corrupt Opus packet: {e}")
+
+
+def negotiate(offered: Iterable[str], supported: Iterable[Codec]) -> Codec:
+    """First codec the client offered (by name, most preferred first) that we support."""
+    supported = list(supported)
+    for name in offered:
+        try:
+            codec = Codec[str(name).upper()]
+        except KeyError:
+            continue
+        if codec in supported:
+            return codec
+    return supported[-1]
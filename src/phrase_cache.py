@@ -0,0 +1,216 @@
+"""
+Phrase Audio Cache for MCD 311 Sovereign Voice AI
+Ready-to-send audio (frame codec and payload: WAV, or MP3 from gtts) for
+phrases the agent says on many calls, so they are synthesized and encoded
+once instead of on every call.
+
+- Fixed IVR prompts (FIXED_PROMPTS) are rendered at server startup and
+  pinned: they are never evicted.
+- Dynamic phrases built only from non-citizen values (category names,
+  confidence, policy-table departments) are cached on first use and evicted
+  least-recently-used beyond PHRASE_CACHE_MAX_ENTRIES.
+- Entries are keyed by (text, language, voice, codec) and hold the audio
+  already encoded for that codec: a call that negotiated Opus gets the
+  Opus payload as stored, and a change of TTS voice never serves stale
+  audio. Fixed prompts are encoded for every codec the server can send.
+
+Citizen data is never cached. A phrase is only stored if the caller marks it
+cacheable AND it passes contains_citizen_data(): none of the call's citizen
+field values appear in it, and it has no phone number, email address or
+ticket id. Anything else is synthesized per call and forgotten.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.settings import settings
+from src.audio_frames import Codec
+from src.audio_processor import audio_processor
+from src.opus_codec import frame_audio, output_codecs
+from src.synthesis_service import PROMPT, synthesis_service
+
+logger = logging.getLogger(__name__)
+
+# Prompts identical on every call, rendered at startup
+FIXED_PROMPTS: Dict[str, str] = {
+    "greeting": "MCD 311 Grievance Redressal System. Please state your emergency or grievance.",
+    "still_there": "Are you still there? Please state your grievance.",
+    "repeat": "Sorry, I did not catch that. Could you please repeat?",
+    "hold": "Please hold while I register your complaint.",
+    "goodbye": "Thank you for calling MCD 311. Goodbye.",
+}
+
+# AgentState fields whose values may never appear in a cached phrase
+CITIZEN_FIELDS = (
+    "citizen_name",
+    "citizen_phone",
+    "citizen_location",
+    "grievance_description",
+)
+
+# Shapes of citizen data that no cached phrase may contain
+_CITIZEN_DATA_PATTERNS = (
+    re.compile(r"\+?\d[\d\s-]{7,}\d"),  # Phone / account numbers
+    re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+"),  # Email addresses
+    re.compile(r"\bMCD-\d{4}-\w+", re.IGNORECASE),  # Ticket ids (per call)
+)
+
+CacheKey = Tuple[str, str, str, str]
+FrameAudio = Tuple[Codec, bytes]  # Frame codec and payload
+
+
+def contains_citizen_data(text: str, citizen_values: Iterable[Any] = ()) -> bool:
+    """Whether text contains a value of the call's citizen fields or looks like PII."""
+    lowered = text.lower()
+    for value in citizen_values:
+        if value and str(value).strip().lower() in lowered:
+            return True
+    return any(pattern.search(text) for pattern in _CITIZEN_DATA_PATTERNS)
+
+
+class PhraseCache:
+    """LRU of encoded phrase audio, with pinned fixed prompts."""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = (
+            settings.PHRASE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self._entries: "OrderedDict[CacheKey, FrameAudio]" = OrderedDict()  # Dynamic, LRU order
+        self._pinned: Dict[CacheKey, FrameAudio] = {}  # Fixed prompts
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "refused": 0,  # Cacheable by the caller but held citizen data
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def key(text: str, language: str = "en", codec: Codec = Codec.WAV) -> CacheKey:
+        engine = audio_processor.tts_engine
+        voice = f"{engine.name}:{getattr(engine, 'voice', '')}" if engine else "none"
+        return (" ".join(text.split()), language, voice, codec.name.lower())
+
+    def get(
+        self, text: str, language: str = "en", codec: Codec = Codec.WAV
+    ) -> Optional[FrameAudio]:
+        """Cached audio for text in the call's output codec, or None."""
+        key = self.key(text, language, codec)
+        with self._lock:
+            audio = self._pinned.get(key)
+            if audio is None:
+                audio = self._entries.get(key)
+                if audio is not None:
+                    self._entries.move_to_end(key)
+            self._counters["hits" if audio is not None else "misses"] += 1
+        return audio
+
+    def put(
+        self,
+        text: str,
+        audio: FrameAudio,
+        language: str = "en",
+        pinned: bool = False,
+        citizen_values: Iterable[Any] = (),
+        codec: Codec = Codec.WAV,
+    ) -> bool:
+        """
+        Cache a phrase's audio, encoded for the output codec. Returns False
+        if it was refused (citizen data).
+        """
+        if contains_citizen_data(text, citizen_values):
+            with self._lock:
+                self._counters["refused"] += 1
+            logger.warning("Phrase not cached: it contains citizen data")
+            return False
+        key = self.key(text, language, codec)
+        with self._lock:
+            if pinned:
+                self._pinned[key] = audio
+                return True
+            if self.max_entries <= 0:
+                return False
+            self._entries[key] = audio
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return True
+
+    async def render(
+        self,
+        text: str,
+        priority: int = PROMPT,
+        session_id: Optional[str] = None,
+        cacheable: bool = False,
+        citizen_values: Iterable[Any] = (),
+        language: str = "en",
+        codec: Codec = Codec.WAV,
+    ) -> Optional[FrameAudio]:
+        """
+        Audio for text in the call's output codec: from the cache, or
+        synthesized and encoded on the pool. Only phrases marked cacheable
+        (built from non-citizen values) are looked up and stored.
+
+        Returns:
+            (codec, payload) for the audio frame, or None if the request was
+            cancelled
+        """
+        if cacheable:
+            cached = self.get(text, language, codec)
+            if cached is not None:
+                return cached
+
+        audio = await synthesis_service.submit(text, priority, session_id=session_id)
+        if audio is None:
+            return None
+        frame = await synthesis_service.run(frame_audio, audio, codec)
+        if cacheable:
+            self.put(text, frame, language, citizen_values=citizen_values, codec=codec)
+        return frame
+
+    async def prerender(self, prompts: Iterable[str] = None, language: str = "en") -> int:
+        """
+        Render and pin the fixed prompts, encoded for every output codec.
+        Returns how many prompts were rendered.
+        """
+        if audio_processor.tts_engine is None:
+            return 0
+        rendered = 0
+        for text in prompts if prompts is not None else FIXED_PROMPTS.values():
+            try:
+                audio = await synthesis_service.submit(text, PROMPT)
+                if audio is None:
+                    continue
+                for codec in output_codecs():
+                    frame = await synthesis_service.run(frame_audio, audio, codec)
+                    pinned = self.put(text, frame, language, pinned=True, codec=codec)
+            except Exception as e:
+                logger.error(f"Could not pre-render prompt: {e}")
+                continue
+            rendered += pinned
+        logger.info(f"✓ Pre-rendered {rendered} fixed prompts")
+        return rendered
+
+    def clear(self) -> None:
+        """Drop dynamic entries (pinned prompts stay)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["pinned"] = len(self._pinned)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# Global phrase cache
+phrase_cache = PhraseCache()
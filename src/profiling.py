@@ -0,0 +1,243 @@
+"""
+Latency Profiling for MCD 311 Sovereign Voice AI
+Timing spans around workflow nodes and the LLM / Redis calls inside them,
+aggregated into rolling per-span histograms.
+
+Span names:
+- "node:<name>"  one workflow node, including its write-behind flush
+- "llm:<op>"     one Ollama request
+- "redis:<op>"   one session store / checkpoint round trip (incl. thread hop)
+- "tts:<op>"     speech synthesis: time queued, and time on the pool
+
+Node spans are also collected per call. When the call finishes, its
+critical path is walked back from the last node: each step goes to the node
+that finished last before the current one started, i.e. the branch the
+join actually waited for. The profile reports p50/p95/p99 per span and the
+critical path seen most often over the recent calls.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+MAX_PENDING_CALLS = 10000  # Calls that never finish (crashed) are evicted LRU
+
+# (node, start, end) in perf_counter seconds
+NodeTiming = Tuple[str, float, float]
+
+
+class RollingHistogram:
+    """Latency samples (ms) for one span, over the last `window` observations."""
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0  # Lifetime observations
+        self.errors = 0
+
+    def observe(self, duration_ms: float, error: bool = False) -> None:
+        self.samples.append(duration_ms)
+        self.count += 1
+        if error:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        summary: Dict[str, Any] = {"count": self.count, "errors": self.errors}
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = round(percentile(ordered, pct), 2)
+        summary["max_ms"] = round(ordered[-1], 2) if ordered else 0.0
+        return summary
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without float error
+    return ordered[int(rank) - 1]
+
+
+def critical_path(timings: List[NodeTiming]) -> List[str]:
+    """
+    Critical path of one call from its node timings, first node first.
+    Needs no graph: a node waited on whichever node finished last before it
+    started, so parallel branches resolve to the slower one.
+    """
+    if not timings:
+        return []
+    remaining = sorted(timings, key=lambda timing: timing[2])
+    node, start, _ = remaining.pop()
+    path = [node]
+    while remaining:
+        earlier = [timing for timing in remaining if timing[2] <= start]
+        if not earlier:
+            break
+        node, start, _ = earlier[-1]
+        path.append(node)
+        remaining = earlier[:-1]
+    path.reverse()
+    return path
+
+
+class LatencyProfiler:
+    """
+    Collects timing spans. Safe to use from the event loop and from worker
+    threads; when disabled every span is a no-op.
+    """
+
+    def __init__(self, enabled: bool = None, window: int = None):
+        self.enabled = settings.PROFILING_ENABLED if enabled is None else enabled
+        self.window = window or settings.PROFILE_WINDOW
+
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._pending: "OrderedDict[str, List[NodeTiming]]" = OrderedDict()
+        self._paths: Deque[Tuple[str, ...]] = deque(maxlen=self.window)
+        self._call_ms = RollingHistogram(self.window)
+
+    def observe(self, name: str, duration_ms: float, error: bool = False) -> None:
+        """Record one span duration."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.observe(duration_ms, error)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block (may contain awaits)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, error)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator form of span() for sync functions and coroutines."""
+
+        def decorator(fn: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await fn(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def node_span(self, session_id: str, node: str) -> Iterator[None]:
+        """Time one workflow node and add it to the call's trace."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            end = time.perf_counter()
+            self.observe(f"node:{node}", (end - start) * 1000, error)
+            with self._lock:
+                trace = self._pending.get(session_id)
+                if trace is None:
+                    trace = self._pending[session_id] = []
+                    if len(self._pending) > MAX_PENDING_CALLS:
+                        self._pending.popitem(last=False)
+                trace.append((node, start, end))
+
+    def finish_call(self, session_id: str) -> Optional[List[str]]:
+        """Close a call's trace and record its critical path."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            timings = self._pending.pop(session_id, None)
+        if not timings:
+            return None
+
+        path = critical_path(timings)
+        call_ms = (max(t[2] for t in timings) - min(t[1] for t in timings)) * 1000
+        with self._lock:
+            self._paths.append(tuple(path))
+            self._call_ms.observe(call_ms)
+        return path
+
+    def get_profile(self) -> Dict[str, Any]:
+        """Per-span percentiles and the current critical path."""
+        with self._lock:
+            spans = {name: h.summary() for name, h in sorted(self._histograms.items())}
+            paths = Counter(self._paths)
+            calls = self._call_ms.summary()
+
+        nodes = {name[5:]: s for name, s in spans.items() if name.startswith("node:")}
+        total = sum(paths.values())
+        path: List[str] = []
+        share = 0.0
+        if total:
+            top, seen = paths.most_common(1)[0]
+            path, share = list(top), round(seen / total, 4)
+        on_path: Counter = Counter()
+        for p, seen in paths.items():
+            for node in p:
+                on_path[node] += seen
+        for node, summary in nodes.items():
+            summary["critical"] = node in path
+            summary["critical_share"] = round(on_path[node] / total, 4) if total else 0.0
+
+        on_path_nodes = [n for n in path if n in nodes]
+        return {
+            "enabled": self.enabled,
+            "window": self.window,
+            "calls": calls,
+            "critical_path": {
+                "nodes": path,
+                "share": share,  # Of recent calls that took exactly this path
+                "p50_ms": round(sum(nodes[n]["p50_ms"] for n in on_path_nodes), 2),
+                "bottleneck": max(on_path_nodes, key=lambda n: nodes[n]["p50_ms"])
+                if on_path_nodes
+                else None,
+            },
+            "nodes": nodes,
+            "spans": {name: s for name, s in spans.items() if not name.startswith("node:")},
+        }
+
+    def reset(self) -> None:
+        """Drop every sample (e.g. between benchmark runs)."""
+        with self._lock:
+            self._histograms.clear()
+            self._pending.clear()
+            self._paths.clear()
+            self._call_ms = RollingHistogram(self.window)
+
+
+# Global profiler
+profiler = LatencyProfiler()
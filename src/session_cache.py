@@ -0,0 +1,292 @@
+"""
+Write-Behind Session Cache for MCD 311 Sovereign Voice AI
+Coalesces per-node session writes in-process and flushes them to Redis
+at configurable points, instead of one Redis round trip per mutation.
+
+A single worker owns a session for the whole call, so the in-process copy
+is authoritative while the call runs. Flush points (settings.SESSION_FLUSH_POLICY):
+- "node":     once at the end of every workflow node (default)
+- "call":     only at the end of the call, right before the wipe
+- "interval": every SESSION_FLUSH_INTERVAL_MS milliseconds, by a flusher
+              task on the event loop (start()), so a session that goes
+              quiet is still written
+
+Whatever the policy, memory_wipe_node always flushes first and then drops
+the in-process copy, so the wipe sees (and deletes) every key. Wiped
+session ids are remembered, and a write that lands after the wipe (e.g. an
+update_session still running in a worker thread) is dropped.
+
+The cache keeps a snapshot of each state (nodes go on mutating theirs). The
+cache-wide lock only guards the in-process maps; Redis round trips run
+under the session's own lock, so calls never wait on each other's I/O.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.settings import settings
+from src.agent_state import AgentState
+from src.memory_manager import BulkWipeReport, MemoryManager, memory_manager
+
+logger = logging.getLogger(__name__)
+
+FLUSH_POLICIES = ("node", "call", "interval")
+MAX_TOMBSTONES = 10000  # Wiped session ids remembered to drop late writes
+
+
+@dataclass
+class _CacheEntry:
+    """Pending state for one session."""
+
+    state: AgentState  # Snapshot, never the node's own object
+    ttl_seconds: Optional[int] = None
+    dirty: bool = True
+    stored: bool = False  # False until the first store_session reaches Redis
+    last_flush: float = 0.0
+    wiped: bool = False  # Set by the wipe; later flushes are no-ops
+    lock: threading.Lock = field(default_factory=threading.Lock)  # Serializes this session's I/O
+
+
+class WriteBehindSessionCache:
+    """
+    In-process write-behind layer in front of MemoryManager, keyed by session_id.
+    Exposes the same store/update/retrieve/wipe calls as MemoryManager.
+    """
+
+    def __init__(
+        self,
+        manager: MemoryManager,
+        flush_policy: str = None,
+        flush_interval_ms: int = None,
+    ):
+        self.manager = manager
+        self.flush_policy = (flush_policy or settings.SESSION_FLUSH_POLICY).lower()
+        if self.flush_policy not in FLUSH_POLICIES:
+            raise ValueError(
+                f"Unknown SESSION_FLUSH_POLICY '{self.flush_policy}'. "
+                f"Choose one of: {', '.join(FLUSH_POLICIES)}"
+            )
+        if flush_interval_ms is None:
+            flush_interval_ms = settings.SESSION_FLUSH_INTERVAL_MS
+        self.flush_interval_seconds = flush_interval_ms / 1000.0
+
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._wiped: "OrderedDict[str, None]" = OrderedDict()  # Tombstones, LRU-capped
+        self._lock = threading.Lock()  # The maps and counters only, never held across I/O
+        self._flusher: Optional[asyncio.Task] = None
+        self._flusher_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.writes_coalesced = 0
+        self.flushes = 0
+        self.late_writes_dropped = 0
+
+    def start(self) -> None:
+        """
+        Start the interval flusher on the running event loop (first call per
+        loop; a no-op for the other policies). Called by run_call / stream_call.
+        """
+        if self.flush_policy != "interval":
+            return
+        loop = asyncio.get_running_loop()
+        if self._flusher_loop is loop and self._flusher is not None and not self._flusher.done():
+            return
+        self._flusher_loop = loop
+        self._flusher = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await asyncio.to_thread(self.flush_due)
+            except Exception as e:
+                logger.error(f"Interval session flush failed: {e}")
+
+    def flush_due(self) -> int:
+        """Flush every dirty session not flushed for an interval. Returns how many."""
+        now = time.monotonic()
+        with self._lock:
+            due: List[_CacheEntry] = [
+                entry
+                for entry in self._entries.values()
+                if entry.dirty and now - entry.last_flush >= self.flush_interval_seconds
+            ]
+        return sum(1 for entry in due if self._flush_entry(entry))
+
+    def _is_wiped(self, session_id: str) -> bool:
+        """Whether the session was wiped; counts the late write the caller drops."""
+        if session_id not in self._wiped:
+            return False
+        self.late_writes_dropped += 1
+        logger.debug(f"Dropped a write for wiped session {session_id}")
+        return True
+
+    def _tombstone(self, session_id: str) -> Optional[_CacheEntry]:
+        """
+        Forget the in-process copy and refuse later writes (caller holds the
+        lock). Returns the forgotten entry, if any.
+        """
+        self._wiped[session_id] = None
+        self._wiped.move_to_end(session_id)
+        while len(self._wiped) > MAX_TOMBSTONES:
+            self._wiped.popitem(last=False)
+        return self._entries.pop(session_id, None)
+
+    def _retire(self, session_ids: Iterable[str]) -> None:
+        """Tombstone sessions and wait out any flush of theirs already under way."""
+        with self._lock:
+            entries = [self._tombstone(session_id) for session_id in session_ids]
+        for entry in entries:
+            if entry is not None:
+                with entry.lock:
+                    entry.wiped = True
+
+    def store_session(self, state: AgentState, ttl_seconds: int = None) -> bool:
+        """Register a new session. Written to Redis at the next flush point."""
+        with self._lock:
+            if self._is_wiped(state.session_id):
+                return False
+            self._entries[state.session_id] = _CacheEntry(
+                state=copy.deepcopy(state), ttl_seconds=ttl_seconds, last_flush=time.monotonic()
+            )
+        return self._maybe_flush_interval(state.session_id)
+
+    def update_session(self, state: AgentState) -> bool:
+        """Record the latest state. Earlier unflushed versions are superseded."""
+        snapshot = copy.deepcopy(state)
+        with self._lock:
+            if self._is_wiped(state.session_id):
+                return False
+            entry = self._entries.get(state.session_id)
+            if entry is None:
+                # Session was stored before the cache existed (or by another path)
+                entry = _CacheEntry(state=snapshot, stored=True, last_flush=time.monotonic())
+                self._entries[state.session_id] = entry
+            else:
+                if entry.dirty:
+                    self.writes_coalesced += 1
+                entry.state = snapshot
+                entry.dirty = True
+        return self._maybe_flush_interval(state.session_id)
+
+    def retrieve_session(self, session_id: str) -> Optional[AgentState]:
+        """Return the in-process copy if this worker owns the session, else read Redis."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                return entry.state
+        return self.manager.retrieve_session(session_id)
+
+    def node_boundary(self, session_id: str) -> bool:
+        """Called by the workflow after every node."""
+        if self.flush_policy == "node":
+            return self.flush(session_id)
+        return self._maybe_flush_interval(session_id)
+
+    def end_call(self, session_id: str) -> bool:
+        """Called when the call finishes, whatever the policy."""
+        return self.flush(session_id)
+
+    def flush(self, session_id: str) -> bool:
+        """
+        Write the pending state for a session to Redis, if any.
+
+        Returns:
+            True if nothing was pending or the write succeeded
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+        if entry is None:
+            return True
+        return self._flush_entry(entry)
+
+    def _flush_entry(self, entry: _CacheEntry) -> bool:
+        with entry.lock:
+            return self._write(entry)
+
+    def _write(self, entry: _CacheEntry) -> bool:
+        """Flush one entry; the caller holds entry.lock (not the cache lock)."""
+        with self._lock:
+            if entry.wiped or not entry.dirty:
+                return True
+            state, stored, ttl_seconds = entry.state, entry.stored, entry.ttl_seconds
+            entry.dirty = False  # An update during the write marks it dirty again
+
+        if stored:
+            ok = self.manager.update_session(state)
+        else:
+            ok = self.manager.store_session(state, ttl_seconds)
+
+        with self._lock:
+            if ok:
+                entry.stored = True
+                entry.last_flush = time.monotonic()
+                self.flushes += 1
+            else:
+                entry.dirty = True
+        return ok
+
+    def memory_wipe_node(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Flush, forget the in-process copy, then hard-delete from Redis.
+        The session is tombstoned first and its lock is held from flush to
+        wipe, so no write of this session can land in between.
+        """
+        with self._lock:
+            entry = self._tombstone(state.session_id)
+        if entry is None:
+            return self.manager.memory_wipe_node(state)
+        with entry.lock:
+            self._write(entry)
+            entry.wiped = True
+            return self.manager.memory_wipe_node(state)
+
+    def bulk_wipe(
+        self, session_ids: Optional[Iterable[str]] = None, **filters
+    ) -> BulkWipeReport:
+        """
+        Bulk wipe through MemoryManager.bulk_wipe, also dropping in-process copies.
+        Explicit ids are forgotten before the UNLINK so no later flush can
+        resurrect them; filter-selected ids are forgotten once known.
+        """
+        if session_ids is not None:
+            session_ids = list(session_ids)
+            self._retire(session_ids)
+
+        report = self.manager.bulk_wipe(session_ids, **filters)
+
+        self._retire(report.wiped + report.stragglers)
+        return report
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            pending = sum(1 for e in self._entries.values() if e.dirty)
+            return {
+                "flush_policy": self.flush_policy,
+                "cached_sessions": len(self._entries),
+                "pending_flushes": pending,
+                "flushes": self.flushes,
+                "writes_coalesced": self.writes_coalesced,
+                "late_writes_dropped": self.late_writes_dropped,
+            }
+
+    def _maybe_flush_interval(self, session_id: str) -> bool:
+        """Under the "interval" policy, flush if the interval has elapsed."""
+        if self.flush_policy != "interval":
+            return True
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return True
+            if time.monotonic() - entry.last_flush < self.flush_interval_seconds:
+                return True
+        return self._flush_entry(entry)
+
+
+# Global write-behind cache in front of the global memory manager
+session_cache = WriteBehindSessionCache(memory_manager)
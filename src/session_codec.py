@@ -0,0 +1,303 @@
+"""
+Session Codecs for MCD 311 Sovereign Voice AI
+Selectable wire formats for storing AgentState in Redis.
+
+Two codecs are available (see settings.SESSION_CODEC):
+- "hash":    The original Redis HASH layout (to_redis_dict / from_redis_dict).
+             Human-readable in redis-cli, but every value is a string and some
+             fields are not round-tripped.
+- "msgpack": A compact, versioned binary encoding stored as a single Redis
+             string. Round-trips every AgentState field losslessly.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.agent_state import AgentState, CallState, GrievanceCategory
+from src.transcript import Transcript
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, only needed for the binary codec
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCodec(ABC):
+    """
+    Base class for session codecs (a codec missing encode or decode cannot
+    be instantiated).
+
+    A codec converts an AgentState to the payload stored in Redis and back.
+    `binary` tells the MemoryManager whether the payload is a single bytes
+    value (stored with SET/GET) or a field mapping (stored with HSET/HGETALL).
+    """
+
+    name: str = ""
+    binary: bool = False
+
+    @abstractmethod
+    def encode(self, state: AgentState) -> Any:
+        ...
+
+    @abstractmethod
+    def decode(self, payload: Any) -> AgentState:
+        ...
+
+
+class HashSessionCodec(SessionCodec):
+    """The original Redis HASH layout, kept as the default for compatibility."""
+
+    name = "hash"
+    binary = False
+
+    def encode(self, state: AgentState) -> Dict[str, Any]:
+        return state.to_redis_dict()
+
+    def decode(self, payload: Dict[str, str]) -> AgentState:
+        return AgentState.from_redis_dict(payload)
+
+
+# === MSGPACK SCHEMAS ===
+# Each schema version pins its field order and enum tables. Never edit a
+# published version - add a new one and bump MSGPACK_SCHEMA_VERSION instead,
+# so sessions written by older workers still decode during a rolling deploy.
+
+_V1_CATEGORIES: Tuple[GrievanceCategory, ...] = (
+    GrievanceCategory.WATER_SUPPLY,
+    GrievanceCategory.SEWAGE,
+    GrievanceCategory.ROAD,
+    GrievanceCategory.STREET_LIGHT,
+    GrievanceCategory.ILLEGAL_CONSTRUCTION,
+    GrievanceCategory.SANITATION,
+    GrievanceCategory.PARKING,
+    GrievanceCategory.NOISE_POLLUTION,
+    GrievanceCategory.OTHER,
+)
+
+_V1_CALL_STATES: Tuple[CallState, ...] = (
+    CallState.INITIATED,
+    CallState.LISTENING,
+    CallState.PROCESSING,
+    CallState.RESPONDING,
+    CallState.ESCALATION_CHECK,
+    CallState.RESOLVED,
+    CallState.ESCALATED,
+    CallState.COMPLETED,
+    CallState.WIPED,
+)
+
+_V1_CATEGORY_INDEX = {member: i for i, member in enumerate(_V1_CATEGORIES)}
+_V1_CALL_STATE_INDEX = {member: i for i, member in enumerate(_V1_CALL_STATES)}
+
+MSGPACK_SCHEMA_VERSION = 3
+
+
+def _encode_v1(state: AgentState) -> List[Any]:
+    """Flatten a state into the v1 positional layout."""
+    return [
+        1,
+        state.session_id,
+        state.call_timestamp,
+        state.call_duration_seconds,
+        state.citizen_phone,
+        state.citizen_name,
+        state.citizen_location,
+        state.citizen_language,
+        _V1_CATEGORY_INDEX[state.grievance_category]
+        if state.grievance_category is not None
+        else None,
+        state.grievance_description,
+        state.grievance_latitude,
+        state.grievance_longitude,
+        state.grievance_attachment_count,
+        _V1_CALL_STATE_INDEX[state.current_state],
+        state.confidence_score,
+        state.requires_escalation,
+        state.escalation_reason,
+        state.assigned_department,
+        [
+            [e["timestamp"], e["speaker"], e["message"], e["confidence"]]
+            for e in state.transcript
+        ],
+        state.graph_checkpoint_id,
+        state.checkpoint_timestamp,
+        state.system_metadata,
+        state.error_logs,
+    ]
+
+
+def _decode_v1(fields: List[Any]) -> AgentState:
+    """Rebuild a state from the v1 positional layout."""
+    (
+        _version,
+        session_id,
+        call_timestamp,
+        call_duration_seconds,
+        citizen_phone,
+        citizen_name,
+        citizen_location,
+        citizen_language,
+        category_index,
+        grievance_description,
+        grievance_latitude,
+        grievance_longitude,
+        grievance_attachment_count,
+        state_index,
+        confidence_score,
+        requires_escalation,
+        escalation_reason,
+        assigned_department,
+        transcript_rows,
+        checkpoint_id,
+        checkpoint_timestamp,
+        system_metadata,
+        error_logs,
+    ) = fields
+
+    return AgentState(
+        session_id=session_id,
+        call_timestamp=call_timestamp,
+        call_duration_seconds=call_duration_seconds,
+        citizen_phone=citizen_phone,
+        citizen_name=citizen_name,
+        citizen_location=citizen_location,
+        citizen_language=citizen_language,
+        grievance_category=_V1_CATEGORIES[category_index]
+        if category_index is not None
+        else None,
+        grievance_description=grievance_description,
+        grievance_latitude=grievance_latitude,
+        grievance_longitude=grievance_longitude,
+        grievance_attachment_count=grievance_attachment_count,
+        current_state=_V1_CALL_STATES[state_index],
+        confidence_score=confidence_score,
+        requires_escalation=requires_escalation,
+        escalation_reason=escalation_reason,
+        assigned_department=assigned_department,
+        transcript=[
+            {
+                "timestamp": timestamp,
+                "speaker": speaker,
+                "message": message,
+                "confidence": confidence,
+            }
+            for timestamp, speaker, message, confidence in transcript_rows
+        ],
+        graph_checkpoint_id=checkpoint_id,
+        checkpoint_timestamp=checkpoint_timestamp,
+        system_metadata=system_metadata,
+        error_logs=error_logs,
+    )
+
+
+# v2: v1 layout (same enum tables) + call_deadline appended
+
+
+def _encode_v2(state: AgentState) -> List[Any]:
+    """Flatten a state into the v2 positional layout."""
+    fields = _encode_v1(state)
+    fields[0] = 2
+    fields.append(state.call_deadline)
+    return fields
+
+
+def _decode_v2(fields: List[Any]) -> AgentState:
+    """Rebuild a state from the v2 positional layout."""
+    state = _decode_v1(fields[:-1])
+    state.call_deadline = fields[-1]
+    return state
+
+
+# v3: v2 layout + the bounded transcript's summary state appended:
+# summary, pending evicted [speaker, message] turns, dropped turn count
+
+
+def _encode_v3(state: AgentState) -> List[Any]:
+    """Flatten a state into the v3 positional layout."""
+    fields = _encode_v2(state)
+    fields[0] = 3
+    transcript = state.transcript
+    fields.append(transcript.summary)
+    fields.append([list(turn) for turn in transcript.evicted])
+    fields.append(transcript.total_turns - len(transcript))
+    return fields
+
+
+def _decode_v3(fields: List[Any]) -> AgentState:
+    """Rebuild a state from the v3 positional layout."""
+    state = _decode_v2(fields[:-3])
+    summary, evicted, dropped = fields[-3:]
+    state.transcript = Transcript(
+        state.transcript.to_list(), summary=summary, evicted=evicted, dropped=dropped
+    )
+    return state
+
+
+_MSGPACK_ENCODERS: Dict[int, Callable[[AgentState], List[Any]]] = {
+    1: _encode_v1,
+    2: _encode_v2,
+    3: _encode_v3,
+}
+_MSGPACK_DECODERS: Dict[int, Callable[[List[Any]], AgentState]] = {
+    1: _decode_v1,
+    2: _decode_v2,
+    3: _decode_v3,
+}
+
+
+class MsgpackSessionCodec(SessionCodec):
+    """
+    Compact binary codec.
+    Payload is a msgpack array whose first element is the schema version,
+    followed by the fields in the order pinned by that version. Enums are
+    stored as small integer indexes into the version's enum table.
+    """
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self, schema_version: int = MSGPACK_SCHEMA_VERSION):
+        if msgpack is None:
+            raise RuntimeError(
+                "SESSION_CODEC=msgpack requires the 'msgpack' package: pip install msgpack"
+            )
+        if schema_version not in _MSGPACK_ENCODERS:
+            raise ValueError(f"Unknown msgpack session schema version: {schema_version}")
+        self.schema_version = schema_version
+        self._encode_fields = _MSGPACK_ENCODERS[schema_version]
+
+    def encode(self, state: AgentState) -> bytes:
+        return msgpack.packb(self._encode_fields(state), use_bin_type=True)
+
+    def decode(self, payload: bytes) -> AgentState:
+        fields = msgpack.unpackb(payload, raw=False)
+        version = fields[0]
+        decoder = _MSGPACK_DECODERS.get(version)
+        if decoder is None:
+            raise ValueError(f"Unknown msgpack session schema version: {version}")
+        return decoder(fields)
+
+
+_CODECS = {
+    HashSessionCodec.name: HashSessionCodec,
+    MsgpackSessionCodec.name: MsgpackSessionCodec,
+}
+
+
+def get_session_codec(name: str) -> SessionCodec:
+    """
+    Build the codec selected by name ("hash" or "msgpack").
+
+    Raises:
+        ValueError: If the codec name is unknown
+    """
+    try:
+        codec_cls = _CODECS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown session codec '{name}'. Choose one of: {', '.join(_CODECS)}"
+        )
+    return codec_cls()
@@ -0,0 +1,57 @@
+"""
+Redis key schema for MCD 311 Sovereign Voice AI sessions.
+
+Every key that belongs to a session wraps the session id in a Redis Cluster
+hash tag ("{...}"), so all of them hash to the same slot. That keeps the
+multi-key DELETE in memory_wipe_node a single atomic command on a cluster
+(no CROSSSLOT error) while different sessions still spread across shards.
+On a standalone Redis the braces are just part of the key name.
+"""
+
+from typing import Tuple
+
+SESSION_PREFIX = "session"
+METADATA_PREFIX = "metadata"
+CHECKPOINT_PREFIX = "checkpoint"
+TRANSCRIPT_PREFIX = "transcript"
+
+# SCAN patterns (match every session regardless of slot)
+SESSION_PATTERN = f"{SESSION_PREFIX}:*"
+METADATA_PATTERN = f"{METADATA_PREFIX}:*"
+
+
+def hash_tag(session_id: str) -> str:
+    """Return the cluster hash tag for a session."""
+    return "{" + session_id + "}"
+
+
+def session_key(session_id: str) -> str:
+    return f"{SESSION_PREFIX}:{hash_tag(session_id)}"
+
+
+def metadata_key(session_id: str) -> str:
+    return f"{METADATA_PREFIX}:{hash_tag(session_id)}"
+
+
+def checkpoint_key(session_id: str) -> str:
+    return f"{CHECKPOINT_PREFIX}:{hash_tag(session_id)}"
+
+
+def transcript_key(session_id: str) -> str:
+    return f"{TRANSCRIPT_PREFIX}:{hash_tag(session_id)}"
+
+
+def session_keys(session_id: str) -> Tuple[str, str, str, str]:
+    """All keys holding citizen data for a session, in one hash slot."""
+    return (
+        session_key(session_id),
+        metadata_key(session_id),
+        checkpoint_key(session_id),
+        transcript_key(session_id),
+    )
+
+
+def session_id_from_key(key: str) -> str:
+    """Extract the session id from the hash tag of a session-scoped key."""
+    start = key.index("{") + 1
+    return key[start : key.index("}", start)]
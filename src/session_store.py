@@ -0,0 +1,605 @@
+"""
+Session Store Backends for MCD 311 Sovereign Voice AI
+Defines the storage interface MemoryManager relies on, plus an in-process
+backend for single-node kiosks and benchmarks that should not need Redis.
+
+The interface is the subset of redis-py commands MemoryManager issues, so
+redis.Redis / RedisCluster satisfy it as-is and InProcessStore is a drop-in.
+Select the backend with settings.SESSION_STORE_BACKEND ("redis" or "memory").
+"""
+
+import fnmatch
+import logging
+import math
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(Protocol):
+    """Redis command subset used by MemoryManager."""
+
+    def ping(self) -> bool: ...
+
+    def set(self, name: str, value: Any, ex: Optional[int] = None,
+            keepttl: bool = False, xx: bool = False) -> Optional[bool]: ...
+
+    def get(self, name: str) -> Any: ...
+
+    def hset(self, name: str, key: Optional[str] = None, value: Any = None,
+             mapping: Optional[Dict[str, Any]] = None) -> int: ...
+
+    def hsetnx(self, name: str, key: str, value: Any) -> bool: ...
+
+    def hdel(self, name: str, *keys: str) -> int: ...
+
+    def hgetall(self, name: str) -> Dict[str, Any]: ...
+
+    def expire(self, name: str, time: int) -> bool: ...
+
+    def ttl(self, name: str) -> int: ...
+
+    def exists(self, *names: str) -> int: ...
+
+    def delete(self, *names: str) -> int: ...
+
+    def unlink(self, *names: str) -> int: ...
+
+    def scan_iter(self, match: Optional[str] = None,
+                  count: Optional[int] = None) -> Iterator[str]: ...
+
+    def info(self, section: Optional[str] = None) -> Dict[str, Any]: ...
+
+    def pipeline(self, transaction: bool = True) -> Any: ...
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int: ...
+
+    def xadd(self, name: str, fields: Dict[str, Any], id: str = "*",
+             maxlen: Optional[int] = None, approximate: bool = True,
+             minid: Optional[Any] = None) -> str: ...
+
+    def xtrim(self, name: str, maxlen: Optional[int] = None,
+              approximate: bool = True, minid: Optional[Any] = None) -> int: ...
+
+    def xrange(self, name: str, min: str = "-", max: str = "+",
+               count: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]: ...
+
+
+class HierarchicalTimingWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck) for key expiry.
+
+    Level 0 has one slot per tick; each higher level covers `slots_per_level`
+    times the span of the level below. An entry sits in the lowest level whose
+    ring still reaches its deadline and is cascaded down as the clock reaches
+    its bucket, so schedule, cancel and each tick are O(1) regardless of the
+    number of live keys. Deadlines beyond the top level wait in an overflow set.
+
+    Cancellation is lazy: callers keep the authoritative deadline per key and
+    ignore fired entries whose deadline no longer matches.
+    """
+
+    def __init__(self, slots_per_level: int = 64, levels: int = 4):
+        self.slots = slots_per_level
+        self.levels = levels
+        self._spans = [slots_per_level ** level for level in range(levels)]
+        self._wheels: List[List[Set[Tuple[str, int]]]] = [
+            [set() for _ in range(slots_per_level)] for _ in range(levels)
+        ]
+        self._overflow: Set[Tuple[str, int]] = set()
+        self.current_tick = 0
+
+    def schedule(self, key: str, deadline_tick: int) -> None:
+        """Schedule key to fire at deadline_tick (clamped to the next tick)."""
+        self._place((key, max(deadline_tick, self.current_tick + 1)))
+
+    def advance(self, to_tick: int) -> List[Tuple[str, int]]:
+        """Move the clock forward to to_tick and return every entry that fired."""
+        fired: List[Tuple[str, int]] = []
+        while self.current_tick < to_tick:
+            self.current_tick += 1
+            tick = self.current_tick
+
+            # Overflow entries are re-placed once per top-level revolution
+            if tick % (self._spans[-1] * self.slots) == 0 and self._overflow:
+                overflow, self._overflow = self._overflow, set()
+                for entry in overflow:
+                    self._place(entry)
+
+            # Cascade higher levels first so their entries can land below
+            for level in range(self.levels - 1, 0, -1):
+                span = self._spans[level]
+                if tick % span:
+                    continue
+                slot = (tick // span) % self.slots
+                bucket = self._wheels[level][slot]
+                if bucket:
+                    self._wheels[level][slot] = set()
+                    for entry in bucket:
+                        self._place(entry)
+
+            slot = tick % self.slots
+            bucket = self._wheels[0][slot]
+            if bucket:
+                self._wheels[0][slot] = set()
+                fired.extend(bucket)
+        return fired
+
+    def _place(self, entry: Tuple[str, int]) -> None:
+        deadline = max(entry[1], self.current_tick)
+        for level, span in enumerate(self._spans):
+            bucket = deadline // span
+            if bucket - self.current_tick // span < self.slots:
+                self._wheels[level][bucket % self.slots].add(entry)
+                return
+        self._overflow.add(entry)
+
+
+class _Stream:
+    """Append-only log of (id, fields) entries, ids ordered as (ms, seq)."""
+
+    def __init__(self):
+        self.entries: List[Tuple[Tuple[int, int], Dict[str, Any]]] = []
+        self.last_id: Tuple[int, int] = (0, 0)
+
+    def next_id(self) -> Tuple[int, int]:
+        now_ms = int(time.time() * 1000)
+        if now_ms > self.last_id[0]:
+            return (now_ms, 0)
+        return (self.last_id[0], self.last_id[1] + 1)
+
+    def trim(self, maxlen: Optional[int], minid: Optional[Tuple[int, int]]) -> int:
+        before = len(self.entries)
+        if minid is not None:
+            self.entries = [e for e in self.entries if e[0] >= minid]
+        if maxlen is not None and len(self.entries) > maxlen:
+            self.entries = self.entries[len(self.entries) - maxlen :]
+        return before - len(self.entries)
+
+
+def _parse_stream_id(value: Any, default_seq: int) -> Tuple[int, int]:
+    """Parse "ms-seq" / "ms" / int stream ids."""
+    if isinstance(value, bytes):
+        value = value.decode()
+    text = str(value)
+    if "-" in text:
+        ms, seq = text.split("-", 1)
+        return (int(ms), int(seq))
+    return (int(text), default_seq)
+
+
+def _format_stream_id(stream_id: Tuple[int, int]) -> str:
+    return f"{stream_id[0]}-{stream_id[1]}"
+
+
+def _encode_value(value: Any) -> Any:
+    """Mirror redis-py's value encoding so code behaves the same on both backends."""
+    if isinstance(value, (bytes, str)):
+        return value
+    if isinstance(value, bool) or value is None:
+        raise TypeError(
+            f"Invalid input of type: '{type(value).__name__}'. "
+            "Convert to a bytes, string, int or float first."
+        )
+    if isinstance(value, (int, float)):
+        return repr(value)
+    raise TypeError(f"Invalid input of type: '{type(value).__name__}'.")
+
+
+class InProcessPipeline:
+    """
+    Queues commands and runs them back to back under the store lock,
+    mirroring a redis-py pipeline (results in order; the first error is
+    raised after every command has run).
+    """
+
+    def __init__(self, store: "InProcessStore"):
+        self._store = store
+        self._commands: List[Tuple[Any, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._store, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def __enter__(self) -> "InProcessPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._commands.clear()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        results: List[Any] = []
+        with self._store._lock:
+            for method, args, kwargs in self._commands:
+                try:
+                    results.append(method(*args, **kwargs))
+                except Exception as e:
+                    results.append(e)
+        self._commands.clear()
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+
+class InProcessStore:
+    """
+    In-process key/value store with real TTL semantics.
+
+    Expiry is active (a timing wheel advanced by a daemon ticker thread and on
+    every command) and passive (an expired key is never returned, even between
+    ticks). Values are kept exactly as written - str or bytes - so one
+    instance serves both the text and binary session codecs.
+    Everything lives in this process's RAM; nothing is written to disk.
+    """
+
+    def __init__(self, tick_ms: int = 100, background_expiry: bool = True):
+        self.tick_seconds = tick_ms / 1000.0
+        self._data: Dict[str, Any] = {}
+        self._expires_at: Dict[str, float] = {}  # key -> monotonic deadline
+        self._deadline_ticks: Dict[str, int] = {}  # key -> wheel deadline tick
+        self._wheel = HierarchicalTimingWheel()
+        self._origin = time.monotonic()
+        self._lock = threading.RLock()
+        self._peak_bytes = 0
+        self.expired_keys = 0
+
+        self._stop = threading.Event()
+        self._ticker: Optional[threading.Thread] = None
+        if background_expiry:
+            self._ticker = threading.Thread(
+                target=self._run_ticker, name="inprocess-store-expiry", daemon=True
+            )
+            self._ticker.start()
+
+    # === CONNECTION ===
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        """Stop the expiry ticker."""
+        self._stop.set()
+
+    # === STRINGS ===
+
+    def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False,
+        keepttl: bool = False,
+    ) -> Optional[bool]:
+        with self._lock:
+            self._tick()
+            exists = self._alive(name)
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[name] = _encode_value(value)
+            if ex is not None:
+                self._set_expiry(name, float(ex))
+            elif px is not None:
+                self._set_expiry(name, px / 1000.0)
+            elif not keepttl:
+                self._clear_expiry(name)
+            return True
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return None
+            value = self._data[name]
+            if not isinstance(value, (str, bytes)):
+                raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            return value
+
+    # === HASHES ===
+
+    def hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        items: Dict[str, Any] = {}
+        if key is not None:
+            items[key] = value
+        if mapping:
+            items.update(mapping)
+        if not items:
+            raise ValueError("'hset' with no key value pairs")
+        # Encode up front so a bad value leaves the key untouched, as in redis-py
+        items = {k: _encode_value(v) for k, v in items.items()}
+
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                self._data[name] = {}
+            current = self._data[name]
+            if not isinstance(current, dict):
+                raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            added = 0
+            for field_name, field_value in items.items():
+                if field_name not in current:
+                    added += 1
+                current[field_name] = field_value
+            return added
+
+    def hsetnx(self, name: str, key: str, value: Any) -> bool:
+        value = _encode_value(value)
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                self._data[name] = {}
+            current = self._data[name]
+            if not isinstance(current, dict):
+                raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            if key in current:
+                return False
+            current[key] = value
+            return True
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                self._data[name] = {}
+            current = self._data[name]
+            if not isinstance(current, dict):
+                raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            value = int(current.get(key, 0)) + amount
+            current[key] = str(value)
+            return value
+
+    def hget(self, name: str, key: str) -> Any:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return None
+            return self._data[name].get(key)
+
+    def hgetall(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return {}
+            return dict(self._data[name])
+
+    def hdel(self, name: str, *keys: str) -> int:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return 0
+            current = self._data[name]
+            removed = sum(1 for key in keys if current.pop(key, None) is not None)
+            if not current:
+                self._remove(name)  # Redis drops a hash with no fields
+            return removed
+
+    # === STREAMS ===
+
+    def xadd(
+        self,
+        name: str,
+        fields: Dict[str, Any],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+        minid: Optional[Any] = None,
+    ) -> str:
+        encoded = {k: _encode_value(v) for k, v in fields.items()}
+        with self._lock:
+            self._tick()
+            stream = self._stream(name, create=True)
+            entry_id = stream.next_id() if id == "*" else _parse_stream_id(id, 0)
+            if entry_id <= stream.last_id:
+                raise ValueError(
+                    "The ID specified in XADD is equal or smaller than the target stream top item"
+                )
+            stream.entries.append((entry_id, encoded))
+            stream.last_id = entry_id
+            stream.trim(maxlen, _parse_stream_id(minid, 0) if minid is not None else None)
+            return _format_stream_id(entry_id)
+
+    def xtrim(
+        self,
+        name: str,
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+        minid: Optional[Any] = None,
+    ) -> int:
+        with self._lock:
+            self._tick()
+            stream = self._stream(name)
+            if stream is None:
+                return 0
+            return stream.trim(maxlen, _parse_stream_id(minid, 0) if minid is not None else None)
+
+    def xrange(
+        self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            self._tick()
+            stream = self._stream(name)
+            if stream is None:
+                return []
+            low = (0, 0) if min == "-" else _parse_stream_id(min, 0)
+            high = (sys.maxsize, sys.maxsize) if max == "+" else _parse_stream_id(max, sys.maxsize)
+            result = [
+                (_format_stream_id(entry_id), dict(fields))
+                for entry_id, fields in stream.entries
+                if low <= entry_id <= high
+            ]
+            return result[:count] if count is not None else result
+
+    def xlen(self, name: str) -> int:
+        with self._lock:
+            self._tick()
+            stream = self._stream(name)
+            return len(stream.entries) if stream is not None else 0
+
+    def _stream(self, name: str, create: bool = False) -> Optional[_Stream]:
+        if not self._alive(name):
+            if not create:
+                return None
+            self._data[name] = _Stream()
+        stream = self._data[name]
+        if not isinstance(stream, _Stream):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return stream
+
+    # === KEYS ===
+
+    def expire(self, name: str, time: int) -> bool:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return False
+            self._set_expiry(name, float(time))
+            return True
+
+    def ttl(self, name: str) -> int:
+        with self._lock:
+            self._tick()
+            if not self._alive(name):
+                return -2
+            deadline = self._expires_at.get(name)
+            if deadline is None:
+                return -1
+            return max(0, math.ceil(deadline - time.monotonic()))
+
+    def exists(self, *names: str) -> int:
+        with self._lock:
+            self._tick()
+            return sum(1 for name in names if self._alive(name))
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            self._tick()
+            deleted = 0
+            for name in names:
+                if self._alive(name):
+                    self._remove(name)
+                    deleted += 1
+            return deleted
+
+    def unlink(self, *names: str) -> int:
+        # No background reclaim thread in-process: UNLINK behaves as DELETE
+        return self.delete(*names)
+
+    def keys(self, pattern: str = "*") -> List[str]:
+        return list(self.scan_iter(match=pattern))
+
+    def scan_iter(
+        self, match: Optional[str] = None, count: Optional[int] = None
+    ) -> Iterator[str]:
+        with self._lock:
+            self._tick()
+            names = [n for n in self._data if self._alive(n)]
+        for name in names:
+            if match is None or fnmatch.fnmatchcase(name, match):
+                yield name
+
+    def flushall(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expires_at.clear()
+            self._deadline_ticks.clear()
+            return True
+
+    def pipeline(self, transaction: bool = True) -> InProcessPipeline:
+        return InProcessPipeline(self)
+
+    # === MONITORING ===
+
+    def info(self, section: Optional[str] = None) -> Dict[str, Any]:
+        """Approximate INFO memory/keyspace fields for get_redis_stats."""
+        with self._lock:
+            self._tick()
+            used = sum(
+                sys.getsizeof(k) + self._sizeof(v) for k, v in self._data.items()
+            )
+            self._peak_bytes = max(self._peak_bytes, used)
+            return {
+                "used_memory": used,
+                "used_memory_peak": self._peak_bytes,
+                "keys": len(self._data),
+                "expires": len(self._expires_at),
+                "expired_keys": self.expired_keys,
+            }
+
+    # === INTERNALS ===
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, _Stream):
+            return sys.getsizeof(value.entries) + sum(
+                InProcessStore._sizeof(fields) for _, fields in value.entries
+            )
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(
+                sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items()
+            )
+        return sys.getsizeof(value)
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._origin) / self.tick_seconds)
+
+    def _tick(self) -> None:
+        """Advance the wheel to now and evict every key whose deadline fired."""
+        for name, deadline_tick in self._wheel.advance(self._now_tick()):
+            if self._deadline_ticks.get(name) == deadline_tick:
+                self._remove(name)
+                self.expired_keys += 1
+
+    def _alive(self, name: str) -> bool:
+        """True if the key exists and has not passed its deadline (passive expiry)."""
+        if name not in self._data:
+            return False
+        deadline = self._expires_at.get(name)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._remove(name)
+            self.expired_keys += 1
+            return False
+        return True
+
+    def _set_expiry(self, name: str, seconds: float) -> None:
+        if seconds <= 0:
+            self._remove(name)
+            return
+        deadline = time.monotonic() + seconds
+        # Round up so the wheel never fires before the exact deadline
+        deadline_tick = math.ceil((deadline - self._origin) / self.tick_seconds)
+        self._expires_at[name] = deadline
+        self._deadline_ticks[name] = deadline_tick
+        self._wheel.schedule(name, deadline_tick)
+
+    def _clear_expiry(self, name: str) -> None:
+        self._expires_at.pop(name, None)
+        self._deadline_ticks.pop(name, None)
+
+    def _remove(self, name: str) -> None:
+        self._data.pop(name, None)
+        self._clear_expiry(name)
+
+    def _run_ticker(self) -> None:
+        while not self._stop.wait(self.tick_seconds):
+            with self._lock:
+                self._tick()
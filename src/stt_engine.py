@@ -0,0 +1,436 @@
+"""
+Speech-to-Text Engine for MCD 311 Sovereign Voice AI
+Local, CPU-only streaming recognition with faster-whisper (CTranslate2,
+int8-quantized Whisper). Nothing leaves the machine.
+
+- SpeechToTextEngine holds the model, loaded once per process and shared
+  by every call (CTranslate2 runs concurrent requests on its own threads).
+- StreamingRecognizer is one call's recognition state. It takes PCM as it
+  arrives and re-decodes the current utterance every STT_PARTIAL_INTERVAL_MS
+  of new audio. Words that two consecutive passes agree on are committed
+  (local agreement), so partial hypotheses only ever grow at the front and
+  the audio buffer can be trimmed behind the last committed word.
+- SpeechPipeline is a call's VoiceActivityDetector (src/vad.py) in front
+  of its recognizer: only speech reaches the model, and the VAD's end of
+  turn finalizes the utterance.
+- SpeechInput bridges a pipeline to the event loop: decoding runs in a
+  thread, or in the call's STT worker process when the server runs the
+  pool (src/stt_pool.py); hypotheses are queued, and the workflow awaits
+  the final one.
+
+Audio is 16 kHz mono float32 in [-1, 1] throughout. Frame payloads are
+written into the call's AudioRingBuffer (src/audio_ring.py), and the VAD
+reads whole 20 ms frames straight from it.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from config.settings import settings
+from src.audio_frames import Codec
+from src.audio_ring import SAMPLE_RATE, AudioRingBuffer, to_float32
+from src.opus_codec import DECODE_RATE, OpusStreamDecoder
+from src.vad import FRAME_SIZE, VoiceActivityDetector
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # Optional dependency, only needed for speech input
+    WhisperModel = None
+
+logger = logging.getLogger(__name__)
+
+COMMIT_TOLERANCE_SECONDS = 0.05  # Re-decoded words ending before the last commit are dropped
+
+
+@dataclass
+class Word:
+    """One recognized word, timed in seconds from the start of the stream."""
+
+    text: str
+    start: float
+    end: float
+    probability: float
+
+
+@dataclass
+class Hypothesis:
+    """A partial or final transcript of the current utterance."""
+
+    text: str
+    is_final: bool
+    start: float = 0.0
+    end: float = 0.0
+    confidence: float = 0.0  # Mean word probability
+    words: List[Word] = field(default_factory=list)
+
+    @classmethod
+    def from_words(cls, words: List[Word], is_final: bool) -> "Hypothesis":
+        if not words:
+            return cls("", is_final)
+        return cls(
+            text="".join(word.text for word in words).strip(),
+            is_final=is_final,
+            start=words[0].start,
+            end=words[-1].end,
+            confidence=round(sum(word.probability for word in words) / len(words), 3),
+            words=list(words),
+        )
+
+
+def _normalize(word: str) -> str:
+    return word.strip().strip(".,!?।").lower()
+
+
+class SpeechToTextEngine:
+    """The shared Whisper model."""
+
+    def __init__(
+        self,
+        model_name: str = None,
+        compute_type: str = None,
+        cpu_threads: int = None,
+        language: str = None,
+    ):
+        self.model_name = model_name or settings.STT_MODEL
+        self.compute_type = compute_type or settings.STT_COMPUTE_TYPE
+        self.cpu_threads = settings.STT_CPU_THREADS if cpu_threads is None else cpu_threads
+        self.language = (settings.STT_LANGUAGE if language is None else language) or None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return settings.STT_ENABLED and WhisperModel is not None
+
+    @property
+    def model(self):
+        """The model, loaded on first use (a few seconds, once per process)."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if WhisperModel is None:
+                        raise RuntimeError(
+                            "Speech input requires the 'faster-whisper' package: "
+                            "pip install faster-whisper"
+                        )
+                    start = time.perf_counter()
+                    self._model = WhisperModel(
+                        self.model_name,
+                        device="cpu",
+                        compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads,
+                        num_workers=settings.STT_MODEL_WORKERS,
+                    )
+                    logger.info(
+                        f"✓ STT model '{self.model_name}' ({self.compute_type}) loaded "
+                        f"in {time.perf_counter() - start:.1f}s"
+                    )
+        return self._model
+
+    def transcribe(self, samples: np.ndarray, prompt: str = None) -> List[Word]:
+        """Words of 16 kHz float32 audio, timed from its first sample."""
+        if samples.size == 0:
+            return []
+        segments, _ = self.model.transcribe(
+            samples,
+            language=self.language,
+            beam_size=settings.STT_BEAM_SIZE,
+            word_timestamps=True,
+            initial_prompt=prompt or None,
+            condition_on_previous_text=False,
+            vad_filter=False,
+        )
+        return [
+            Word(word.word, word.start, word.end, word.probability)
+            for segment in segments
+            for word in (segment.words or [])
+        ]
+
+    def transcribe_text(self, samples: np.ndarray) -> Hypothesis:
+        """One-shot transcription of a complete utterance."""
+        return Hypothesis.from_words(self.transcribe(samples), is_final=True)
+
+
+class StreamingRecognizer:
+    """
+    One call's streaming recognition state. Not thread-safe: feed it from
+    one thread at a time (SpeechInput does).
+    """
+
+    def __init__(self, engine: "SpeechToTextEngine" = None):
+        self.engine = engine or stt_engine
+        self.partial_interval = settings.STT_PARTIAL_INTERVAL_MS / 1000
+        self.max_buffer_seconds = settings.STT_MAX_BUFFER_SECONDS
+        # Utterance audio is appended in place; _buffer is a view of the filled part
+        self._storage = np.empty(int(self.max_buffer_seconds * SAMPLE_RATE), dtype=np.float32)
+        self._size = 0
+        self._buffer_start = 0.0  # Stream time of the buffer's first sample
+        self._undecoded = 0.0  # Seconds received since the last pass
+        self._committed: List[Word] = []  # Agreed words of the current utterance
+        self._tentative: List[Word] = []  # Latest pass's words after the committed ones
+        # Real-time factor bookkeeping
+        self.audio_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    @property
+    def heard_speech(self) -> bool:
+        return bool(self._committed or self._tentative)
+
+    @property
+    def rtf(self) -> float:
+        return self.compute_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    @property
+    def _buffer(self) -> np.ndarray:
+        return self._storage[: self._size]
+
+    def _append(self, samples: np.ndarray) -> None:
+        end = self._size + samples.size
+        if end > self._storage.size:
+            # Longer than STT_MAX_BUFFER_SECONDS with nothing committed to cut at:
+            # grow geometrically, so this stays rare
+            grown = np.empty(max(end, 2 * self._storage.size), dtype=np.float32)
+            grown[: self._size] = self._buffer
+            self._storage.fill(0.0)
+            self._storage = grown
+        self._storage[self._size : end] = samples
+        self._size = end
+
+    def accept(self, samples: np.ndarray) -> Optional[Hypothesis]:
+        """Add audio. Returns a partial hypothesis when a decoding pass ran."""
+        self._append(samples)
+        seconds = samples.size / SAMPLE_RATE
+        self._undecoded += seconds
+        self.audio_seconds += seconds
+        if self._undecoded < self.partial_interval:
+            return None
+        self._undecoded = 0.0
+
+        words = self._decode()
+        # Local agreement: the common prefix of two consecutive passes is stable
+        agreed = 0
+        for previous, current in zip(self._tentative, words):
+            if _normalize(previous.text) != _normalize(current.text):
+                break
+            agreed += 1
+        self._committed.extend(words[:agreed])
+        self._tentative = words[agreed:]
+        self._trim()
+        return Hypothesis.from_words(self._committed + self._tentative, is_final=False)
+
+    def finish(self) -> Hypothesis:
+        """End the utterance: decode what is left, commit it all, reset for the next one."""
+        if self._size:
+            self._committed.extend(self._decode())
+        hypothesis = Hypothesis.from_words(self._committed, is_final=True)
+        self._buffer_start += self._size / SAMPLE_RATE
+        self._size = 0
+        self._undecoded = 0.0
+        self._committed = []
+        self._tentative = []
+        return hypothesis
+
+    def wipe(self) -> None:
+        """Drop all audio and text (end of call)."""
+        self._storage.fill(0.0)
+        self._size = 0
+        self._committed = []
+        self._tentative = []
+
+    def _decode(self) -> List[Word]:
+        """Decode the buffer; returns the words after the last committed one."""
+        prompt = "".join(word.text for word in self._committed[-30:])
+        start = time.perf_counter()
+        words = self.engine.transcribe(self._buffer, prompt)
+        self.compute_seconds += time.perf_counter() - start
+        last_end = self._committed[-1].end if self._committed else 0.0
+        shifted = []
+        for word in words:
+            word.start += self._buffer_start
+            word.end += self._buffer_start
+            if word.end > last_end + COMMIT_TOLERANCE_SECONDS:
+                shifted.append(word)
+        return shifted
+
+    def _trim(self) -> None:
+        """Keep the buffer short: cut it at the last committed word once it grows too long."""
+        if self._size / SAMPLE_RATE <= self.max_buffer_seconds or not self._committed:
+            return
+        cut = min(int((self._committed[-1].end - self._buffer_start) * SAMPLE_RATE), self._size)
+        if cut <= 0:
+            return
+        # Shift the rest to the front in place (numpy handles the overlap)
+        self._storage[: self._size - cut] = self._storage[cut : self._size]
+        self._size -= cut
+        self._buffer_start += cut / SAMPLE_RATE
+
+
+class SpeechPipeline:
+    """
+    One call's VAD + streaming recognizer, synchronous. Runs in a thread of
+    this process, or in an STT worker process (src/stt_pool.py).
+    """
+
+    def __init__(self, recognizer: StreamingRecognizer = None):
+        self.recognizer = recognizer or StreamingRecognizer()
+        self.vad = VoiceActivityDetector()
+
+    def process(self, samples: np.ndarray) -> List[Hypothesis]:
+        """16 kHz float32 audio in (whole 20 ms frames avoid a copy); hypotheses with text out."""
+        hypotheses = []
+        vad = self.vad.process(samples)  # Vectorized, well under a millisecond per chunk
+        if vad.audio.size:
+            hypothesis = self.recognizer.accept(vad.audio)
+            if hypothesis is not None and hypothesis.text:
+                hypotheses.append(hypothesis)
+        if vad.end_of_turn:
+            final = self.recognizer.finish()
+            if final.text:
+                hypotheses.append(final)
+        return hypotheses
+
+    def wipe(self) -> None:
+        self.recognizer.wipe()
+
+
+class SpeechInput:
+    """
+    One call's speech input on the event loop: feed audio, await hypotheses.
+    Decoding runs in a thread (pool=None) or in the call's STT worker process.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        recognizer: StreamingRecognizer = None,
+        listener: Callable[[Hypothesis], Awaitable[None]] = None,
+        pool=None,
+    ):
+        self.session_id = session_id
+        self.pool = pool
+        self.listener = listener  # Also told about every hypothesis (e.g. live captions)
+        self.hypotheses: "asyncio.Queue[Hypothesis]" = asyncio.Queue()
+        self._lock = asyncio.Lock()  # One decoding pass at a time per call
+        self._opus = None  # Inbound Opus decoder (thread mode; workers keep their own)
+        if pool is None:
+            self.pipeline = SpeechPipeline(recognizer)
+            self.ring = AudioRingBuffer()
+        else:
+            self.pipeline = None
+            self.ring = pool.open(session_id, self._on_pool_result)
+
+    async def feed(self, payload, codec: Codec = Codec.PCM_F32, sample_rate: int = SAMPLE_RATE) -> None:
+        """
+        Add one frame's audio (a payload view, or a float32 array); queues
+        partial and final hypotheses. Opus is decoded where the call's audio
+        is processed: the decoding thread or the STT worker process.
+
+        Raises:
+            ValueError: For codecs that cannot carry speech input (WAV, MP3)
+                or a corrupt Opus payload
+        """
+        async with self._lock:
+            if self.pool is not None:
+                if codec == Codec.OPUS:
+                    self.pool.feed_encoded(self.session_id, bytes(payload))
+                else:
+                    self.ring.write(payload, codec, sample_rate)
+                    self.pool.notify(self.session_id)
+                return
+            hypotheses = await asyncio.to_thread(self._process, payload, codec, sample_rate)
+            for hypothesis in hypotheses:
+                await self._publish(hypothesis)
+
+    def _process(self, payload, codec: Codec, sample_rate: int) -> List[Hypothesis]:
+        """Decoding thread: frame -> ring -> whole 20 ms frames through the pipeline."""
+        if codec == Codec.OPUS:
+            if self._opus is None:
+                self._opus = OpusStreamDecoder()
+            payload, codec, sample_rate = self._opus.decode(payload), Codec.PCM16, DECODE_RATE
+        self.ring.write(payload, codec, sample_rate)
+        pending = self.ring.peek()
+        whole = pending.size - pending.size % FRAME_SIZE
+        if not whole:
+            return []
+        hypotheses = self.pipeline.process(pending[:whole])
+        self.ring.advance(whole)
+        return hypotheses
+
+    def _on_pool_result(self, read_to: int, hypotheses: List[Hypothesis]) -> None:
+        """The worker has consumed audio up to read_to (called on the event loop)."""
+        self.ring.advance_to(read_to)
+        if hypotheses:
+            asyncio.get_running_loop().create_task(self._publish_all(hypotheses))
+
+    async def _publish_all(self, hypotheses: List[Hypothesis]) -> None:
+        for hypothesis in hypotheses:
+            await self._publish(hypothesis)
+
+    async def _publish(self, hypothesis: Hypothesis) -> None:
+        self.hypotheses.put_nowait(hypothesis)
+        if self.listener is not None:
+            await self.listener(hypothesis)
+
+    async def next_final(self, timeout: float) -> Optional[Hypothesis]:
+        """The next final hypothesis, or None if none arrives within timeout."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return None
+            try:
+                hypothesis = await asyncio.wait_for(self.hypotheses.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if hypothesis.is_final:
+                return hypothesis
+
+    def wipe(self) -> None:
+        """Drop the call's audio and text, and wake anyone awaiting a final hypothesis."""
+        if self.pool is not None:
+            self.pool.close(self.session_id)  # Zeroes and frees the shared ring
+        else:
+            self.ring.wipe()
+            self.pipeline.wipe()
+        while not self.hypotheses.empty():
+            self.hypotheses.get_nowait()
+        self.hypotheses.put_nowait(Hypothesis("", is_final=True))
+
+
+class SpeechInputs:
+    """Registry of the calls currently receiving speech."""
+
+    def __init__(self):
+        self._inputs: Dict[str, SpeechInput] = {}
+        self.pool = None  # STT worker process pool, set at server start-up (src/stt_pool.py)
+
+    def attach(
+        self, session_id: str, listener: Callable[[Hypothesis], Awaitable[None]] = None
+    ) -> Optional[SpeechInput]:
+        """Start speech input for a call (None if STT is unavailable)."""
+        if not stt_engine.available():
+            return None
+        speech_input = self._inputs[session_id] = SpeechInput(
+            session_id, listener=listener, pool=self.pool
+        )
+        return speech_input
+
+    def get(self, session_id: str) -> Optional[SpeechInput]:
+        return self._inputs.get(session_id)
+
+    def detach(self, session_id: str) -> None:
+        """End speech input for a call and wipe its audio and text."""
+        speech_input = self._inputs.pop(session_id, None)
+        if speech_input is not None:
+            speech_input.wipe()
+
+
+# Global STT engine and per-call speech inputs
+stt_engine = SpeechToTextEngine()
+speech_inputs = SpeechInputs()
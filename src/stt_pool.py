@@ -0,0 +1,480 @@
+"""
+STT Worker Process Pool for MCD 311 Sovereign Voice AI
+Runs VAD + Whisper decoding in separate processes, so speech input can use
+every core instead of the one core the uvicorn worker's GIL allows.
+
+- Session affinity: a call is assigned to one worker when its speech input
+  opens and stays there, so the streaming recognizer's state (audio buffer,
+  committed words) never moves between processes.
+- Audio travels through a shared-memory AudioRingBuffer per call: the event
+  loop writes frames into it and sends the worker positions only; the
+  worker reads whole 20 ms frames in place and replies with the position it
+  consumed plus any hypotheses. Messages queued while a worker is busy are
+  coalesced into one decoding pass per call. The shared ring always drops
+  the newest audio when full: dropping the oldest would overwrite samples
+  the worker may be decoding in place. Opus frames are ~20x smaller
+  than PCM and go through the queue as they are; the worker decodes them.
+- Autoscaling: STT_POOL_MIN_WORKERS start with the server. A new call goes
+  to the least-loaded worker; another worker is started (up to
+  STT_POOL_MAX_WORKERS) when that one already has
+  STT_POOL_SESSIONS_PER_WORKER calls or more than
+  STT_POOL_SCALE_UP_BACKLOG_SECONDS of undecoded audio. Calls never move,
+  so scaling only affects new calls. Workers above the minimum with no call
+  for STT_POOL_IDLE_SECONDS are stopped.
+- A call whose worker died is reopened on another one (its current
+  utterance is lost, later audio is decoded normally).
+
+Every worker loads its own copy of the model with STT_CPU_THREADS threads,
+so STT_POOL_MAX_WORKERS x STT_CPU_THREADS should not exceed the cores.
+
+The pool's state belongs to the event loop: call it from the loop only.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from src.audio_ring import SAMPLE_RATE, AudioRingBuffer
+from src.vad import FRAME_SIZE, vad_stats
+
+logger = logging.getLogger(__name__)
+
+# Fresh interpreters: no copy of the server's event loop, threads or sockets
+_context = multiprocessing.get_context("spawn")
+
+ResultCallback = Callable[[int, list], None]
+
+
+@dataclass(eq=False)
+class _WorkerCall:
+    """A call's state inside its worker process."""
+
+    shm: shared_memory.SharedMemory
+    ring: AudioRingBuffer
+    pipeline: Any  # SpeechPipeline
+    position: int = 0  # Ring audio consumed
+    opus: Any = None  # OpusStreamDecoder, created on the first Opus frame
+
+
+def _worker_main(worker_id: int, requests, results) -> None:
+    """
+    Worker process: one SpeechPipeline per assigned call.
+
+    Requests:  ("open", session_id, shm_name, capacity_seconds)
+               ("audio", session_id, read_position, write_position)
+               ("opus", session_id, payload)
+               ("close", session_id)
+               ("stop",)
+    Results:   ("ready", worker_id, pid)
+               ("batch", worker_id, handled, audio_s, compute_s, vad_counts,
+                [(session_id, read_to, hypotheses), ...], [closed session_id, ...])
+
+    A message that fails is logged and skipped, so one call cannot stop the
+    worker. "close" is acknowledged in the batch's closed list: only then
+    does the server unlink the call's block.
+    """
+    from src.opus_codec import OpusStreamDecoder
+    from src.stt_engine import SpeechPipeline, stt_engine
+
+    stt_engine.model  # Load before the first call arrives
+    results.put(("ready", worker_id, os.getpid()))
+
+    calls: Dict[str, _WorkerCall] = {}
+    handled = 0
+    totals = {"audio": 0.0, "compute": 0.0}
+
+    def run(call: _WorkerCall, samples) -> list:
+        began = time.perf_counter()
+        hypotheses = call.pipeline.process(samples)
+        totals["compute"] += time.perf_counter() - began
+        totals["audio"] += samples.size / SAMPLE_RATE
+        return hypotheses
+
+    def drain_ring(call: _WorkerCall, start: int, end: int) -> list:
+        call.position = max(call.position, start)
+        available = min(end - call.position, call.ring.capacity)
+        whole = available - available % FRAME_SIZE
+        if whole <= 0:
+            return []
+        hypotheses = run(call, call.ring.window(call.position, whole))
+        call.position += whole
+        return hypotheses
+
+    running = True
+    while running:
+        batch = [requests.get()]
+        while True:
+            try:
+                batch.append(requests.get_nowait())
+            except queue.Empty:
+                break
+        handled += len(batch)
+
+        vad_before = vad_stats.snapshot()
+        updates = []
+        closed: List[str] = []
+        pending: Dict[str, tuple] = {}  # session_id -> (read_position, write_position)
+        for message in batch:
+            kind = message[0]
+            try:
+                if kind == "audio":
+                    _, session_id, start, end = message
+                    previous = pending.get(session_id, (0, 0))
+                    pending[session_id] = (max(previous[0], start), max(previous[1], end))
+                elif kind == "opus":
+                    _, session_id, payload = message
+                    call = calls.get(session_id)
+                    if call is None:
+                        continue
+                    # Ring audio that arrived before this frame goes first
+                    hypotheses = drain_ring(call, *pending.pop(session_id)) if session_id in pending else []
+                    try:
+                        if call.opus is None:
+                            call.opus = OpusStreamDecoder()
+                        pcm = np.frombuffer(call.opus.decode(payload), dtype="<i2")
+                    except (ValueError, RuntimeError) as e:
+                        logger.warning(f"Dropped Opus frame from {session_id}: {e}")
+                    else:
+                        hypotheses += run(call, pcm.astype(np.float32) / 32768.0)
+                    updates.append((session_id, call.position, hypotheses))
+                elif kind == "open":
+                    _, session_id, name, capacity_seconds = message
+                    # The server process owns the block (and its resource tracker,
+                    # shared with this process) and unlinks it
+                    try:
+                        shm = shared_memory.SharedMemory(name=name)
+                    except FileNotFoundError:
+                        logger.warning(f"Call {session_id} ended before its worker opened it")
+                        continue
+                    ring = AudioRingBuffer(capacity_seconds, buffer=shm.buf)
+                    calls[session_id] = _WorkerCall(shm, ring, SpeechPipeline())
+                elif kind == "close":
+                    pending.pop(message[1], None)
+                    call = calls.pop(message[1], None)
+                    if call is not None:
+                        call.pipeline.wipe()
+                        call.ring.release()  # Drops the view of the block, so it can be closed
+                        call.shm.close()
+                    closed.append(message[1])
+                elif kind == "stop":
+                    running = False
+            except Exception as e:
+                # One bad message must not take the other calls down with the worker
+                logger.error(f"STT worker {worker_id}: '{kind}' message failed: {e}")
+
+        for session_id, (start, end) in pending.items():
+            call = calls.get(session_id)
+            if call is None:
+                continue
+            try:
+                hypotheses = drain_ring(call, start, end)
+            except Exception as e:
+                logger.error(f"STT worker {worker_id}: decoding {session_id} failed: {e}")
+                continue
+            updates.append((session_id, call.position, hypotheses))
+        vad_counts = tuple(after - before for after, before in zip(vad_stats.snapshot(), vad_before))
+        results.put(
+            ("batch", worker_id, handled, totals["audio"], totals["compute"], vad_counts, updates, closed)
+        )
+
+    for call in calls.values():
+        call.pipeline.wipe()
+        call.ring.release()
+        call.shm.close()
+
+
+@dataclass(eq=False)
+class _Worker:
+    """Server-side view of one worker process."""
+
+    worker_id: int
+    process: Any
+    requests: Any
+    sessions: Set[str] = field(default_factory=set)
+    pid: int = 0
+    ready: bool = False
+    sent: int = 0  # Messages sent
+    handled: int = 0  # Messages the worker has taken off its queue
+    audio_seconds: float = 0.0  # Caller audio consumed
+    compute_seconds: float = 0.0  # Time spent in VAD + decoding
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+@dataclass(eq=False)
+class _Session:
+    worker: _Worker
+    shm: shared_memory.SharedMemory
+    ring: AudioRingBuffer
+    on_result: ResultCallback
+
+
+class SttProcessPool:
+    """Session-affine pool of STT worker processes."""
+
+    def __init__(self, min_workers: int = None, max_workers: int = None):
+        self.min_workers = settings.STT_POOL_MIN_WORKERS if min_workers is None else min_workers
+        cores_per_worker = max(1, settings.STT_CPU_THREADS)
+        self.max_workers = max(
+            max_workers or settings.STT_POOL_MAX_WORKERS or (os.cpu_count() or 1) // cores_per_worker,
+            self.min_workers,
+            1,
+        )
+        self.sessions_per_worker = settings.STT_POOL_SESSIONS_PER_WORKER
+        self.scale_up_backlog = settings.STT_POOL_SCALE_UP_BACKLOG_SECONDS
+        self.idle_seconds = settings.STT_POOL_IDLE_SECONDS
+
+        self._workers: Dict[int, _Worker] = {}
+        self._sessions: Dict[str, _Session] = {}
+        # Blocks of ended calls, unlinked once their worker acknowledges "close"
+        self._closing: Dict[str, Tuple[_Worker, shared_memory.SharedMemory]] = {}
+        self._worker_ids = itertools.count()
+        self._results = None
+        self._collector: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counters: Dict[str, int] = {"scale_ups": 0, "scale_downs": 0, "reassigned": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Start the minimum workers (call from the event loop, at server start-up)."""
+        if self.started:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._results = _context.Queue()
+        self._collector = threading.Thread(target=self._collect, name="stt-pool-results", daemon=True)
+        self._collector.start()
+        for _ in range(self.min_workers):
+            self._spawn()
+        logger.info(f"✓ STT pool: {self.min_workers}-{self.max_workers} worker processes")
+
+    def shutdown(self) -> None:
+        """Wipe every call's audio and stop all workers."""
+        if not self.started:
+            return
+        for session_id in list(self._sessions):
+            self.close(session_id)
+        for worker in self._workers.values():
+            self._send(worker, ("stop",))
+        for worker in self._workers.values():
+            worker.process.join(timeout=5)
+        self._workers.clear()
+        for session_id in list(self._closing):
+            self._unlink(session_id)
+        self._results.put(None)
+        self._collector.join(timeout=5)
+        self._loop = None
+
+    def _spawn(self) -> _Worker:
+        worker_id = next(self._worker_ids)
+        requests = _context.Queue()
+        process = _context.Process(
+            target=_worker_main,
+            args=(worker_id, requests, self._results),
+            name=f"stt-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        worker = self._workers[worker_id] = _Worker(worker_id, process, requests, pid=process.pid)
+        logger.info(f"STT worker {worker_id} started (pid {process.pid})")
+        return worker
+
+    def _send(self, worker: _Worker, message: tuple) -> None:
+        worker.sent += 1
+        worker.requests.put(message)
+
+    def _backlog_seconds(self, worker: _Worker) -> float:
+        """Caller audio written for the worker's calls but not yet consumed."""
+        return sum(len(self._sessions[s].ring) for s in worker.sessions) / SAMPLE_RATE
+
+    def _pick_worker(self) -> _Worker:
+        """Least-loaded live worker, or a new one if it is saturated."""
+        self._reap()
+        live = [w for w in self._workers.values() if w.process.is_alive()]
+        best = min(live, key=lambda w: (len(w.sessions), self._backlog_seconds(w)), default=None)
+        saturated = best is None or (
+            len(best.sessions) >= self.sessions_per_worker
+            or self._backlog_seconds(best) > self.scale_up_backlog
+        )
+        if saturated and len(live) < self.max_workers:
+            if best is not None:
+                self._counters["scale_ups"] += 1
+                logger.info(
+                    f"STT pool scaling up: worker {best.worker_id} has {len(best.sessions)} calls, "
+                    f"{self._backlog_seconds(best):.1f}s backlog"
+                )
+            best = self._spawn()
+        return best
+
+    def _reap(self) -> None:
+        """Forget dead workers without calls; stop idle workers above the minimum."""
+        now = time.monotonic()
+        for worker in list(self._workers.values()):
+            if worker.sessions:
+                continue
+            if not worker.process.is_alive():
+                del self._workers[worker.worker_id]
+                # A dead worker acknowledges nothing
+                for session_id, (owner, _) in list(self._closing.items()):
+                    if owner is worker:
+                        self._unlink(session_id)
+            elif len(self._workers) > self.min_workers and now - worker.idle_since > self.idle_seconds:
+                self._send(worker, ("stop",))
+                del self._workers[worker.worker_id]
+                self._counters["scale_downs"] += 1
+                logger.info(f"STT worker {worker.worker_id} stopped (idle)")
+        _context.active_children()  # Reaps exited workers
+
+    def open(self, session_id: str, on_result: ResultCallback) -> AudioRingBuffer:
+        """
+        Assign a call to a worker. Returns the call's shared ring buffer
+        (always drop_newest, see above); on_result(read_to, hypotheses) is
+        called on the event loop as the worker consumes audio.
+        """
+        worker = self._pick_worker()
+        capacity = settings.AUDIO_RING_SECONDS
+        shm = shared_memory.SharedMemory(create=True, size=AudioRingBuffer.storage_bytes(capacity))
+        ring = AudioRingBuffer(capacity, overflow="drop_newest", buffer=shm.buf)
+        self._sessions[session_id] = _Session(worker, shm, ring, on_result)
+        worker.sessions.add(session_id)
+        self._send(worker, ("open", session_id, shm.name, capacity))
+        return ring
+
+    def notify(self, session_id: str) -> None:
+        """New audio is in the call's ring."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        if not session.worker.process.is_alive():
+            self._reassign(session_id, session)
+        ring = session.ring
+        self._send(session.worker, ("audio", session_id, ring.read_position, ring.write_position))
+
+    def feed_encoded(self, session_id: str, payload: bytes) -> None:
+        """An Opus frame: small enough to send as is; the worker decodes it."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        if not session.worker.process.is_alive():
+            self._reassign(session_id, session)
+        self._send(session.worker, ("opus", session_id, payload))
+
+    def _reassign(self, session_id: str, session: _Session) -> None:
+        dead = session.worker
+        logger.error(f"STT worker {dead.worker_id} exited; moving call {session_id}")
+        dead.sessions.discard(session_id)
+        session.worker = self._pick_worker()
+        session.worker.sessions.add(session_id)
+        self._counters["reassigned"] += 1
+        self._send(session.worker, ("open", session_id, session.shm.name, settings.AUDIO_RING_SECONDS))
+
+    def close(self, session_id: str) -> None:
+        """
+        End a call: zero its audio, free the ring and drop the worker's state.
+        The block is unlinked when the worker acknowledges (it may not have
+        opened it yet).
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        worker = session.worker
+        worker.sessions.discard(session_id)
+        if not worker.sessions:
+            worker.idle_since = time.monotonic()
+        session.ring.release()
+        session.shm.close()
+        self._closing[session_id] = (worker, session.shm)
+        if worker.process.is_alive():
+            self._send(worker, ("close", session_id))
+        else:
+            self._unlink(session_id)
+
+    def _unlink(self, session_id: str) -> None:
+        _, shm = self._closing.pop(session_id, (None, None))
+        if shm is None:
+            return
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _collect(self) -> None:
+        """Results thread: hands worker messages to the event loop."""
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._handle, message)
+            except (AttributeError, RuntimeError):
+                return  # Loop closed during shutdown
+
+    def _handle(self, message: tuple) -> None:
+        kind, worker_id = message[0], message[1]
+        worker = self._workers.get(worker_id)
+        if kind == "ready":
+            if worker is not None:
+                worker.ready = True
+                logger.info(f"✓ STT worker {worker_id} ready (pid {message[2]})")
+            return
+        _, _, handled, audio_seconds, compute_seconds, vad_counts, updates, closed = message
+        vad_stats.add(*vad_counts)
+        for session_id in closed:
+            self._unlink(session_id)
+        if worker is None:
+            return
+        worker.handled = handled
+        worker.audio_seconds = audio_seconds
+        worker.compute_seconds = compute_seconds
+        for session_id, read_to, hypotheses in updates:
+            session = self._sessions.get(session_id)
+            if session is not None and session.worker is worker:
+                session.on_result(read_to, hypotheses)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Workers, calls and scaling events, plus per-worker queue and real-time factor."""
+        if self.started:
+            self._reap()
+        per_worker: List[Dict[str, Any]] = []
+        for worker in self._workers.values():
+            per_worker.append(
+                {
+                    "worker": worker.worker_id,
+                    "pid": worker.pid,
+                    "ready": worker.ready,
+                    "alive": worker.process.is_alive(),
+                    "sessions": len(worker.sessions),
+                    "queued_messages": worker.sent - worker.handled,
+                    "backlog_seconds": round(self._backlog_seconds(worker), 2),
+                    "audio_seconds": round(worker.audio_seconds, 1),
+                    "compute_seconds": round(worker.compute_seconds, 1),
+                    "rtf": round(worker.compute_seconds / worker.audio_seconds, 3)
+                    if worker.audio_seconds
+                    else 0.0,
+                }
+            )
+        return {
+            "enabled": self.started,
+            "workers": len(self._workers),
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "sessions": len(self._sessions),
+            **self._counters,
+            "per_worker": per_worker,
+        }
+
+
+# Global STT worker pool (started by the server when STT_PROCESS_POOL is on)
+stt_pool = SttProcessPool()
@@ -0,0 +1,207 @@
+"""
+Speech Synthesis Service for MCD 311 Sovereign Voice AI
+Runs TTS on a bounded worker pool so synthesis never blocks the event loop
+that drives every call on this worker.
+
+- Requests wait in one priority queue: greetings first, short prompts next,
+  long explanations last. Within a priority it is first come, first served.
+- TTS_WORKERS dispatchers (default: one per core) take requests off the queue
+  and run them on a thread pool of the same size. The engines spend their
+  time in a subprocess or the OS speech driver, outside the GIL.
+- The queue is bounded (TTS_QUEUE_MAX); submit() waits for room, which
+  slows the callers down instead of letting the backlog grow.
+- A request can be cancelled by cancelling the awaiting task, or all of a
+  call's requests at once with cancel_session() when the caller hangs up.
+  Requests still queued are dropped; one already being synthesized runs to
+  completion and its audio is discarded.
+
+Usage:
+    audio = await synthesis_service.submit(text, GREETING, session_id=session_id)
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from src.audio_processor import audio_processor
+from src.profiling import profiler
+from src.tts_engines import SynthesizedAudio
+
+logger = logging.getLogger(__name__)
+
+# Priorities, most urgent first
+GREETING = 0  # Call opening: the caller is waiting in silence
+PROMPT = 1  # Short confirmations and questions
+EXPLANATION = 2  # Long resolution / escalation read-outs
+
+
+@dataclass(eq=False)
+class SynthesisRequest:
+    """One queued utterance."""
+
+    text: str
+    priority: int
+    session_id: Optional[str]
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.perf_counter)
+    cancelled_by_session: bool = False  # Set by cancel_session(), not the awaiting task
+
+
+class SynthesisService:
+    """Priority queue of TTS requests in front of a bounded thread pool."""
+
+    def __init__(self, workers: int = None, queue_max: int = None, synthesize=None):
+        self.workers = workers or settings.TTS_WORKERS or os.cpu_count() or 1
+        self.queue_max = queue_max or settings.TTS_QUEUE_MAX
+        self._synthesize = synthesize or audio_processor.synthesize
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sequence = itertools.count()  # FIFO tie-break within a priority
+        self._pending: Dict[str, List[SynthesisRequest]] = {}  # session -> queued/running
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "failed": 0,
+        }
+
+    def _ensure_started(self) -> None:
+        """Start the pool and dispatchers on the running event loop (first submit)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue(maxsize=self.queue_max)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="tts"
+            )
+        self._dispatchers = [loop.create_task(self._dispatch()) for _ in range(self.workers)]
+        logger.info(f"✓ Synthesis service started ({self.workers} workers)")
+
+    async def submit(
+        self, text: str, priority: int = PROMPT, session_id: Optional[str] = None
+    ) -> SynthesizedAudio:
+        """
+        Queue text for synthesis and wait for the audio.
+
+        Returns:
+            The audio, or None if the call's requests were cancelled with
+            cancel_session()
+
+        Raises:
+            asyncio.CancelledError: If the awaiting task itself was cancelled
+            Exception: Whatever the TTS engine raised
+        """
+        self._ensure_started()
+        request = SynthesisRequest(text, priority, session_id, self._loop.create_future())
+        if session_id is not None:
+            self._pending.setdefault(session_id, []).append(request)
+        self._count("submitted")
+
+        try:
+            await self._queue.put((priority, next(self._sequence), request))
+            return await request.future
+        except asyncio.CancelledError:
+            if request.cancelled_by_session:
+                return None  # Only the request was cancelled (cancel_session)
+            # The task's cancellation has usually cancelled the future already
+            request.future.cancel()
+            if request.future.cancelled():
+                self._count("cancelled")
+            raise
+        finally:
+            self._forget(request)
+
+    async def run(self, function, *args):
+        """Run a short audio job (e.g. encoding for the wire) on the synthesis threads."""
+        self._ensure_started()
+        return await self._loop.run_in_executor(self._executor, function, *args)
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel every request of a call. Returns how many were cancelled."""
+        cancelled = 0
+        for request in self._pending.pop(session_id, []):
+            request.cancelled_by_session = True
+            if request.future.cancel():
+                cancelled += 1
+        if cancelled:
+            self._count("cancelled", cancelled)
+            logger.debug(f"Cancelled {cancelled} synthesis requests for {session_id}")
+        return cancelled
+
+    async def _dispatch(self) -> None:
+        while True:
+            _, _, request = await self._queue.get()
+            try:
+                if request.future.done():
+                    continue  # Cancelled while queued
+                if profiler.enabled:
+                    profiler.observe(
+                        "tts:queue_wait", (time.perf_counter() - request.queued_at) * 1000
+                    )
+                self._track_in_flight(1)
+                try:
+                    with profiler.span("tts:synthesize"):
+                        audio = await self._loop.run_in_executor(
+                            self._executor, self._synthesize, request.text
+                        )
+                except Exception as e:
+                    self._count("failed")
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                    continue
+                finally:
+                    self._track_in_flight(-1)
+
+                if not request.future.done():
+                    request.future.set_result(audio)
+                    self._count("completed")
+            finally:
+                self._queue.task_done()
+
+    def _forget(self, request: SynthesisRequest) -> None:
+        requests = self._pending.get(request.session_id)
+        if requests is None:
+            return
+        try:
+            requests.remove(request)
+        except ValueError:
+            pass
+        if not requests:
+            self._pending.pop(request.session_id, None)
+
+    def _track_in_flight(self, delta: int) -> None:
+        with self._lock:
+            self._in_flight += delta
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get_synthesis_stats(self) -> Dict[str, Any]:
+        """Counters and queue depth for the monitoring dashboard."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["in_flight"] = self._in_flight
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["queue_max"] = self.queue_max
+        stats["workers"] = self.workers
+        return stats
+
+
+# Global synthesis service
+synthesis_service = SynthesisService()
@@ -0,0 +1,389 @@
+"""
+Columnar call transcript for MCD 311 Sovereign Voice AI.
+
+A transcript used to be a list of 4-key dicts, one dict plus a fresh ISO
+timestamp string per turn. Transcript keeps the same entries in parallel
+arrays instead:
+- timestamps: int64 nanoseconds since the epoch (array "q")
+- speakers:   one byte per turn, an index into the interned speaker table
+- messages:   the message strings
+- confidence: float64 (array "d")
+
+It still behaves like the old list: len(), indexing, slicing, iteration and
+append() give and take the same {"timestamp", "speaker", "message",
+"confidence"} dicts, built on access. Timestamps read back exactly as they
+were written; one that is not a naive ISO datetime is kept verbatim.
+
+Bounded window: only the last `window` turns (TRANSCRIPT_WINDOW_TURNS) are
+kept verbatim. Older turns are evicted to a pending list and folded into a
+rolling `summary` - by the fast model in the background (src.transcript_summary)
+or, if that falls behind, by plain truncation here. prompt_context() renders
+summary + recent turns within a token budget, so prompts that carry the
+conversation stay the same size however long the call runs.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from config.settings import settings
+
+# Interned speaker codes. Known speakers have fixed codes; any other speaker
+# gets the next free code in this process (serialized by name, not code).
+SPEAKERS: List[str] = ["system", "citizen", "agent"]
+_SPEAKER_CODES: Dict[str, int] = {name: code for code, name in enumerate(SPEAKERS)}
+MAX_SPEAKERS = 256
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_HEADER = struct.Struct("<I")  # entry count
+
+CHARS_PER_TOKEN = 4  # Rough estimate for the budget; no tokenizer needed
+TRUNCATION_MARK = "…"
+
+# An evicted turn awaiting summarization: (speaker, message)
+Turn = Tuple[str, str]
+
+
+def speaker_code(speaker: str) -> int:
+    """Code for a speaker name, interning it on first use."""
+    code = _SPEAKER_CODES.get(speaker)
+    if code is None:
+        if len(SPEAKERS) >= MAX_SPEAKERS:
+            raise ValueError(f"Too many distinct transcript speakers (max {MAX_SPEAKERS})")
+        code = _SPEAKER_CODES[speaker] = len(SPEAKERS)
+        SPEAKERS.append(speaker)
+    return code
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM tokens in a string."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def render_turns(turns: Iterable[Turn]) -> str:
+    """Turns as "speaker: message" lines."""
+    return "\n".join(f"{speaker}: {message}" for speaker, message in turns)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the end of `text` (the most recent part) within max_tokens."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return TRUNCATION_MARK + text[len(text) - max_chars + len(TRUNCATION_MARK) :]
+
+
+def _timestamp_ns(timestamp: str) -> Optional[int]:
+    """ISO timestamp -> ns since the epoch, or None if it would not round-trip."""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is not None or moment.isoformat() != timestamp:
+        return None
+    return (moment - _EPOCH) // _MICROSECOND * 1000
+
+
+def _timestamp_iso(ns: int) -> str:
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class Transcript:
+    """Array-backed, bounded list of transcript entries plus a rolling summary."""
+
+    __slots__ = (
+        "_ns",
+        "_speakers",
+        "_messages",
+        "_confidence",
+        "_raw_timestamps",
+        "window",
+        "summary",
+        "_evicted",
+        "_dropped",
+    )
+
+    def __init__(
+        self,
+        entries: Iterable[Mapping[str, Any]] = (),
+        summary: str = "",
+        evicted: Sequence[Sequence[str]] = (),
+        dropped: int = 0,
+        window: int = None,
+    ):
+        self._ns = array("q")
+        self._speakers = bytearray()
+        self._messages: List[str] = []
+        self._confidence = array("d")
+        # Index -> timestamp that could not be stored as ns (rare)
+        self._raw_timestamps: Optional[Dict[int, str]] = None
+
+        self.window = settings.TRANSCRIPT_WINDOW_TURNS if window is None else window
+        self.summary = summary
+        self._evicted: List[Turn] = [(speaker, message) for speaker, message in evicted]
+        self._dropped = dropped  # Turns no longer held verbatim (summarized or pending)
+        for entry in entries:
+            self.append(entry)
+
+    def add(self, speaker: str, message: str, timestamp: str, confidence: float = 1.0) -> None:
+        """Append one turn, evicting the oldest once the window is full."""
+        ns = _timestamp_ns(timestamp)
+        if ns is None:
+            if self._raw_timestamps is None:
+                self._raw_timestamps = {}
+            self._raw_timestamps[len(self._messages)] = timestamp
+            ns = 0
+        self._ns.append(ns)
+        self._speakers.append(speaker_code(speaker))
+        self._messages.append(message)
+        self._confidence.append(confidence)
+
+        if self.window and len(self._messages) > self.window:
+            self._evict_oldest()
+
+    def append(self, entry: Mapping[str, Any]) -> None:
+        """list.append() equivalent, taking an entry dict."""
+        self.add(
+            entry["speaker"],
+            entry["message"],
+            entry["timestamp"],
+            entry.get("confidence", 1.0),
+        )
+
+    def clear(self) -> None:
+        self._ns = array("q")
+        self._speakers = bytearray()
+        self._messages = []
+        self._confidence = array("d")
+        self._raw_timestamps = None
+        self.summary = ""
+        self._evicted = []
+        self._dropped = 0
+
+    def timestamp(self, index: int) -> str:
+        if self._raw_timestamps and index in self._raw_timestamps:
+            return self._raw_timestamps[index]
+        return _timestamp_iso(self._ns[index])
+
+    def _entry(self, index: int) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp(index),
+            "speaker": SPEAKERS[self._speakers[index]],
+            "message": self._messages[index],
+            "confidence": self._confidence[index],
+        }
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self._entry(index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Transcript):
+            return (
+                self.to_list() == other.to_list()
+                and self.summary == other.summary
+                and self._evicted == other._evicted
+                and self._dropped == other._dropped
+            )
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Transcript({self.to_list()!r}, summary={self.summary!r})"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """The entries in the window as plain dicts (the old representation)."""
+        return list(self)
+
+    # === WINDOW AND SUMMARY ===
+
+    @property
+    def total_turns(self) -> int:
+        """Turns in the whole call, including those no longer held verbatim."""
+        return self._dropped + len(self._messages)
+
+    @property
+    def evicted(self) -> List[Turn]:
+        """Evicted turns not yet folded into the summary, oldest first."""
+        return list(self._evicted)
+
+    def apply_summary(self, summary: str, consumed: int) -> None:
+        """
+        Install a new summary that covers the first `consumed` pending
+        evicted turns (those the summarizer was given).
+        """
+        self.summary = summary
+        del self._evicted[:consumed]
+
+    def fold_evicted(self, count: int = None, max_tokens: int = None) -> None:
+        """
+        Fold pending evicted turns into the summary without a model, by
+        appending them and truncating to the token budget.
+        """
+        count = len(self._evicted) if count is None else count
+        if not count:
+            return
+        max_tokens = max_tokens or settings.TRANSCRIPT_SUMMARY_MAX_TOKENS
+        text = render_turns(self._evicted[:count])
+        combined = f"{self.summary}\n{text}" if self.summary else text
+        self.apply_summary(truncate_to_tokens(combined, max_tokens), count)
+
+    def _evict_oldest(self) -> None:
+        self._evicted.append((SPEAKERS[self._speakers[0]], self._messages[0]))
+        self._dropped += 1
+        del self._ns[0]
+        del self._speakers[0]
+        del self._messages[0]
+        del self._confidence[0]
+        if self._raw_timestamps:
+            self._raw_timestamps = {
+                i - 1: ts for i, ts in self._raw_timestamps.items() if i > 0
+            } or None
+
+        # Summarizer falling behind: keep memory bounded regardless
+        overflow = len(self._evicted) - self.window
+        if overflow > 0:
+            self.fold_evicted(overflow)
+
+    def prompt_context(self, max_tokens: int = None) -> str:
+        """
+        Conversation for an LLM prompt: the rolling summary, then as many of
+        the most recent turns as fit in max_tokens (PROMPT_CONTEXT_MAX_TOKENS).
+        """
+        max_tokens = max_tokens or settings.PROMPT_CONTEXT_MAX_TOKENS
+        parts: List[str] = []
+        earlier = self.summary
+        if self._evicted:
+            pending = render_turns(self._evicted)
+            earlier = f"{earlier}\n{pending}" if earlier else pending
+        if earlier:
+            budget = min(settings.TRANSCRIPT_SUMMARY_MAX_TOKENS, max_tokens // 2)
+            parts.append(f"Earlier in the call: {truncate_to_tokens(earlier, budget)}")
+        used = sum(estimate_tokens(part) for part in parts)
+
+        recent: List[str] = []
+        for index in range(len(self) - 1, -1, -1):
+            line = f"{SPEAKERS[self._speakers[index]]}: {self._messages[index]}"
+            cost = estimate_tokens(line) + 1
+            if used + cost > max_tokens:
+                break
+            recent.append(line)
+            used += cost
+        recent.reverse()
+        return "\n".join(parts + recent)
+
+    # === SERIALIZATION (checkpointer) ===
+
+    def _asdict(self) -> Dict[str, Any]:
+        """
+        Constructor kwargs. LangGraph's serializer uses this for a transcript
+        nested in another value (e.g. the AgentState a call starts with);
+        a transcript channel value is stored with to_bytes() instead.
+        """
+        return {
+            "entries": self.to_list(),
+            "summary": self.summary,
+            "evicted": [list(turn) for turn in self._evicted],
+            "dropped": self._dropped,
+            "window": self.window,
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary form: entry count, then the ns, confidence, speaker
+        and message-length columns, the UTF-8 messages, and a small JSON
+        trailer (speaker names, verbatim timestamps, summary state).
+        """
+        encoded = [message.encode("utf-8") for message in self._messages]
+        lengths = array("I", (len(message) for message in encoded))
+        trailer: Dict[str, Any] = {
+            "speakers": [SPEAKERS[code] for code in range(max(self._speakers, default=-1) + 1)],
+            "window": self.window,
+        }
+        if self._raw_timestamps:
+            trailer["raw_timestamps"] = {str(i): ts for i, ts in self._raw_timestamps.items()}
+        if self.summary:
+            trailer["summary"] = self.summary
+        if self._evicted:
+            trailer["evicted"] = self._evicted
+        if self._dropped:
+            trailer["dropped"] = self._dropped
+        return b"".join(
+            (
+                _HEADER.pack(len(encoded)),
+                _little_endian(self._ns),
+                _little_endian(self._confidence),
+                bytes(self._speakers),
+                _little_endian(lengths),
+                b"".join(encoded),
+                json.dumps(trailer).encode("utf-8"),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transcript":
+        (count,) = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+
+        def take(size: int) -> bytes:
+            nonlocal offset
+            chunk = data[offset : offset + size]
+            offset += size
+            return chunk
+
+        ns = _from_little_endian("q", take(8 * count))
+        confidence = _from_little_endian("d", take(8 * count))
+        codes = take(count)
+        lengths = _from_little_endian("I", take(4 * count))
+        messages = [take(length).decode("utf-8") for length in lengths]
+        trailer = json.loads(data[offset:].decode("utf-8"))
+
+        transcript = cls(
+            summary=trailer.get("summary", ""),
+            evicted=trailer.get("evicted", ()),
+            dropped=trailer.get("dropped", 0),
+            window=trailer.get("window"),
+        )
+        transcript._ns = ns
+        transcript._confidence = confidence
+        transcript._messages = messages
+        # Speaker codes are per process: remap by name
+        remap = [speaker_code(name) for name in trailer["speakers"]]
+        transcript._speakers = bytearray(remap[code] for code in codes)
+        if "raw_timestamps" in trailer:
+            transcript._raw_timestamps = {
+                int(i): ts for i, ts in trailer["raw_timestamps"].items()
+            }
+        return transcript
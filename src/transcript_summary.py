@@ -0,0 +1,94 @@
+"""
+Rolling Transcript Summarizer for MCD 311 Sovereign Voice AI
+Folds turns evicted from a call's transcript window into its rolling
+summary, using the fast model, off the call path.
+
+The workflow calls maybe_schedule() after every node. At most one summary
+task runs per call; it keeps folding until no evicted turns are pending.
+When the model fails, or the call budget has no time left for it, the turns
+are folded by truncation instead (Transcript.fold_evicted), so the summary
+always stays within TRANSCRIPT_SUMMARY_MAX_TOKENS.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict
+
+from config.settings import settings
+from src.agent_state import AgentState
+from src.call_budget import NORMAL, call_budget
+from src.transcript import Transcript, render_turns, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptSummarizer:
+    """Background rolling-summary tasks, one per call."""
+
+    def __init__(self, max_tokens: int = None):
+        self.max_tokens = max_tokens or settings.TRANSCRIPT_SUMMARY_MAX_TOKENS
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.summaries = 0
+        self.fallbacks = 0
+
+    def maybe_schedule(self, state: AgentState) -> None:
+        """Start a summary task if turns are pending and none is running. Event loop only."""
+        if not state.transcript.evicted or state.session_id in self._tasks:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._summarize(state.session_id, state.transcript, state)
+        )
+        self._tasks[state.session_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(state.session_id, None))
+
+    def cancel(self, session_id: str) -> None:
+        """Stop summarizing a call (it is being wiped)."""
+        task = self._tasks.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _summarize(self, session_id: str, transcript: Transcript, state: AgentState) -> None:
+        # Imported here: the transcript itself needs no LLM connection
+        from src.llm_integration import sovereign_llm
+
+        while transcript.evicted:
+            turns = transcript.evicted
+            summary = None
+            # Only with time to spare: the summary is not on the call's critical path
+            if call_budget.stage(state) == NORMAL:
+                try:
+                    summary = await asyncio.wait_for(
+                        sovereign_llm.asummarize_conversation(
+                            transcript.summary, render_turns(turns), self.max_tokens
+                        ),
+                        timeout=settings.OLLAMA_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"Transcript summary timed out for {session_id}")
+
+            # A full window folds pending turns itself; if it did meanwhile, start over
+            if transcript.evicted[: len(turns)] != turns:
+                continue
+            if summary is None:
+                transcript.fold_evicted(len(turns), self.max_tokens)
+                with self._lock:
+                    self.fallbacks += 1
+            else:
+                transcript.apply_summary(truncate_to_tokens(summary, self.max_tokens), len(turns))
+                with self._lock:
+                    self.summaries += 1
+
+    def get_summary_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring dashboard."""
+        with self._lock:
+            return {
+                "summaries": self.summaries,
+                "fallbacks": self.fallbacks,
+                "in_flight": len(self._tasks),
+            }
+
+
+# Global transcript summarizer
+transcript_summarizer = TranscriptSummarizer()
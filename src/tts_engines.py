@@ -0,0 +1,269 @@
+"""
+Text-to-Speech Engines for MCD 311 Sovereign Voice AI
+Pluggable speech synthesis behind one interface (see settings.TTS_ENGINE).
+
+Available engines:
+- "espeak":  espeak-ng (or espeak) on this machine. Fully offline, CPU only,
+             audio is read from the process's stdout - nothing touches disk.
+             The text is passed on stdin, never on the command line, so it
+             does not show up in the process list.
+- "pyttsx3": The OS speech engine (SAPI5 on Windows, NSSpeechSynthesizer on
+             macOS, espeak on Linux). Offline; the driver can only render to a
+             file, so a temporary WAV is written and removed immediately.
+- "gtts":    Google Text-to-Speech. The previous engine, kept for comparison
+             only: every utterance is sent to Google's servers.
+- "auto":    The first local engine available (espeak, then pyttsx3).
+             Never falls back to gtts.
+
+Local engines return 16-bit mono PCM (SynthesizedAudio), wrapped as WAV for
+the browser, which decodes it directly with the Web Audio API.
+"""
+
+import io
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+from config.settings import settings
+from src.audio_frames import Codec
+
+try:
+    import pyttsx3
+except ImportError:  # Optional dependency, only needed for the pyttsx3 engine
+    pyttsx3 = None
+
+try:
+    from gtts import gTTS
+except ImportError:  # Optional dependency, only needed for the legacy gtts engine
+    gTTS = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+GTTS_BITRATE = 32000  # gTTS serves 32 kbit/s mono MP3
+
+# Sentence ends, including the Devanagari danda
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+
+@dataclass
+class SynthesizedAudio:
+    """One synthesized utterance, held in memory."""
+
+    data: bytes  # Raw 16-bit little-endian mono PCM, or the encoded bytes
+    sample_rate: int
+    format: str = "pcm"  # "pcm" or "mp3"
+
+    @property
+    def duration_seconds(self) -> float:
+        if self.format == "mp3":
+            return len(self.data) * 8 / GTTS_BITRATE
+        return len(self.data) / (SAMPLE_WIDTH * self.sample_rate)
+
+    @classmethod
+    def from_wav(cls, data: bytes) -> "SynthesizedAudio":
+        """16-bit mono PCM read back out of a WAV file (e.g. a cached phrase)."""
+        return _pcm_from_wav(data)
+
+    def to_wav(self) -> bytes:
+        """WAV container for the browser. Encoded formats are returned as they are."""
+        if self.format != "pcm":
+            return self.data
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(SAMPLE_WIDTH)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(self.data)
+        return buffer.getvalue()
+
+    def to_frame(self) -> Tuple[Codec, bytes]:
+        """Codec and payload of the audio frame carrying this audio (WAV, or MP3 as is)."""
+        if self.format == "mp3":
+            return Codec.MP3, self.data
+        return Codec.WAV, self.to_wav()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, the unit synthesized ahead of the rest."""
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+def _pcm_from_wav(data: bytes) -> SynthesizedAudio:
+    """Read 16-bit mono PCM out of a WAV file held in memory."""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        if wav.getsampwidth() != SAMPLE_WIDTH or wav.getnchannels() != 1:
+            raise ValueError("TTS engine returned audio that is not 16-bit mono")
+        # A streamed WAV header may claim more frames than were written;
+        # readframes returns what is actually there
+        return SynthesizedAudio(wav.readframes(wav.getnframes()), wav.getframerate())
+
+
+class TTSEngine(ABC):
+    """
+    Base class for TTS engines (an engine missing synthesize or available
+    cannot be instantiated).
+
+    `local` is False for engines that send text off the machine.
+    """
+
+    name: str = ""
+    local: bool = True
+
+    @abstractmethod
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        ...
+
+    def synthesize_sentences(self, text: str) -> Iterator[SynthesizedAudio]:
+        """
+        Synthesize sentence by sentence, so the first sentence can play while
+        the rest is still being rendered.
+        """
+        for sentence in split_sentences(text):
+            yield self.synthesize(sentence)
+
+    @classmethod
+    @abstractmethod
+    def available(cls) -> bool:
+        """Whether this engine can run on this machine."""
+
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng subprocess, audio read back from stdout."""
+
+    name = "espeak"
+    local = True
+
+    def __init__(self, voice: str = None, rate_wpm: int = None):
+        self.binary = self._find_binary()
+        if self.binary is None:
+            raise RuntimeError("TTS_ENGINE=espeak requires espeak-ng: apt install espeak-ng")
+        self.voice = voice or settings.TTS_VOICE
+        self.rate_wpm = rate_wpm or settings.TTS_RATE_WPM
+
+    @staticmethod
+    def _find_binary():
+        return shutil.which("espeak-ng") or shutil.which("espeak")
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls._find_binary() is not None
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        result = subprocess.run(
+            [self.binary, "-v", self.voice, "-s", str(self.rate_wpm), "--stdin", "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=settings.TTS_TIMEOUT,
+            check=True,
+        )
+        return _pcm_from_wav(result.stdout)
+
+
+class Pyttsx3Engine(TTSEngine):
+    """OS speech engine through pyttsx3."""
+
+    name = "pyttsx3"
+    local = True
+
+    def __init__(self, voice: str = None, rate_wpm: int = None):
+        if pyttsx3 is None:
+            raise RuntimeError("TTS_ENGINE=pyttsx3 requires the 'pyttsx3' package: pip install pyttsx3")
+        self.voice = voice or settings.TTS_VOICE
+        self.rate_wpm = rate_wpm or settings.TTS_RATE_WPM
+        self._engine = None
+        # pyttsx3 drivers are not thread-safe: one utterance at a time
+        self._lock = threading.Lock()
+
+    @classmethod
+    def available(cls) -> bool:
+        return pyttsx3 is not None
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", self.rate_wpm)
+            for voice in self._engine.getProperty("voices"):
+                if self.voice in (voice.id, voice.name) or self.voice in (voice.languages or []):
+                    self._engine.setProperty("voice", voice.id)
+                    break
+        return self._engine
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        handle, path = tempfile.mkstemp(suffix=".wav")
+        os.close(handle)
+        try:
+            with self._lock:
+                engine = self._get_engine()
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+            with open(path, "rb") as wav:
+                return _pcm_from_wav(wav.read())
+        finally:
+            os.remove(path)
+
+
+class GTTSEngine(TTSEngine):
+    """Google Text-to-Speech (network). Legacy, for comparison only."""
+
+    name = "gtts"
+    local = False
+
+    def __init__(self, language: str = "en", tld: str = "co.in"):
+        if gTTS is None:
+            raise RuntimeError("TTS_ENGINE=gtts requires the 'gTTS' package: pip install gTTS")
+        self.language = language
+        self.tld = tld  # Indian accent
+        logger.warning("⚠ TTS_ENGINE=gtts sends every utterance to Google's servers")
+
+    @classmethod
+    def available(cls) -> bool:
+        return gTTS is not None
+
+    def synthesize(self, text: str) -> SynthesizedAudio:
+        mp3_fp = io.BytesIO()
+        gTTS(text=text, lang=self.language, tld=self.tld, slow=False).write_to_fp(mp3_fp)
+        return SynthesizedAudio(mp3_fp.getvalue(), 24000, format="mp3")
+
+
+_ENGINES = {
+    EspeakEngine.name: EspeakEngine,
+    Pyttsx3Engine.name: Pyttsx3Engine,
+    GTTSEngine.name: GTTSEngine,
+}
+
+# Tried in order by "auto"; gtts is never picked automatically
+_LOCAL_ENGINES = (EspeakEngine, Pyttsx3Engine)
+
+
+def get_tts_engine(name: str) -> TTSEngine:
+    """
+    Build the TTS engine selected by name ("auto", "espeak", "pyttsx3" or "gtts").
+
+    Raises:
+        ValueError: If the engine name is unknown
+        RuntimeError: If the engine (or, for "auto", any local engine) is not installed
+    """
+    name = name.lower()
+    if name == "auto":
+        for engine_cls in _LOCAL_ENGINES:
+            if engine_cls.available():
+                return engine_cls()
+        raise RuntimeError(
+            "No local TTS engine found: install espeak-ng or pip install pyttsx3"
+        )
+    try:
+        engine_cls = _ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown TTS engine '{name}'. Choose one of: auto, {', '.join(_ENGINES)}"
+        )
+    return engine_cls()
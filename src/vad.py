@@ -0,0 +1,204 @@
+"""
+Voice Activity Detection for MCD 311 Sovereign Voice AI
+Gates caller audio in front of STT: silence is dropped before it reaches the
+model, speech is segmented into utterances, and the end of the caller's
+turn is signalled as soon as they stop talking.
+
+Each chunk is cut into 20 ms frames and classified in one NumPy pass:
+- energy:    frame log-energy above an adaptive noise floor (+VAD_ENERGY_MARGIN_DB)
+- spectrum:  spectral flatness below VAD_MAX_FLATNESS (voiced speech is
+             peaky; fans, hiss and line noise are flat)
+Raw decisions are smoothed the same way: a frame only starts speech after
+VAD_ONSET_FRAMES consecutive speech frames, and speech is held for
+VAD_HANGOVER_MS after the last one, so word gaps are not cut. The last
+VAD_ONSET_FRAMES frames before an utterance are kept as pre-roll and sent
+with it, so the onset that confirmed the speech is not lost. The turn ends
+after VAD_END_OF_TURN_MS without speech.
+
+Audio is 16 kHz mono float32 (see src/stt_engine.py).
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+FRAME_SIZE = SAMPLE_RATE * FRAME_MS // 1000  # 320 samples
+MIN_ENERGY_DB = -60.0  # Never speech below this, whatever the noise floor
+INITIAL_NOISE_FLOOR_DB = -50.0  # Upper bound of the first estimate (the caller may speak at once)
+NOISE_FLOOR_ADAPT = 0.05  # Weight of each chunk's non-speech frames in the floor
+
+_WINDOW = np.hanning(FRAME_SIZE).astype(np.float32)
+
+
+@dataclass
+class VadResult:
+    """What one chunk of audio contained."""
+
+    audio: np.ndarray  # Speech frames (incl. pre-roll and hangover), to forward to STT
+    speech_started: bool = False  # An utterance began in this chunk
+    end_of_turn: bool = False  # The caller stopped talking in this chunk
+
+
+def frame_features(frames: np.ndarray):
+    """Per-frame log-energy (dBFS) and spectral flatness, for a (n, FRAME_SIZE) array."""
+    energy = np.mean(frames**2, axis=1)
+    energy_db = 10.0 * np.log10(energy + 1e-12)
+    power = np.abs(np.fft.rfft(frames * _WINDOW, axis=1)) ** 2 + 1e-12
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    return energy_db, flatness
+
+
+class VoiceActivityDetector:
+    """One call's VAD state (not thread-safe)."""
+
+    def __init__(self):
+        self.margin_db = settings.VAD_ENERGY_MARGIN_DB
+        self.max_flatness = settings.VAD_MAX_FLATNESS
+        self.onset_frames = settings.VAD_ONSET_FRAMES
+        self.hangover_frames = settings.VAD_HANGOVER_MS // FRAME_MS
+        self.end_of_turn_frames = settings.VAD_END_OF_TURN_MS // FRAME_MS
+
+        self._pending = np.zeros(0, dtype=np.float32)  # Tail shorter than a frame
+        self._preroll = np.zeros((0, FRAME_SIZE), dtype=np.float32)  # Unsent frames before speech
+        self._noise_floor_db = None  # Learned from the first chunk
+        self._frame_index = 0  # Frames seen so far
+        self._run = 0  # Consecutive raw speech frames at the end of the last chunk
+        self._last_speech = -(10**9)  # Frame index of the last (onset-confirmed) speech frame
+        self.in_utterance = False
+        # Skipped-audio bookkeeping
+        self.frames_total = 0
+        self.frames_voiced = 0
+
+    def process(self, samples: np.ndarray) -> VadResult:
+        """Classify a chunk; returns its speech audio and utterance events."""
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        count = samples.size // FRAME_SIZE
+        self._pending = samples[count * FRAME_SIZE :].copy()
+        if count == 0:
+            return VadResult(np.zeros(0, dtype=np.float32))
+        frames = samples[: count * FRAME_SIZE].reshape(count, FRAME_SIZE)
+
+        energy_db, flatness = frame_features(frames)
+        if self._noise_floor_db is None:
+            self._noise_floor_db = min(float(np.percentile(energy_db, 10)), INITIAL_NOISE_FLOOR_DB)
+        raw = (
+            (energy_db > self._noise_floor_db + self.margin_db)
+            & (energy_db > MIN_ENERGY_DB)
+            & (flatness < self.max_flatness)
+        )
+
+        # Onset: length of the run of raw speech frames ending at each frame
+        index = np.arange(count)
+        breaks = np.where(~raw, index, -1)
+        last_break = np.maximum.accumulate(breaks)
+        run = np.where(last_break < 0, index + 1 + self._run, index - last_break)
+        confirmed = raw & (run >= self.onset_frames)
+
+        # Hangover: speech holds for hangover_frames after the last confirmed frame
+        absolute = index + self._frame_index
+        last_speech = np.maximum.accumulate(
+            np.where(confirmed, absolute, -(10**9))
+        )
+        last_speech = np.maximum(last_speech, self._last_speech)
+        since_speech = absolute - last_speech
+        voiced = since_speech <= self.hangover_frames
+
+        # Pre-roll: the onset_frames frames before each utterance start are
+        # sent too (the earliest may still be in the previous chunk's tail)
+        held = self._preroll.shape[0]
+        frames = np.concatenate((self._preroll, frames)) if held else frames
+        voiced = np.concatenate((np.zeros(held, dtype=bool), voiced))
+        starts = voiced & ~np.concatenate(([True], voiced[:-1]))
+        starts_before = np.concatenate(([0], np.cumsum(starts)))
+        position = np.arange(voiced.size)
+        ahead = np.minimum(position + self.onset_frames + 1, voiced.size)
+        send = voiced | (starts_before[ahead] > starts_before[position + 1])
+        sent = np.flatnonzero(send)
+        unsent = frames[sent[-1] + 1 :] if sent.size else frames
+        self._preroll = unsent[unsent.shape[0] - min(self.onset_frames, unsent.shape[0]) :].copy()
+
+        # Events: first voiced frame opens an utterance, a long gap closes it
+        result = VadResult(frames[send].reshape(-1))
+        if not self.in_utterance and voiced.any():
+            self.in_utterance = True
+            result.speech_started = True
+        if self.in_utterance and since_speech[-1] >= self.end_of_turn_frames:
+            self.in_utterance = False
+            result.end_of_turn = True
+
+        # Noise floor follows the non-speech frames
+        quiet = energy_db[~raw]
+        if quiet.size:
+            self._noise_floor_db += NOISE_FLOOR_ADAPT * (float(np.mean(quiet)) - self._noise_floor_db)
+
+        self._run = int(run[-1]) if raw[-1] else 0
+        self._last_speech = int(last_speech[-1])
+        self._frame_index += count
+        self.frames_total += count
+        self.frames_voiced += int(send.sum())
+        vad_stats.record(count, int(send.sum()), result)
+        return result
+
+    def voiced(self, samples: np.ndarray) -> np.ndarray:
+        """Only the speech of a complete recording (one-shot STT)."""
+        tail = -samples.size % FRAME_SIZE
+        if tail:
+            samples = np.concatenate((samples, np.zeros(tail, dtype=np.float32)))
+        return self.process(samples).audio
+
+    @property
+    def skipped_fraction(self) -> float:
+        if not self.frames_total:
+            return 0.0
+        return 1 - self.frames_voiced / self.frames_total
+
+
+class VadStats:
+    """Counters across all calls, for the monitoring dashboard."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.frames_total = 0
+        self.frames_voiced = 0
+        self.utterances = 0
+        self.end_of_turns = 0
+
+    def record(self, frames: int, voiced: int, result: VadResult) -> None:
+        self.add(frames, voiced, int(result.speech_started), int(result.end_of_turn))
+
+    def add(self, frames: int, voiced: int, utterances: int, end_of_turns: int) -> None:
+        """Add counts (also those reported by STT worker processes)."""
+        with self._lock:
+            self.frames_total += frames
+            self.frames_voiced += voiced
+            self.utterances += utterances
+            self.end_of_turns += end_of_turns
+
+    def snapshot(self) -> Tuple[int, int, int, int]:
+        with self._lock:
+            return self.frames_total, self.frames_voiced, self.utterances, self.end_of_turns
+
+    def get_vad_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.frames_total
+            return {
+                "audio_seconds": round(total * FRAME_MS / 1000, 1),
+                "speech_seconds": round(self.frames_voiced * FRAME_MS / 1000, 1),
+                "skipped_fraction": round(1 - self.frames_voiced / total, 3) if total else 0.0,
+                "utterances": self.utterances,
+                "end_of_turns": self.end_of_turns,
+            }
+
+
+# Global VAD counters
+vad_stats = VadStats()
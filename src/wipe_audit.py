@@ -0,0 +1,154 @@
+"""
+Wipe Audit Trail for MCD 311 Sovereign Voice AI
+Bounded-memory compliance trail for memory wipes.
+
+Every wipe appends one event to a single capped Redis Stream (trimmed by
+age and by length) and bumps per-hour rolled-up counters. Audit memory
+therefore stays flat under peak call volume, and compliance reports are
+range reads (XRANGE / a handful of HGETALLs) instead of keyspace SCANs.
+No citizen data is recorded - only session ids, categories and counts.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PREFIX = "audit:rollup"
+ROLLUP_BUCKET_FORMAT = "%Y%m%d%H"
+
+# Wipe outcomes
+WIPED = "wiped"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+
+
+@dataclass
+class WipeAuditEvent:
+    """One audit record. Field values must be Redis-encodable (no bools/None)."""
+
+    session_id: str
+    outcome: str
+    grievance_category: str = "unknown"
+    was_escalated: bool = False
+    call_duration: float = 0.0
+    transcript_entries: int = 0
+    sessions: int = 1  # >1 for a bulk wipe summary event
+
+    def to_fields(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "outcome": self.outcome,
+            "grievance_category": self.grievance_category,
+            "was_escalated": int(self.was_escalated),
+            "call_duration": self.call_duration,
+            "transcript_entries": self.transcript_entries,
+            "sessions": self.sessions,
+        }
+
+
+def rollup_key(moment: datetime) -> str:
+    """Hourly counter hash for the hour containing `moment`."""
+    return f"{ROLLUP_PREFIX}:{moment.strftime(ROLLUP_BUCKET_FORMAT)}"
+
+
+class WipeAuditTrail:
+    """
+    Appends wipe events to the capped stream and maintains hourly rollups.
+
+    Rollup hash fields:
+        wipes, escalations, failures, not_found            (totals)
+        wipes:<category>, escalations:<category>, failures:<category>
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.stream_key = settings.AUDIT_STREAM_KEY
+        self.retention_seconds = settings.AUDIT_RETENTION_SECONDS
+        self.max_events = settings.AUDIT_STREAM_MAXLEN
+
+    def queue(self, pipe, event: WipeAuditEvent) -> None:
+        """
+        Queue the audit writes for one event on an existing pipeline, so they
+        share the wipe's round trip.
+        """
+        now = datetime.now()
+        oldest_ms = int((now.timestamp() - self.retention_seconds) * 1000)
+
+        # Time-based trim on every append, plus a hard length cap for bursts
+        pipe.xadd(self.stream_key, event.to_fields(), minid=oldest_ms, approximate=True)
+        pipe.xtrim(self.stream_key, maxlen=self.max_events, approximate=True)
+
+        bucket = rollup_key(now)
+        category = event.grievance_category
+        if event.outcome == WIPED:
+            pipe.hincrby(bucket, "wipes", event.sessions)
+            pipe.hincrby(bucket, f"wipes:{category}", event.sessions)
+            if event.was_escalated:
+                pipe.hincrby(bucket, "escalations", 1)
+                pipe.hincrby(bucket, f"escalations:{category}", 1)
+        elif event.outcome == FAILED:
+            pipe.hincrby(bucket, "failures", event.sessions)
+            pipe.hincrby(bucket, f"failures:{category}", event.sessions)
+        else:
+            pipe.hincrby(bucket, "not_found", event.sessions)
+        # Keep one extra hour so the oldest bucket covers the full window
+        pipe.expire(bucket, self.retention_seconds + 3600)
+
+    def record(self, event: WipeAuditEvent) -> None:
+        """Write one event in its own round trip (best effort)."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            self.queue(pipe, event)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"✗ Failed to record wipe audit event: {e}")
+
+    def get_events(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        count: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Raw audit events in [start, end] via XRANGE."""
+        min_id = f"{int(start.timestamp() * 1000)}-0" if start else "-"
+        max_id = f"{int(end.timestamp() * 1000)}" if end else "+"
+        entries = self.client.xrange(self.stream_key, min=min_id, max=max_id, count=count)
+        return [{"id": entry_id, **fields} for entry_id, fields in entries]
+
+    def get_report(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """
+        Compliance report for [start, end] from the hourly rollups.
+        Costs one pipelined HGETALL per hour in the window.
+        """
+        hours: List[datetime] = []
+        moment = start.replace(minute=0, second=0, microsecond=0)
+        while moment <= end:
+            hours.append(moment)
+            moment += timedelta(hours=1)
+
+        pipe = self.client.pipeline(transaction=False)
+        for hour in hours:
+            pipe.hgetall(rollup_key(hour))
+        buckets = pipe.execute()
+
+        totals: Dict[str, int] = {}
+        by_hour: Dict[str, Dict[str, int]] = {}
+        for hour, bucket in zip(hours, buckets):
+            if not bucket:
+                continue
+            counts = {field: int(value) for field, value in bucket.items()}
+            by_hour[hour.isoformat()] = counts
+            for field, value in counts.items():
+                totals[field] = totals.get(field, 0) + value
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "totals": totals,
+            "by_hour": by_hour,
+        }
@@ -1,27 +1,82 @@
 """
 LangGraph Workflow for MCD 311 Sovereign Voice AI
 Implements a Finite State Machine (FSM) for reliable, predictable agent behavior.
+
+The graph is compiled once per process (get_compiled_workflow) and its nodes
+are coroutines, so a single event loop drives many concurrent calls through
+ainvoke/astream. LLM calls use the async Ollama client; Redis work (session
+flushes, the wipe) runs in worker threads via asyncio.to_thread. Nodes, LLM
+calls and Redis calls are timed by src.profiling.
+
+Each call runs against a deadline (src.call_budget): LLM calls degrade to
+faster models or templates as it nears, nodes are skipped once it is spent
+(the wipe always runs), and run_call / stream_call force-wipe a call that
+still overruns.
 """
 
+import asyncio
+import functools
 import logging
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Union
 
 from langgraph.graph import StateGraph, END
+from config.settings import settings
 from src.agent_state import AgentState, CallState, GrievanceCategory
-from src.memory_manager import memory_manager
-from src.llm_integration import sovereign_llm
+from src.call_budget import EXHAUSTED, FAST, TEMPLATE_ESCALATION, call_budget
+from src.checkpointer import redis_checkpointer
+from src.escalation_policy import escalation_policy
+from src.profiling import profiler
+from src.session_cache import session_cache
+from src.transcript_summary import transcript_summarizer
+from src.stt_engine import speech_inputs
+from src.llm_integration import CATEGORIZATION_FALLBACK, sovereign_llm
 
 logger = logging.getLogger(__name__)
 
+# A node returns the whole state, or (parallel branches) a partial update
+NodeResult = Union[AgentState, Dict[str, Any]]
+
+
+# Session cache calls made by the wipe: they may use the wipe reserve
+WIPE_OPS = ("end_call", "memory_wipe_node")
+
+
+async def _session_call(state: Optional[AgentState], op: str, *args: Any) -> Any:
+    """
+    Run one session cache call in a worker thread, as a "redis:<op>" span,
+    bounded by the call's remaining budget (no bound if state is None).
+    """
+    with profiler.span(f"redis:{op}"):
+        call = functools.partial(asyncio.to_thread, getattr(session_cache, op), *args)
+        if state is None:
+            return await call()
+        return await call_budget.run_store(
+            state, call, f"redis:{op}", reserve=op not in WIPE_OPS
+        )
+
 
 class SovereignVoiceAIWorkflow:
     """
     LangGraph-based workflow implementing a strict Finite State Machine.
     Ensures the agent cannot be "tricked" and maintains governance constraints.
+
+    Nodes that do not depend on each other run as parallel branches between
+    listen_grievance and merge_details, so call latency follows the slowest
+    branch instead of the sum. Each branch returns a partial update of the
+    fields it owns (parallel_branches); ownership is disjoint, so the merge
+    is deterministic whatever order the branches finish in.
     """
 
+    # Parallel branch -> AgentState fields it may write.
+    # New independent steps (geo lookup, repeat-caller check) go here.
+    parallel_branches: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+        ("categorize", ("current_state", "grievance_category", "confidence_score")),
+        ("validate_details", ("citizen_phone", "citizen_location")),
+    )
+
     def __init__(self):
         """Initialize the workflow graph."""
         self.workflow = StateGraph(AgentState)
@@ -31,37 +86,119 @@ class SovereignVoiceAIWorkflow:
         """Build the FSM graph with all nodes and edges."""
 
         # === NODE DEFINITIONS ===
-        self.workflow.add_node("initiate_call", self.node_initiate_call)
-        self.workflow.add_node("listen_grievance", self.node_listen_grievance)
-        self.workflow.add_node("categorize", self.node_categorize)
-        self.workflow.add_node("validate_details", self.node_validate_details)
-        self.workflow.add_node("escalation_check", self.node_escalation_check)
-        self.workflow.add_node("prepare_resolution", self.node_prepare_resolution)
-        self.workflow.add_node("memory_wipe", self.node_memory_wipe)
+        self.workflow.add_node("initiate_call", self._node("initiate_call", self.node_initiate_call))
+        self.workflow.add_node("listen_grievance", self._node("listen_grievance", self.node_listen_grievance))
+        for name, fields in self.parallel_branches:
+            self.workflow.add_node(
+                name,
+                self._node(name, self._branch(name, fields, getattr(self, f"node_{name}"))),
+            )
+        self.workflow.add_node("merge_details", self._node("merge_details", self.node_merge_details))
+        self.workflow.add_node("policy_decision", self._node("policy_decision", self.node_policy_decision))
+        self.workflow.add_node("escalation_check", self._node("escalation_check", self.node_escalation_check))
+        self.workflow.add_node("prepare_resolution", self._node("prepare_resolution", self.node_prepare_resolution))
+        self.workflow.add_node(
+            "memory_wipe", self._node("memory_wipe", self.node_memory_wipe, final=True)
+        )
 
         # === EDGE DEFINITIONS (FSM TRANSITIONS) ===
         self.workflow.set_entry_point("initiate_call")
 
         self.workflow.add_edge("initiate_call", "listen_grievance")
-        self.workflow.add_edge("listen_grievance", "categorize")
-        self.workflow.add_edge("categorize", "validate_details")
-        self.workflow.add_edge("validate_details", "escalation_check")
 
-        # Escalation check branches
+        # Fan out to the independent branches, join once all have finished
+        branch_names = [name for name, _ in self.parallel_branches]
+        for name in branch_names:
+            self.workflow.add_edge("listen_grievance", name)
+        self.workflow.add_edge(branch_names, "merge_details")
+
+        # Routine and urgent calls are decided by the policy table;
+        # only the rest reach the deep model
         self.workflow.add_conditional_edges(
-            "escalation_check",
-            self.route_escalation,
+            "merge_details",
+            self.route_escalation_path,
             {
-                "escalate": "prepare_resolution",
-                "resolve": "prepare_resolution",
+                "policy": "policy_decision",
+                "deep": "escalation_check",
             },
         )
 
+        # Escalation decision branches
+        for decider in ("policy_decision", "escalation_check"):
+            self.workflow.add_conditional_edges(
+                decider,
+                self.route_escalation,
+                {
+                    "escalate": "prepare_resolution",
+                    "resolve": "prepare_resolution",
+                },
+            )
+
         # Final node
         self.workflow.add_edge("prepare_resolution", "memory_wipe")
         self.workflow.add_edge("memory_wipe", END)
 
-    def node_initiate_call(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def _node(
+        name: str,
+        fn: Callable[[AgentState], Awaitable[NodeResult]],
+        final: bool = False,
+    ) -> Callable[[AgentState], Awaitable[NodeResult]]:
+        """
+        Wrap a node in a timing span and let the write-behind cache see the
+        node boundary. The final node has no boundary (the session is gone)
+        and closes the call's profiling trace instead. Once the call budget
+        is spent every node but the final one is skipped.
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(state: AgentState) -> NodeResult:
+            if not final and call_budget.stage(state) == EXHAUSTED:
+                logger.warning(f"⏱ Call budget spent, skipping {name} for {state.session_id}")
+                return {}
+            with profiler.node_span(state.session_id, name):
+                result = await fn(state)
+                if not final:
+                    # Summarize turns the transcript window evicted, off the call path
+                    transcript_summarizer.maybe_schedule(state)
+                if isinstance(result, AgentState):
+                    result.call_duration_seconds = call_budget.elapsed(result)
+                if not final:
+                    await _session_call(state, "node_boundary", state.session_id)
+            if final:
+                profiler.finish_call(state.session_id)
+            return result
+
+        return wrapper
+
+    def _branch(
+        self,
+        name: str,
+        fields: Tuple[str, ...],
+        fn: Callable[[AgentState], Awaitable[Dict[str, Any]]],
+    ) -> Callable[[AgentState], Awaitable[Dict[str, Any]]]:
+        """
+        Wrap a parallel branch so it can only write the fields it owns.
+        Raises ValueError at build time if two branches claim the same field.
+        """
+        for other, other_fields in self.parallel_branches:
+            if other != name and set(fields) & set(other_fields):
+                raise ValueError(
+                    f"Parallel branches '{name}' and '{other}' both write "
+                    f"{sorted(set(fields) & set(other_fields))}"
+                )
+
+        @functools.wraps(fn)
+        async def wrapper(state: AgentState) -> Dict[str, Any]:
+            update = await fn(state)
+            stray = set(update) - set(fields)
+            if stray:
+                raise ValueError(f"Branch '{name}' wrote fields it does not own: {sorted(stray)}")
+            return update
+
+        return wrapper
+
+    async def node_initiate_call(self, state: AgentState) -> AgentState:
         """
         NODE 1: INITIATE_CALL
         Initialize a new call session.
@@ -70,9 +207,11 @@ class SovereignVoiceAIWorkflow:
 
         state.call_timestamp = datetime.now().isoformat()
         state.current_state = CallState.INITIATED
+        call_budget.start(state)
 
-        # Store initial state in Redis
-        memory_manager.store_session(state)
+        # Register the session (written to Redis at the next flush point).
+        # The TTL covers the call budget, so Redis drops it even if we die.
+        await _session_call(state, "store_session", state, call_budget.session_ttl(state))
 
         # Add to transcript
         state.add_transcript_entry(
@@ -84,16 +223,32 @@ class SovereignVoiceAIWorkflow:
         logger.info(f"✓ Session {state.session_id} initiated")
         return state
 
-    def node_listen_grievance(self, state: AgentState) -> AgentState:
+    async def node_listen_grievance(self, state: AgentState) -> AgentState:
         """
         NODE 2: LISTEN_GRIEVANCE
-        Simulate receiving citizen's grievance (in real system, this would be voice-to-text).
+        Receive the citizen's grievance: the final STT hypothesis of the
+        caller's first utterance, when the call has speech input.
         """
         logger.info(f"[NODE] listen_grievance: Waiting for citizen input")
 
         state.current_state = CallState.LISTENING
+        confidence = 1.0
 
-        # For demo, we'll use a mock grievance
+        speech_input = speech_inputs.get(state.session_id)
+        if not state.grievance_description and speech_input is not None:
+            timeout = min(
+                settings.STT_LISTEN_TIMEOUT_SECONDS,
+                call_budget.remaining(state) - call_budget.fast_below_seconds,
+            )
+            with profiler.span("stt:listen_grievance"):
+                hypothesis = await speech_input.next_final(max(0.0, timeout))
+            if hypothesis is not None and hypothesis.text:
+                state.grievance_description = hypothesis.text
+                confidence = hypothesis.confidence
+            else:
+                logger.warning(f"No grievance heard from {state.session_id}")
+
+        # For demo (no speech input), we'll use a mock grievance
         if not state.grievance_description:
             state.grievance_description = (
                 "There is a big pothole on my street near the local market"
@@ -103,26 +258,31 @@ class SovereignVoiceAIWorkflow:
             speaker="citizen",
             message=state.grievance_description,
             timestamp=datetime.now().isoformat(),
+            confidence=confidence,
         )
 
-        memory_manager.update_session(state)
+        await _session_call(state, "update_session", state)
 
         logger.info(f"✓ Grievance received: {state.grievance_description[:50]}...")
         return state
 
-    def node_categorize(self, state: AgentState) -> AgentState:
+    async def node_categorize(self, state: AgentState) -> Dict[str, Any]:
         """
-        NODE 3: CATEGORIZE
+        NODE 3: CATEGORIZE (parallel branch)
         Use Fast Path LLM to categorize the grievance.
         """
         logger.info(f"[NODE] categorize: Analyzing grievance")
 
-        state.current_state = CallState.PROCESSING
-
         # Use LLM to categorize
-        categorization = sovereign_llm.categorize_grievance(
-            state.grievance_description, state.citizen_location or ""
-        )
+        with profiler.span("llm:categorize_grievance"):
+            categorization = await call_budget.run_llm(
+                state,
+                lambda: sovereign_llm.acategorize_grievance(
+                    state.grievance_description, state.citizen_location or ""
+                ),
+                lambda: dict(CATEGORIZATION_FALLBACK),
+                "categorize",
+            )
 
         # Map to our category enum
         category_map = {
@@ -136,31 +296,43 @@ class SovereignVoiceAIWorkflow:
             "NOISE_POLLUTION": GrievanceCategory.NOISE_POLLUTION,
         }
 
-        state.grievance_category = category_map.get(
+        category = category_map.get(
             categorization.get("category"), GrievanceCategory.OTHER
         )
-        state.confidence_score = categorization.get("confidence", 0.5)
+        confidence = categorization.get("confidence", 0.5)
 
-        logger.info(
-            f"✓ Categorized as {state.grievance_category.value} "
-            f"(confidence: {state.confidence_score})"
-        )
+        logger.info(f"✓ Categorized as {category.value} (confidence: {confidence})")
 
-        memory_manager.update_session(state)
-        return state
+        return {
+            "current_state": CallState.PROCESSING,
+            "grievance_category": category,
+            "confidence_score": confidence,
+        }
 
-    def node_validate_details(self, state: AgentState) -> AgentState:
+    async def node_validate_details(self, state: AgentState) -> Dict[str, Any]:
         """
-        NODE 4: VALIDATE_DETAILS
+        NODE 4: VALIDATE_DETAILS (parallel branch)
         Collect and validate required information (location, contact).
         """
         logger.info(f"[NODE] validate_details: Validating citizen information")
 
         # In real system, ask for missing details
+        update: Dict[str, Any] = {}
         if not state.citizen_phone:
-            state.citizen_phone = "+91-9999999999"  # Mock input
+            update["citizen_phone"] = "+91-9999999999"  # Mock input
         if not state.citizen_location:
-            state.citizen_location = "Connaught Place, Delhi"  # Mock input
+            update["citizen_location"] = "Connaught Place, Delhi"  # Mock input
+
+        logger.info(f"✓ Details validated")
+        return update
+
+    async def node_merge_details(self, state: AgentState) -> AgentState:
+        """
+        NODE 5: MERGE_DETAILS
+        Join point of the parallel branches. Their updates are already applied
+        to `state`; record the outcome once and write the session.
+        """
+        logger.info(f"[NODE] merge_details: Joining parallel branches")
 
         state.add_transcript_entry(
             speaker="agent",
@@ -168,31 +340,78 @@ class SovereignVoiceAIWorkflow:
             timestamp=datetime.now().isoformat(),
         )
 
-        memory_manager.update_session(state)
+        await _session_call(state, "update_session", state)
+        return state
 
-        logger.info(f"✓ Details validated")
+    async def node_policy_decision(self, state: AgentState) -> AgentState:
+        """
+        NODE 6a: POLICY_DECISION
+        Decide escalation from the policy table, without the deep model.
+        Only reached when route_escalation_path found a matching rule.
+        """
+        logger.info(f"[NODE] policy_decision: Applying escalation policy table")
+
+        decision = escalation_policy.evaluate(state)
+        escalation_policy.record(decision)
+        escalation_policy.maybe_shadow_check(decision, self._escalation_state_data(state))
+
+        state.requires_escalation = decision.requires_escalation
+        state.escalation_reason = decision.reason
+        state.assigned_department = decision.department
+        state.system_metadata["escalation_path"] = f"policy:{decision.rule}"
+        self._apply_escalation_outcome(state)
+
+        await _session_call(state, "update_session", state)
         return state
 
-    def node_escalation_check(self, state: AgentState) -> AgentState:
+    async def node_escalation_check(self, state: AgentState) -> AgentState:
         """
-        NODE 5: ESCALATION_CHECK
+        NODE 6b: ESCALATION_CHECK
         Use Deep Path LLM to decide if escalation to human is needed.
         """
         logger.info(f"[NODE] escalation_check: Determining escalation need")
 
-        state_data = {
+        escalation_policy.record(None)
+        # Short on time: the fast model answers instead of the deep one
+        model = None
+        if call_budget.stage(state) == FAST:
+            model = sovereign_llm.fast_model
+            call_budget.count("fast_model")
+        state_data = self._escalation_state_data(state)
+        with profiler.span("llm:check_escalation_needed"):
+            decision = await call_budget.run_llm(
+                state,
+                lambda: sovereign_llm.acheck_escalation_needed(state_data, model=model),
+                lambda: dict(TEMPLATE_ESCALATION),
+                "escalation_check",
+            )
+
+        state.requires_escalation = decision.get("requires_escalation", False)
+        state.escalation_reason = decision.get("escalation_reason", "")
+        state.assigned_department = decision.get("assigned_department", "MCD")
+        state.system_metadata["escalation_path"] = "deep"
+        if escalation_policy.urgency_hint(state):
+            # Negative examples for the hazard list: how often a broad word was urgent
+            escalation_policy.record_hint_verdict(state.requires_escalation)
+        self._apply_escalation_outcome(state)
+
+        await _session_call(state, "update_session", state)
+        return state
+
+    @staticmethod
+    def _escalation_state_data(state: AgentState) -> Dict[str, Any]:
+        """Fields the deep model sees for an escalation decision."""
+        return {
             "category": state.grievance_category.value if state.grievance_category else "unknown",
             "description": state.grievance_description,
             "urgency": "HIGH" if state.confidence_score < 0.6 else "NORMAL",
             "previous_attempts": 0,
+            "conversation": state.transcript.prompt_context(),
         }
 
-        decision = sovereign_llm.check_escalation_needed(state_data)
-
-        state.requires_escalation = decision.get("requires_escalation", False)
-        state.escalation_reason = decision.get("escalation_reason", "")
-        state.assigned_department = decision.get("assigned_department", "MCD")
-
+    @staticmethod
+    def _apply_escalation_outcome(state: AgentState) -> None:
+        """Move the FSM to ESCALATED or RESOLVED from requires_escalation."""
         if state.requires_escalation:
             state.current_state = CallState.ESCALATED
             logger.warning(
@@ -202,12 +421,9 @@ class SovereignVoiceAIWorkflow:
             state.current_state = CallState.RESOLVED
             logger.info(f"✓ Auto-resolution possible")
 
-        memory_manager.update_session(state)
-        return state
-
-    def node_prepare_resolution(self, state: AgentState) -> AgentState:
+    async def node_prepare_resolution(self, state: AgentState) -> AgentState:
         """
-        NODE 6: PREPARE_RESOLUTION
+        NODE 7: PREPARE_RESOLUTION
         Prepare final response and ticket details.
         """
         logger.info(f"[NODE] prepare_resolution: Preparing resolution")
@@ -229,21 +445,31 @@ class SovereignVoiceAIWorkflow:
             timestamp=datetime.now().isoformat(),
         )
 
-        memory_manager.update_session(state)
+        await _session_call(state, "update_session", state)
 
         logger.info(f"✓ Resolution prepared")
         return state
 
-    def node_memory_wipe(self, state: AgentState) -> AgentState:
+    async def node_memory_wipe(self, state: AgentState) -> AgentState:
         """
-        NODE 7: MEMORY_WIPE
+        NODE 8: MEMORY_WIPE
         The critical final node - HARD DELETE all session data from Redis.
         This is your data sovereignty guarantee.
         """
         logger.info(f"[NODE] memory_wipe: Initiating data wipe sequence")
 
-        # This is the KEY NODE for Hack4Delhi judges
-        wipe_result = memory_manager.memory_wipe_node(state)
+        if call_budget.stage(state) == EXHAUSTED:
+            call_budget.count("forced_wipes")
+            logger.warning(f"⏱ Call budget spent, wiping {state.session_id} now")
+        transcript_summarizer.cancel(state.session_id)
+        speech_inputs.detach(state.session_id)
+
+        # This is the KEY NODE for Hack4Delhi judges.
+        # The cache flushes pending writes first so nothing escapes the wipe.
+        await _session_call(state, "end_call", state.session_id)
+        wipe_result = await _session_call(state, "memory_wipe_node", state)
+        # Drop graph checkpoints still being flushed for this call
+        await asyncio.to_thread(redis_checkpointer.mark_wiped, state.session_id)
 
         state.current_state = CallState.WIPED
 
@@ -255,6 +481,15 @@ class SovereignVoiceAIWorkflow:
 
         return state
 
+    def route_escalation_path(self, state: AgentState) -> str:
+        """
+        Routing logic after the parallel branches join.
+        "policy" if the policy table can decide this call, else "deep".
+        """
+        if escalation_policy.evaluate(state) is not None:
+            return "policy"
+        return "deep"
+
     def route_escalation(self, state: AgentState) -> str:
         """
         Routing logic for escalation decision.
@@ -265,29 +500,161 @@ class SovereignVoiceAIWorkflow:
         else:
             return "resolve"
 
-    def compile_graph(self):
-        """Compile the LangGraph workflow."""
-        return self.workflow.compile()
+    def compile_graph(self, checkpointer=None):
+        """
+        Compile the LangGraph workflow.
+        Checkpoints go to the RAM-only Redis checkpointer unless another is given.
+        """
+        return self.workflow.compile(checkpointer=checkpointer or redis_checkpointer)
+
+
+class TextGrievanceWorkflow(SovereignVoiceAIWorkflow):
+    """
+    The FSM for text grievances (src.batch_processor): the same nodes as a
+    call minus the validate_details branch, so a record keeps its own
+    contact fields and never gets the voice flow's mock phone / location.
+    """
+
+    parallel_branches = tuple(
+        branch
+        for branch in SovereignVoiceAIWorkflow.parallel_branches
+        if branch[0] != "validate_details"
+    )
 
 
-# Factory function to create and return the compiled workflow
+def call_config(session_id: str) -> Dict[str, Any]:
+    """Graph config for a call. The session id is the checkpoint thread id."""
+    return {"configurable": {"thread_id": session_id}}
+
+
+_compiled_graph = None
+_compiled_graph_lock = threading.Lock()
+
+
+def get_compiled_workflow():
+    """
+    Process-wide compiled graph. Building and compiling the StateGraph is
+    done once; every call shares it (per-call state lives in the checkpoint
+    thread, keyed by session_id).
+    """
+    global _compiled_graph
+    if _compiled_graph is None:
+        with _compiled_graph_lock:
+            if _compiled_graph is None:
+                _compiled_graph = SovereignVoiceAIWorkflow().compile_graph()
+                logger.info("✓ Workflow graph compiled")
+    return _compiled_graph
+
+
+async def _force_wipe(state: AgentState) -> Dict[str, Any]:
+    """Wipe a call whose graph was cancelled at its deadline."""
+    call_budget.count("overruns")
+    logger.error(f"⏱ Session {state.session_id} overran its call budget, forcing wipe")
+    transcript_summarizer.cancel(state.session_id)
+    speech_inputs.detach(state.session_id)
+    # The budget is spent: the forced wipe runs unbounded
+    await _session_call(None, "memory_wipe_node", state)
+    await asyncio.to_thread(redis_checkpointer.mark_wiped, state.session_id)
+    await asyncio.to_thread(redis_checkpointer.delete_thread, state.session_id)
+    profiler.finish_call(state.session_id)
+    return {
+        "session_id": state.session_id,
+        "current_state": CallState.WIPED,
+        "system_metadata": {"budget": "overrun"},
+    }
+
+
+async def _within_budget(state: AgentState, run: Awaitable[Any]) -> Any:
+    """Await a graph run, cancelling it and force-wiping at the call deadline."""
+    try:
+        return await asyncio.wait_for(run, timeout=call_budget.hard_timeout(state))
+    except asyncio.TimeoutError:
+        return await _force_wipe(state)
+
+
+async def run_call(state: AgentState, graph=None) -> Dict[str, Any]:
+    """
+    Run one call through the FSM, from initiate_call to memory_wipe.
+    The call gets its budget here; a graph still running at the deadline
+    is cancelled and the session force-wiped.
+
+    Returns:
+        Final graph state values
+    """
+    graph = graph or get_compiled_workflow()
+    call_budget.start(state)
+    session_cache.start()
+    return await _within_budget(state, graph.ainvoke(state, call_config(state.session_id)))
+
+
+async def stream_call(state: AgentState, graph=None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    run_call for streaming clients: yields the per-node updates of
+    astream(stream_mode="updates"). On overrun the stream ends with a
+    {"memory_wipe": ...} update from the forced wipe.
+    """
+    graph = graph or get_compiled_workflow()
+    call_budget.start(state)
+    session_cache.start()
+    updates = graph.astream(state, call_config(state.session_id), stream_mode="updates")
+    try:
+        while True:
+            try:
+                update = await asyncio.wait_for(
+                    updates.__anext__(), timeout=call_budget.hard_timeout(state)
+                )
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                yield {"memory_wipe": await _force_wipe(state)}
+                return
+            yield update
+    finally:
+        await updates.aclose()
+
+
+async def resume_call(session_id: str, graph=None) -> Optional[Dict[str, Any]]:
+    """
+    Continue an in-flight call from its latest checkpoint (e.g. on another
+    worker after a crash). Finished nodes are not re-run, so their LLM calls
+    are not repeated.
+
+    Returns:
+        Final graph state values, or None if no checkpoint exists (call
+        finished, was wiped, or its TTL expired)
+    """
+    graph = graph or get_compiled_workflow()
+    config = call_config(session_id)
+    snapshot = await graph.aget_state(config)
+    if not snapshot.next:
+        logger.warning(f"No resumable checkpoint for session {session_id}")
+        return None
+    logger.info(f"Resuming session {session_id} from its last checkpoint")
+    session_cache.start()
+    values = snapshot.values
+    state = AgentState(
+        session_id=session_id,
+        call_timestamp=values.get("call_timestamp", ""),
+        call_deadline=values.get("call_deadline", 0.0),
+    )
+    return await _within_budget(state, graph.ainvoke(None, config))
+
+
+# Factory function to return the compiled workflow
 def create_sovereign_voice_ai_workflow():
     """
-    Factory function to create the complete workflow graph.
+    Factory function returning the complete workflow graph.
 
     Returns:
-        Compiled LangGraph StateGraph ready for invocation
+        The process-wide compiled LangGraph StateGraph
+        (run with run_call / ainvoke(state, call_config(session_id)))
     """
-    wf = SovereignVoiceAIWorkflow()
-    return wf.compile_graph()
+    return get_compiled_workflow()
 
 
 if __name__ == "__main__":
     logger.info("Initializing MCD 311 Sovereign Voice AI Workflow...")
 
-    # Create the workflow
-    graph = create_sovereign_voice_ai_workflow()
-
     # Create a test session
     test_session = AgentState(
         session_id=f"test_{uuid.uuid4().hex[:8]}",
@@ -297,6 +664,6 @@ if __name__ == "__main__":
     logger.info(f"Starting test session: {test_session.session_id}")
 
     # Execute the workflow
-    result = graph.invoke(test_session)
+    result = asyncio.run(run_call(test_session))
 
-    logger.info(f"Workflow complete. Final state: {result.current_state.value}")
+    logger.info(f"Workflow complete. Final state: {result['current_state'].value}")
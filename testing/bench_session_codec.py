@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Session Codec Micro-Benchmark
+Compares the "hash" and "msgpack" session codecs on encode/decode time and
+bytes stored per session.
+
+USAGE:
+    python testing/bench_session_codec.py                  # payload bytes only
+    python testing/bench_session_codec.py --redis          # also ask Redis for MEMORY USAGE
+    python testing/bench_session_codec.py --iterations 50000 --turns 40
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent_state import AgentState, CallState, GrievanceCategory
+from src.session_codec import get_session_codec
+
+
+def build_sample_state(turns: int) -> AgentState:
+    """Build a representative mid-call session."""
+    state = AgentState(
+        session_id="bench0001",
+        call_timestamp=datetime.now().isoformat(),
+        call_duration_seconds=142.5,
+        citizen_phone="+91-9876543210",
+        citizen_name="Amit Singh",
+        citizen_location="Lajpat Nagar, Delhi",
+        citizen_language="hinglish",
+        grievance_category=GrievanceCategory.STREET_LIGHT,
+        grievance_description="Streetlight near my home hasn't worked for a month",
+        grievance_latitude=28.5677,
+        grievance_longitude=77.2433,
+        current_state=CallState.ESCALATION_CHECK,
+        confidence_score=0.93,
+        requires_escalation=True,
+        escalation_reason="Safety hazard at night",
+        assigned_department="MCD Electrical",
+        system_metadata={"worker": "ws-1", "llm_fast": "mistral"},
+        error_logs=["categorize: retry 1"],
+    )
+    for i in range(turns):
+        state.add_transcript_entry(
+            speaker="citizen" if i % 2 else "agent",
+            message=f"Turn {i}: the light near the market gate is still off.",
+            timestamp=datetime.now().isoformat(),
+            confidence=0.9,
+        )
+    return state
+
+
+def payload_bytes(payload) -> int:
+    """Approximate bytes of user data written to Redis for a payload."""
+    if isinstance(payload, bytes):
+        return len(payload)
+    return sum(len(str(k).encode()) + len(str(v).encode()) for k, v in payload.items())
+
+
+def time_it(fn, iterations: int) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def redis_memory_usage(codec, payload) -> int:
+    """Store the payload in Redis and return MEMORY USAGE for the key."""
+    import redis
+    from config.settings import settings
+
+    client = redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+    )
+    key = f"bench:codec:{codec.name}"
+    try:
+        if codec.binary:
+            client.set(key, payload, ex=60)
+        else:
+            client.hset(key, mapping=payload)
+            client.expire(key, 60)
+        return client.memory_usage(key, samples=0)
+    finally:
+        client.delete(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session codecs")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=12, help="Transcript entries per session")
+    parser.add_argument("--redis", action="store_true", help="Measure Redis MEMORY USAGE")
+    args = parser.parse_args()
+
+    state = build_sample_state(args.turns)
+
+    print(f"\nSession codec benchmark ({args.iterations} iterations, {args.turns} transcript turns)")
+    print("-" * 78)
+    header = f"{'codec':<10}{'lossless':>10}{'encode us':>12}{'decode us':>12}{'payload B':>12}"
+    if args.redis:
+        header += f"{'redis B':>12}"
+    print(header)
+
+    for name in ("hash", "msgpack"):
+        try:
+            codec = get_session_codec(name)
+        except RuntimeError as e:
+            print(f"{name:<10}  skipped: {e}")
+            continue
+
+        payload = codec.encode(state)
+        # The hash layout is read back as strings, as Redis would return it
+        stored = (
+            payload
+            if codec.binary
+            else {k: str(v) for k, v in payload.items()}
+        )
+
+        encode_us = time_it(lambda: codec.encode(state), args.iterations)
+        decode_us = time_it(lambda: codec.decode(stored), args.iterations)
+
+        lossless = "yes" if codec.decode(stored) == state else "no"
+
+        row = f"{name:<10}{lossless:>10}{encode_us:>12.2f}{decode_us:>12.2f}{payload_bytes(payload):>12}"
+        if args.redis:
+            row += f"{redis_memory_usage(codec, payload):>12}"
+        print(row)
+
+    print("-" * 78)
+    print("Note: the hash layout stores only transcript_count, not the transcript itself.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Session Memory Benchmark
+Bytes of worker RAM per live session: the slotted AgentState with its
+columnar Transcript versus the previous layout (a regular dataclass with a
+__dict__ and a list of 4-key dicts as transcript).
+
+USAGE:
+    python testing/bench_session_memory.py
+    python testing/bench_session_memory.py --sessions 5000 --turns 40
+    python testing/bench_session_memory.py --window 12   # with the bounded transcript window
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.agent_state import AgentState, CallState, GrievanceCategory
+
+# The previous AgentState: same fields, no slots, transcript as a list of dicts
+LegacyAgentState = dataclasses.make_dataclass(
+    "LegacyAgentState",
+    [
+        (f.name, f.type, f)
+        if f.name != "transcript"
+        else (f.name, List[Dict[str, Any]], dataclasses.field(default_factory=list))
+        for f in dataclasses.fields(AgentState)
+    ],
+)
+
+SPEAKERS = ("system", "citizen", "agent")
+
+
+def turns_for(session_no: int, turns: int):
+    """Distinct per-session turns, as a live worker would hold them."""
+    start = datetime(2026, 1, 1) + timedelta(seconds=session_no)
+    for i in range(turns):
+        yield (
+            SPEAKERS[i % 3],
+            f"Session {session_no} turn {i}: the light near the market gate is still off.",
+            (start + timedelta(seconds=i, microseconds=i * 137)).isoformat(),
+            0.9,
+        )
+
+
+def build_current(session_no: int, turns: int) -> AgentState:
+    state = AgentState(
+        session_id=f"bench{session_no:06d}",
+        call_timestamp=datetime.now().isoformat(),
+        citizen_phone="+91-9876543210",
+        citizen_location="Lajpat Nagar, Delhi",
+        grievance_category=GrievanceCategory.STREET_LIGHT,
+        grievance_description="Streetlight near my home hasn't worked for a month",
+        current_state=CallState.PROCESSING,
+        confidence_score=0.93,
+    )
+    for speaker, message, timestamp, confidence in turns_for(session_no, turns):
+        state.add_transcript_entry(speaker, message, timestamp, confidence)
+    return state
+
+
+def build_legacy(session_no: int, turns: int):
+    state = LegacyAgentState(
+        session_id=f"bench{session_no:06d}",
+        call_timestamp=datetime.now().isoformat(),
+        citizen_phone="+91-9876543210",
+        citizen_location="Lajpat Nagar, Delhi",
+        grievance_category=GrievanceCategory.STREET_LIGHT,
+        grievance_description="Streetlight near my home hasn't worked for a month",
+        current_state=CallState.PROCESSING,
+        confidence_score=0.93,
+    )
+    for speaker, message, timestamp, confidence in turns_for(session_no, turns):
+        state.transcript.append(
+            {
+                "timestamp": timestamp,
+                "speaker": speaker,
+                "message": message,
+                "confidence": confidence,
+            }
+        )
+    return state
+
+
+def bytes_per_session(build: Callable[[int, int], Any], sessions: int, turns: int) -> float:
+    """Traced allocations held by `sessions` live sessions, per session."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    live = [build(i, turns) for i in range(sessions)]
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del live
+    return held / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAM per live session")
+    parser.add_argument("--sessions", type=int, default=2000, help="Live sessions to hold")
+    parser.add_argument(
+        "--turns", type=int, nargs="+", default=[4, 12, 40], help="Transcript entries per session"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=0,
+        help="Transcript window (TRANSCRIPT_WINDOW_TURNS); 0 compares layouts only",
+    )
+    args = parser.parse_args()
+    settings.TRANSCRIPT_WINDOW_TURNS = args.window
+
+    window = f", window {args.window} turns" if args.window else ""
+    print(f"\nSession memory benchmark ({args.sessions} live sessions{window})")
+    print("-" * 64)
+    print(f"{'turns':>6}{'legacy B/session':>20}{'current B/session':>20}{'saved':>10}")
+    for turns in args.turns:
+        legacy = bytes_per_session(build_legacy, args.sessions, turns)
+        current = bytes_per_session(build_current, args.sessions, turns)
+        saved = 1 - current / legacy
+        print(f"{turns:>6}{legacy:>20,.0f}{current:>20,.0f}{saved:>10.0%}")
+    print("-" * 64)
+    if args.window:
+        print("Turns beyond the window are held only until folded into the summary.")
+    else:
+        print("Message text is identical in both layouts; the saving is per-object overhead.")
+
+
+if __name__ == "__main__":
+    main()
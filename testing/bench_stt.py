@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Speech-to-Text Benchmark
+Real-time factor (decoding time / audio duration) and word error rate of
+the local STT engine on the bundled sample set (testing/stt_samples).
+
+Each sample in manifest.jsonl has a reference text. If its "audio" WAV is
+missing, the sample is rendered with the local TTS engine first, so the
+set works without recordings. The bundled set has no recordings: its
+numbers are a TTS -> STT round trip and are reported as "synthetic WER".
+Drop real caller recordings (16-bit mono WAV, with consent) next to the
+manifest for a realistic WER; they are reported separately.
+
+Two passes per sample:
+- offline:    the whole utterance decoded at once (AudioProcessor.speech_to_text)
+- streaming:  fed in --chunk-ms chunks through StreamingRecognizer, as a call is
+
+USAGE:
+    python testing/bench_stt.py
+    python testing/bench_stt.py --model base --chunk-ms 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import unicodedata
+import wave
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stt_samples")
+
+
+def normalize(text: str):
+    """Lower-case words without punctuation or symbols. Combining marks
+    (Devanagari vowel signs, virama) are letters here, not separators."""
+    return "".join(
+        " " if unicodedata.category(ch)[0] in "PS" and ch != "'" else ch for ch in text.lower()
+    ).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance / reference length."""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_audio(sample, tts_engines) -> Tuple[np.ndarray, bool]:
+    """16 kHz float32 audio for a sample, and whether it is synthetic (rendered by the local TTS)."""
+    from src.audio_frames import Codec
+    from src.stt_engine import to_float32
+
+    path = os.path.join(SAMPLES_DIR, sample.get("audio", f"{sample['id']}.wav"))
+    if os.path.exists(path):
+        with wave.open(path, "rb") as wav:
+            audio = to_float32(wav.readframes(wav.getnframes()), Codec.PCM16, wav.getframerate())
+            return audio, False
+
+    language = sample.get("language", "en")
+    if language not in tts_engines:
+        from src.tts_engines import get_tts_engine
+
+        engine = get_tts_engine("auto")
+        tts_engines[language] = type(engine)(voice=language) if language != "en" else engine
+    audio = tts_engines[language].synthesize(sample["text"])
+    return to_float32(audio.data, Codec.PCM16, audio.sample_rate), True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local STT: RTF and WER")
+    parser.add_argument("--model", default=None, help="Whisper model (default: STT_MODEL)")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Streaming chunk size")
+    args = parser.parse_args()
+    if args.model:
+        settings.STT_MODEL = args.model
+
+    from src.stt_engine import SAMPLE_RATE, StreamingRecognizer, stt_engine
+
+    with open(os.path.join(SAMPLES_DIR, "manifest.jsonl"), encoding="utf-8") as handle:
+        samples = [json.loads(line) for line in handle if line.strip()]
+
+    stt_engine.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))  # Load the model
+    tts_engines = {}
+    chunk = int(SAMPLE_RATE * args.chunk_ms / 1000)
+
+    print(f"\nSTT benchmark: {settings.STT_MODEL} ({settings.STT_COMPUTE_TYPE}), "
+          f"{settings.STT_CPU_THREADS} threads, {len(samples)} samples")
+    print("-" * 79)
+    print(f"{'sample':<12}{'source':>7}{'audio s':>9}{'offline RTF':>13}{'stream RTF':>12}"
+          f"{'WER':>8}{'stream WER':>12}")
+    offline_rtf, stream_rtf, offline_wer, stream_wer, synthetic = [], [], [], [], []
+    for sample in samples:
+        audio, is_synthetic = load_audio(sample, tts_engines)
+        synthetic.append(is_synthetic)
+        seconds = audio.size / SAMPLE_RATE
+
+        start = time.perf_counter()
+        offline = stt_engine.transcribe_text(audio)
+        offline_rtf.append((time.perf_counter() - start) / seconds)
+        offline_wer.append(word_error_rate(sample["text"], offline.text))
+
+        recognizer = StreamingRecognizer()
+        for offset in range(0, audio.size, chunk):
+            recognizer.accept(audio[offset : offset + chunk])
+        final = recognizer.finish()
+        stream_rtf.append(recognizer.compute_seconds / seconds)
+        stream_wer.append(word_error_rate(sample["text"], final.text))
+
+        print(f"{sample['id']:<12}{'tts' if is_synthetic else 'wav':>7}{seconds:>9.1f}"
+              f"{offline_rtf[-1]:>13.3f}{stream_rtf[-1]:>12.3f}"
+              f"{offline_wer[-1]:>8.1%}{stream_wer[-1]:>12.1%}")
+    print("-" * 79)
+    print(f"{'mean':<12}{'':>7}{'':>9}{statistics.mean(offline_rtf):>13.3f}"
+          f"{statistics.mean(stream_rtf):>12.3f}")
+    # WER of TTS-rendered speech says little about callers: keep it apart
+    for label, wanted in (("synthetic WER", True), ("recorded WER", False)):
+        picked = [i for i, flag in enumerate(synthetic) if flag is wanted]
+        if picked:
+            print(f"{label:<28}{'':>25}"
+                  f"{statistics.mean(offline_wer[i] for i in picked):>8.1%}"
+                  f"{statistics.mean(stream_wer[i] for i in picked):>12.1%}"
+                  f"  ({len(picked)} samples)")
+    if all(synthetic):
+        print("\nAll samples were rendered by the local TTS: synthetic WER, not caller speech.")
+
+    # Each stream keeps STT_CPU_THREADS busy for RTF of its wall time
+    cores = os.cpu_count() or 1
+    per_stream = statistics.mean(stream_rtf) * settings.STT_CPU_THREADS
+    print(f"\n≈ {cores / per_stream:.0f} concurrent streaming calls on {cores} cores"
+          if per_stream else "")
+
+
+if __name__ == "__main__":
+    main()
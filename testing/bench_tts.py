@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+TTS Engine Benchmark
+Real-time factor (synthesis time / audio duration, lower is better) and
+first-audio latency of each TTS engine on the agent's own prompts.
+
+First audio is measured two ways:
+- whole:     the full utterance is synthesized before anything plays
+             (AudioProcessor.text_to_speech)
+- sentence:  the first sentence is synthesized on its own (synthesize_sentences)
+
+gtts is the previous network path and needs internet access; engines that
+are not installed are skipped.
+
+USAGE:
+    python testing/bench_tts.py
+    python testing/bench_tts.py --engines espeak gtts --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tts_engines import _ENGINES, get_tts_engine
+
+PROMPTS = [
+    "Namaste, welcome to the MCD 311 helpline. Please tell me your grievance.",
+    "I have registered your complaint about the street light. "
+    "An officer from MCD Electrical will visit within forty eight hours.",
+    "Your complaint has been escalated to a senior officer because it is a safety hazard. "
+    "You will receive an SMS with the reference number. Thank you for calling.",
+]
+
+
+def bench_engine(engine, runs: int):
+    whole_ms, first_ms, rtf = [], [], []
+    for _ in range(runs):
+        for text in PROMPTS:
+            start = time.perf_counter()
+            audio = engine.synthesize(text)
+            elapsed = time.perf_counter() - start
+            whole_ms.append(elapsed * 1000)
+            rtf.append(elapsed / audio.duration_seconds)
+
+            start = time.perf_counter()
+            next(engine.synthesize_sentences(text))
+            first_ms.append((time.perf_counter() - start) * 1000)
+    return statistics.median(rtf), statistics.median(whole_ms), statistics.median(first_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS engines")
+    parser.add_argument("--engines", nargs="+", default=list(_ENGINES), help="Engines to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the prompt set")
+    args = parser.parse_args()
+
+    print(f"\nTTS benchmark ({len(PROMPTS)} prompts x {args.runs} runs, medians)")
+    print("-" * 70)
+    print(f"{'engine':<10}{'local':>7}{'RTF':>8}{'first audio (whole)':>22}{'(sentence)':>14}")
+    for name in args.engines:
+        try:
+            engine = get_tts_engine(name)
+            engine.synthesize("Warm up.")
+        except Exception as e:
+            print(f"{name:<10}  skipped: {e}")
+            continue
+        rtf, whole_ms, first_ms = bench_engine(engine, args.runs)
+        local = "yes" if engine.local else "no"
+        print(f"{name:<10}{local:>7}{rtf:>8.3f}{whole_ms:>19.0f} ms{first_ms:>11.0f} ms")
+    print("-" * 70)
+    print("RTF below 1.0 means audio is produced faster than it plays.")
+
+
+if __name__ == "__main__":
+    main()
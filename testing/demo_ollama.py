@@ -11,29 +11,10 @@ import json
 import time
 from datetime import datetime
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Mock Redis for demo (in-memory storage)
-class MockRedis:
-    def __init__(self):
-        self.data = {}
-    
-    def set(self, key, value, ex=None):
-        self.data[key] = value
-    
-    def get(self, key):
-        return self.data.get(key)
-    
-    def delete(self, *keys):
-        for key in keys:
-            if key in self.data:
-                del self.data[key]
-    
-    def keys(self, pattern='*'):
-        return list(self.data.keys())
-    
-    def flush_all(self):
-        self.data.clear()
+# In-process store with real TTL expiry (no Redis server needed)
+from src.session_store import InProcessStore
 
 
 def print_header(text: str):
@@ -97,9 +78,9 @@ def demo():
     print(f"    Fast Path:  {fast_model}")
     print(f"    Deep Path:  {deep_model}")
     
-    # Mock Redis
-    redis = MockRedis()
-    print(f"\n  ✓ Mock Redis initialized (in-memory)")
+    # In-process store (same TTL semantics as Redis)
+    redis = InProcessStore()
+    print(f"\n  ✓ In-process store initialized (in-memory)")
 
     print_section("PHASE 1: CITIZEN CALL INTAKE")
     
@@ -13,7 +13,9 @@ import subprocess
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.session_store import InProcessStore
 
 
 class AutoRedis:
@@ -23,7 +25,7 @@ class AutoRedis:
         self.host = host
         self.port = port
         self.connected = False
-        self.in_memory = {}  # Fallback
+        self.in_memory = InProcessStore()  # Fallback with real TTL expiry
         
         try:
             import redis
@@ -43,9 +45,9 @@ class AutoRedis:
             try:
                 self.redis.set(key, value, ex=ex)
             except:
-                self.in_memory[key] = value
+                self.in_memory.set(key, value, ex=ex)
         else:
-            self.in_memory[key] = value
+            self.in_memory.set(key, value, ex=ex)
     
     def get(self, key):
         if self.connected:
@@ -60,21 +62,17 @@ class AutoRedis:
             try:
                 self.redis.delete(*keys)
             except:
-                for k in keys:
-                    if k in self.in_memory:
-                        del self.in_memory[k]
+                self.in_memory.delete(*keys)
         else:
-            for k in keys:
-                if k in self.in_memory:
-                    del self.in_memory[k]
+            self.in_memory.delete(*keys)
     
     def keys(self, pattern='*'):
         if self.connected:
             try:
                 return list(self.redis.keys(pattern))
             except:
-                return list(self.in_memory.keys())
-        return list(self.in_memory.keys())
+                return self.in_memory.keys(pattern)
+        return self.in_memory.keys(pattern)
 
 
 class ProductionOllama:
@@ -14,7 +14,7 @@ import subprocess
 from datetime import datetime
 from typing import Optional
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def get_available_model():
@@ -60,21 +60,9 @@ def get_redis():
         r.ping()
         return r
     except:
-        # Return dict-based mock
-        class MockRedis:
-            def __init__(self):
-                self.data = {}
-            def set(self, k, v, ex=None):
-                self.data[k] = v
-            def get(self, k):
-                return self.data.get(k)
-            def delete(self, *keys):
-                for k in keys:
-                    if k in self.data:
-                        del self.data[k]
-            def keys(self, pattern='*'):
-                return list(self.data.keys())
-        return MockRedis()
+        # Fall back to the in-process store (same TTL semantics as Redis)
+        from src.session_store import InProcessStore
+        return InProcessStore()
 
 
 def print_header(text):
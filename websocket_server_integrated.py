@@ -7,6 +7,7 @@ import asyncio
 import json
 import uuid
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional, Set
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -19,11 +20,22 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config.settings import Settings
-from src.memory_manager import MemoryManager
-from src.llm_integration import SovereignLLM
-from src.workflow import SovereignVoiceAIWorkflow
+from src.memory_manager import memory_manager
+from src.llm_integration import sovereign_llm as llm
+from src.workflow import get_compiled_workflow, stream_call
+from src.escalation_policy import escalation_policy
+from src.profiling import profiler
+from src.call_budget import call_budget
 from src.agent_state import AgentState, CallState
 from src.audio_processor import audio_processor
+from src.synthesis_service import EXPLANATION, GREETING, PROMPT, synthesis_service
+from src.phrase_cache import CITIZEN_FIELDS, FIXED_PROMPTS, phrase_cache
+from src.clip_splicer import clip_library, split_identifiers
+from src.audio_frames import Codec, FrameError, decode_frame, encode_frame
+from src.stt_engine import Hypothesis, speech_inputs, stt_engine
+from src.stt_pool import stt_pool
+from src.opus_codec import FRAME_MS, frame_audio, negotiate, opus_available, output_codecs
+from src.vad import vad_stats
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -38,7 +50,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="MCD 311 WebSocket Server (Integrated)", version="1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fixed prompts are synthesized once, before the first call
+    await phrase_cache.prerender()
+    await clip_library.prerender()
+    # Speech is decoded in worker processes, one per STT_CPU_THREADS cores at most
+    if settings.STT_PROCESS_POOL and stt_engine.available():
+        stt_pool.start()
+        speech_inputs.pool = stt_pool
+    yield
+    speech_inputs.pool = None
+    stt_pool.shutdown()
+
+
+app = FastAPI(title="MCD 311 WebSocket Server (Integrated)", version="1.0", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -49,11 +75,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
+# Initialize services (one compiled graph drives every call on this event loop)
 settings = Settings()
-memory_manager = MemoryManager()
-llm = SovereignLLM()
-workflow = SovereignVoiceAIWorkflow()
+workflow = get_compiled_workflow()
+
+# Fields counted by the sovereignty meter
+CITIZEN_DATA_FIELDS = (
+    "citizen_name",
+    "citizen_phone",
+    "citizen_location",
+    "grievance_description",
+    "grievance_category",
+    "assigned_department",
+)
 
 
 class StreamingConnectionManager:
@@ -62,6 +96,8 @@ class StreamingConnectionManager:
     def __init__(self):
         self.active_connections: dict[str, WebSocket] = {}
         self.session_states: dict[str, dict] = {}
+        # Audio bytes of calls that have ended (live calls are in session_states)
+        self.bandwidth_totals = {"calls": 0, "audio_bytes_in": 0, "audio_bytes_out": 0}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
@@ -71,14 +107,80 @@ class StreamingConnectionManager:
             "state": CallState.INITIATED,
             "agent_state": None,
             "data_count": 0,
+            "audio_out_seq": 0,  # Next outbound audio frame
+            "audio_in_seq": -1,  # Last inbound audio frame
+            "audio_in_frames": 0,
+            "audio_in_lost": 0,  # Sequence gaps in inbound audio
+            "audio_in_rejected": 0,  # Frames not in the negotiated codec
+            "audio_out_codec": Codec.WAV,  # Until the client negotiates
+            "audio_in_codec": Codec.PCM16,
+            "audio_in_negotiated": False,  # Until then any raw PCM is taken
+            "audio_bytes_in": 0,  # Audio frames on the wire, headers included
+            "audio_bytes_out": 0,
         }
         logger.info(f"[CONNECTED] Session {session_id} connected")
+        # The client stamps its audio frames with this id, and picks codecs from these
+        await self.send_chunk(
+            session_id,
+            "session_started",
+            session=session_id,
+            outbound_codecs=[codec.name.lower() for codec in self.outbound_codecs()],
+            inbound_codecs=[codec.name.lower() for codec in self.inbound_codecs()],
+        )
+
+    @staticmethod
+    def outbound_codecs() -> list:
+        return output_codecs()
+
+    @staticmethod
+    def inbound_codecs() -> list:
+        return ([Codec.OPUS] if opus_available() else []) + [Codec.PCM_F32, Codec.PCM16]
+
+    async def handle_control(self, session_id: str, text: str):
+        """
+        JSON control message from the client. Codec negotiation:
+            client: {"type": "negotiate", "codecs": ["opus", "pcm16", "wav"]}  (preferred first)
+            server: {"type": "codec", "outbound": "opus", "inbound": "opus", ...}
+        """
+        call = self.session_states.get(session_id)
+        try:
+            message = json.loads(text)
+        except ValueError:
+            logger.warning(f"Dropped malformed control message from {session_id}")
+            return
+        if call is None or not isinstance(message, dict) or message.get("type") != "negotiate":
+            logger.debug(f"Control message from {session_id}: {text[:100]}")
+            return
+        offered = message.get("codecs") or []
+        call["audio_out_codec"] = negotiate(offered, self.outbound_codecs())
+        call["audio_in_codec"] = negotiate(offered, self.inbound_codecs())
+        call["audio_in_negotiated"] = True
+        logger.info(
+            f"Session {session_id} audio: {call['audio_out_codec'].name} out, "
+            f"{call['audio_in_codec'].name} in"
+        )
+        await self.send_chunk(
+            session_id,
+            "codec",
+            outbound=call["audio_out_codec"].name.lower(),
+            inbound=call["audio_in_codec"].name.lower(),
+            outbound_bitrate=settings.OPUS_BITRATE_OUT,
+            inbound_bitrate=settings.OPUS_BITRATE_IN,
+            frame_ms=FRAME_MS,
+        )
 
     def disconnect(self, session_id: str):
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
-        if session_id in self.session_states:
-            del self.session_states[session_id]
+        # Nobody is left to hear the queued prompts, or to speak
+        synthesis_service.cancel_session(session_id)
+        speech_inputs.detach(session_id)
+        if session_id not in self.active_connections:
+            return
+        del self.active_connections[session_id]
+        call = self.session_states.pop(session_id, None)
+        if call is not None:
+            self.bandwidth_totals["calls"] += 1
+            self.bandwidth_totals["audio_bytes_in"] += call["audio_bytes_in"]
+            self.bandwidth_totals["audio_bytes_out"] += call["audio_bytes_out"]
         logger.info(f"[DISCONNECTED] Session {session_id} disconnected")
 
     async def send_chunk(
@@ -111,9 +213,121 @@ class StreamingConnectionManager:
             text=text,
         )
 
-    async def send_audio_chunk(self, session_id: str, audio_base64: str):
-        """Send audio chunk."""
-        await self.send_chunk(session_id, "audio_chunk", audio=audio_base64)
+    async def send_audio_chunk(
+        self, session_id: str, audio: bytes, codec: Codec = Codec.WAV, sample_rate: int = 0
+    ):
+        """
+        Send audio as a binary frame (see src/audio_frames.py), as it is:
+        callers encode it for the call's audio_out_codec (see frame_audio).
+        """
+        websocket = self.active_connections.get(session_id)
+        call = self.session_states.get(session_id)
+        if websocket is None or call is None:
+            return
+        sequence = call["audio_out_seq"]
+        call["audio_out_seq"] += 1
+        frame = encode_frame(session_id, sequence, codec, audio, sample_rate)
+        call["audio_bytes_out"] += len(frame)
+        try:
+            await websocket.send_bytes(frame)
+        except Exception as e:
+            logger.error(f"Error sending audio to {session_id}: {e}")
+
+    async def handle_audio_frame(self, session_id: str, message: bytes):
+        """
+        Inbound (microphone) audio frame. The payload is a view into the
+        message: anything kept past this call must be copied.
+        """
+        call = self.session_states.get(session_id)
+        if call is None:
+            return
+        call["audio_bytes_in"] += len(message)
+        try:
+            frame = decode_frame(message)
+        except FrameError as e:
+            logger.warning(f"Dropped audio frame from {session_id}: {e}")
+            return
+        if frame.session_id and frame.session_id != session_id:
+            logger.warning(f"Dropped audio frame for another session on {session_id}")
+            return
+        expected = call["audio_in_seq"] + 1
+        if frame.sequence > expected:
+            call["audio_in_lost"] += frame.sequence - expected
+        call["audio_in_seq"] = max(call["audio_in_seq"], frame.sequence)
+        call["audio_in_frames"] += 1
+        if frame.codec != call["audio_in_codec"] and (
+            call["audio_in_negotiated"] or frame.codec not in (Codec.PCM16, Codec.PCM_F32)
+        ):
+            call["audio_in_rejected"] += 1
+            if call["audio_in_rejected"] == 1:
+                logger.warning(
+                    f"Dropping {frame.codec.name} audio from {session_id}: "
+                    f"negotiated {call['audio_in_codec'].name}"
+                )
+            return
+
+        speech_input = speech_inputs.get(session_id)
+        if speech_input is not None:
+            try:
+                await speech_input.feed(frame.payload, frame.codec, frame.sample_rate)
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"Dropped audio frame from {session_id}: {e}")
+
+    async def send_hypothesis(self, session_id: str, hypothesis: Hypothesis):
+        """Live caption of what the caller is saying."""
+        await self.send_chunk(
+            session_id,
+            "transcript",
+            text=hypothesis.text,
+            final=hypothesis.is_final,
+            confidence=hypothesis.confidence,
+        )
+
+    async def speak(
+        self, session_id: str, text: str, priority: int = PROMPT, cacheable: bool = False
+    ):
+        """
+        Send the audio for text: from the phrase cache, or synthesized on the pool.
+        cacheable marks text built only from non-citizen values.
+        """
+        call = self.session_states.get(session_id) or {}
+        agent_state = call.get("agent_state") or {}
+        try:
+            rendered = await phrase_cache.render(
+                text,
+                priority,
+                session_id=session_id,
+                cacheable=cacheable,
+                citizen_values=[agent_state.get(name) for name in CITIZEN_FIELDS],
+                codec=call.get("audio_out_codec", Codec.WAV),
+            )
+        except Exception as e:
+            logger.error(f"TTS Error: {e}")
+            return
+        if rendered:
+            codec, audio = rendered
+            await self.send_audio_chunk(session_id, audio, codec)
+
+    async def speak_spliced(self, session_id: str, text: str, priority: int = PROMPT):
+        """
+        Speak text whose identifiers (ticket ids, references) are spliced from
+        pre-rendered clips. Falls back to plain TTS if the text cannot be spliced.
+        """
+        try:
+            audio = await clip_library.compose(
+                split_identifiers(text), priority=priority, session_id=session_id
+            )
+        except Exception as e:
+            logger.error(f"Clip splice error: {e}")
+            audio = None
+        if audio is None:
+            await self.speak(session_id, text, priority)
+            return
+        call = self.session_states.get(session_id) or {}
+        codec, payload = await synthesis_service.run(
+            frame_audio, audio, call.get("audio_out_codec", Codec.WAV)
+        )
+        await self.send_audio_chunk(session_id, payload, codec)
 
     async def send_data_count(self, session_id: str, count: int):
         """Send data point count for sovereignty meter."""
@@ -137,179 +351,157 @@ class StreamingConnectionManager:
 manager = StreamingConnectionManager()
 
 
-@app.websocket("/ws/call")
-async def websocket_endpoint(websocket: WebSocket):
-    """
-    Main WebSocket endpoint for real call processing.
-    Integrates with Python backend for actual LLM inference.
-    """
-    session_id = str(uuid.uuid4())[:8]
-
-    try:
-        await manager.connect(websocket, session_id)
-
-        # Simulate citizen call scenario
-        # In production: would receive audio stream and transcribe
+async def stream_node_update(session_id: str, node: str, state: dict):
+    """Map one workflow node update onto UI chunks."""
+    call = manager.session_states.get(session_id)
+    if call is None:
+        return
+    call["agent_state"] = {**(call["agent_state"] or {}), **state}
+    state = call["agent_state"]
+    call["state"] = state.get("current_state", call["state"])
 
-        # PHASE 1: Call Initiated
-        greeting_text = "MCD 311 Grievance Redressal System. Please state your emergency or grievance."
-        await manager.send_audio_chunk(session_id, audio_processor.text_to_speech(greeting_text))
-        
+    if node == "initiate_call":
+        await manager.speak(session_id, FIXED_PROMPTS["greeting"], GREETING, cacheable=True)
         # Play beep to indicate ready for input
-        audio_processor.play_status_beep('start')
-        
+        await asyncio.to_thread(audio_processor.play_status_beep, "start")
         await manager.send_text_chunk(
-            session_id,
-            "intent",
-            "Call Type",
-            "Grievance Registration - Street Light Issue",
+            session_id, "intent", "Call Type", "Grievance Registration"
         )
-        await asyncio.sleep(0.5)
 
-        # PHASE 2: Get initial agent state
-        agent_state = AgentState(
-            session_id=session_id,
-            current_state=CallState.LISTENING,
-            call_timestamp=datetime.now().isoformat(),
-            citizen_name="Amit Singh",
-            citizen_phone="+91-9876543210",
-            citizen_location="Lajpat Nagar, Delhi",
-            grievance_description="Streetlight near my home hasn't worked for a month",
+    elif node == "listen_grievance":
+        if state.get("citizen_name"):
+            await manager.send_text_chunk(
+                session_id, "entity", "Citizen", state["citizen_name"]
+            )
+        await manager.send_text_chunk(
+            session_id, "entity", "Grievance", state.get("grievance_description", "")
         )
+        await asyncio.to_thread(audio_processor.play_status_beep, "processing")
 
-        # Store in Redis
+    elif node == "categorize":
+        category = state.get("grievance_category")
+        category_name = category.value.upper() if category else "OTHER"
+        confidence = state.get("confidence_score", 0.0)
         await manager.send_text_chunk(
-            session_id, "entity", "Citizen", agent_state.citizen_name
+            session_id, "action", "Category", f"{category_name} ({confidence})"
+        )
+        await manager.speak(
+            session_id,
+            f"Categorized as {category_name} with {int(confidence * 100)}% confidence.",
+            cacheable=True,
         )
-        await manager.send_data_count(session_id, 2)
-        await asyncio.sleep(0.3)
 
+    elif node == "validate_details":
         await manager.send_text_chunk(
-            session_id, "entity", "Location", agent_state.citizen_location
+            session_id, "entity", "Location", state.get("citizen_location", "")
         )
-        await manager.send_data_count(session_id, 3)
-        await asyncio.sleep(0.3)
-
-        # PHASE 3: LLM Categorization (Fast Path)
-        # Play processing beep
-        audio_processor.play_status_beep('processing')
-        await asyncio.sleep(0.5)
-
-        # Call LLM for categorization
-        try:
-            category_result = await asyncio.to_thread(
-                llm.categorize_grievance, agent_state.grievance_description
-            )
-            
-            cat_text = f"Categorized as {category_result.get('category', 'Grievance')} with {int(category_result.get('confidence', 0.95)*100)}% confidence."
-            await manager.send_audio_chunk(session_id, audio_processor.text_to_speech(cat_text))
-
-            await manager.send_text_chunk(
-                session_id,
-                "action",
-                "Category",
-                f"{category_result.get('category', 'STREET_LIGHT')} ({category_result.get('confidence', 0.95)})",
-            )
-            await manager.send_data_count(session_id, 4)
-        except Exception as e:
-            logger.warning(f"LLM categorization failed: {e}, using mock")
-            await manager.send_text_chunk(
-                session_id,
-                "action",
-                "Category",
-                "STREET_LIGHT (Confidence: 0.97)",
-            )
-            await manager.send_data_count(session_id, 4)
 
-        await asyncio.sleep(0.5)
-
-        # PHASE 4: Escalation Decision (Deep Path)
-        try:
-            escalation = await asyncio.to_thread(
-                llm.check_escalation_needed,
-                agent_state.grievance_description,
-                "STREET_LIGHT",
-            )
-
-            priority = (
-                "HIGH"
-                if escalation.get("requires_escalation", True)
-                else "ROUTINE"
-            )
-            
-            prio_text = f"Priority determined as {priority}. {escalation.get('reason', '')}"
-            await manager.send_audio_chunk(session_id, audio_processor.text_to_speech(prio_text))
-
-            await manager.send_text_chunk(
-                session_id,
-                "action",
-                "Priority",
-                f"{priority} - {escalation.get('reason', 'Safety hazard')}",
-            )
-        except Exception as e:
-            logger.warning(f"Escalation check failed: {e}, using mock")
-            await manager.send_text_chunk(
-                session_id,
-                "action",
-                "Priority",
-                "HIGH - Safety hazard, immediate attention",
-            )
-
-        await manager.send_data_count(session_id, 5)
-        await asyncio.sleep(0.5)
+    elif node in ("policy_decision", "escalation_check"):
+        priority = "HIGH" if state.get("requires_escalation") else "ROUTINE"
+        reason = state.get("escalation_reason") or state.get("assigned_department", "")
+        await manager.send_text_chunk(
+            session_id, "action", "Priority", f"{priority} - {reason}"
+        )
+        # Policy-table reasons are fixed text; the deep model's may quote the citizen
+        path = state.get("system_metadata", {}).get("escalation_path", "")
+        from_policy = path.startswith("policy")
+        await manager.speak(
+            session_id, f"Priority determined as {priority}. {reason}", cacheable=from_policy
+        )
 
-        # Create ticket
-        ticket_id = "MCD-2026-55823"
+    elif node == "prepare_resolution":
+        ticket_id = f"MCD-{datetime.now().year}-{session_id[:8].upper()}"
         await manager.send_text_chunk(
             session_id, "action", "Ticket Created", ticket_id
         )
-        await manager.send_audio_chunk(session_id, audio_processor.text_to_speech(f"Ticket created. ID is {ticket_id}. Initiating memory wipe."))
-
-        await manager.send_data_count(session_id, 6)
-        await asyncio.sleep(1)
-
-        # PHASE 5: MEMORY WIPE - The star of the show
+        transcript = state.get("transcript") or []
+        resolution = transcript[-1]["message"] if transcript else ""
+        await manager.speak_spliced(
+            session_id,
+            f"{resolution} Ticket ID is {ticket_id}. Initiating memory wipe.",
+            EXPLANATION,
+        )
+        # memory_wipe is the next (and final) node
         await manager.send_wipe_notification(session_id, "memory_wipe_start")
-        await asyncio.sleep(0.5)
-
-        # Delete data point by point
-        for remaining in range(5, -1, -1):
-            await manager.send_data_count(session_id, remaining)
-            await asyncio.sleep(0.15)
-
-        # Call actual memory_wipe_node
-        try:
-            cleared_state = await asyncio.to_thread(
-                memory_manager.memory_wipe_node, agent_state
-            )
-            logger.info(
-                f"Session {session_id}: Memory wiped successfully. Remaining keys: {cleared_state.get('remaining_keys', 0)}"
-            )
-        except Exception as e:
-            logger.error(f"Memory wipe error: {e}")
 
+    elif node == "memory_wipe":
+        await manager.send_data_count(session_id, 0)
         await manager.send_wipe_notification(session_id, "memory_wipe_complete")
-
-        # PHASE 6: Verification
-        await asyncio.sleep(0.5)
         await manager.send_text_chunk(
             session_id,
             "action",
             "Verification",
             "[SUCCESS] All citizen data permanently deleted",
         )
-
-        await asyncio.sleep(0.5)
         await manager.send_text_chunk(
             session_id,
             "action",
             "Status",
             "Call completed. Zero persistence confirmed.",
         )
+        return
+
+    await manager.send_data_count(
+        session_id, sum(1 for name in CITIZEN_DATA_FIELDS if state.get(name))
+    )
+
+
+async def receive_client_messages(websocket: WebSocket, session_id: str):
+    """
+    Read what the client sends while the call runs: binary messages are
+    audio frames, text messages are JSON control events.
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            manager.disconnect(session_id)
+            return
+        if message.get("bytes") is not None:
+            await manager.handle_audio_frame(session_id, message["bytes"])
+        elif message.get("text"):
+            await manager.handle_control(session_id, message["text"])
+
+
+@app.websocket("/ws/call")
+async def websocket_endpoint(websocket: WebSocket):
+    """
+    Main WebSocket endpoint for real call processing.
+    Runs the call through the compiled workflow FSM and streams each node's
+    update to the client as it completes.
+    """
+    session_id = str(uuid.uuid4())[:8]
+    receiver = None
+
+    try:
+        await manager.connect(websocket, session_id)
+        # The grievance comes from the caller's speech when STT is available
+        speech_input = speech_inputs.attach(
+            session_id, listener=lambda hypothesis: manager.send_hypothesis(session_id, hypothesis)
+        )
+        receiver = asyncio.create_task(receive_client_messages(websocket, session_id))
+
+        # In production: caller details come from the audio stream (STT)
+        agent_state = AgentState(
+            session_id=session_id,
+            call_timestamp=datetime.now().isoformat(),
+            citizen_name="Amit Singh",
+            citizen_phone="+91-9876543210",
+            citizen_location="Lajpat Nagar, Delhi",
+            grievance_description=(
+                "" if speech_input else "Streetlight near my home hasn't worked for a month"
+            ),
+        )
+
+        # Enforces the call budget; an overrun ends in a forced wipe update
+        async for update in stream_call(agent_state, workflow):
+            for node, node_state in update.items():
+                await stream_node_update(session_id, node, node_state or {})
 
         # End connection after showing completion
         await asyncio.sleep(2)
+        receiver.cancel()
         await websocket.close()
+        manager.disconnect(session_id)
 
     except WebSocketDisconnect:
         manager.disconnect(session_id)
@@ -323,6 +515,10 @@ async def websocket_endpoint(websocket: WebSocket):
         except:
             pass
 
+    finally:
+        if receiver is not None:
+            receiver.cancel()
+
 
 @app.get("/health")
 async def health():
@@ -337,6 +533,68 @@ async def health():
     }
 
 
+@app.get("/metrics/escalation")
+async def escalation_metrics():
+    """Policy table bypass rate and agreement with the deep model."""
+    return escalation_policy.get_policy_stats()
+
+
+@app.get("/metrics/budget")
+async def budget_metrics():
+    """How often calls degraded or were force-wiped at their deadline."""
+    return call_budget.get_budget_stats()
+
+
+@app.get("/metrics/tts")
+async def tts_metrics():
+    """Synthesis queue depth, in-flight requests and cancellations."""
+    return synthesis_service.get_synthesis_stats()
+
+
+@app.get("/metrics/phrase-cache")
+async def phrase_cache_metrics():
+    """Hit rate and size of the pre-rendered phrase cache."""
+    return phrase_cache.get_cache_stats()
+
+
+@app.get("/metrics/stt")
+async def stt_metrics():
+    """STT worker processes: calls, queued messages, backlog and real-time factor per worker."""
+    return stt_pool.get_pool_stats()
+
+
+@app.get("/metrics/bandwidth")
+async def bandwidth_metrics():
+    """Audio codec and bytes on the wire per live call, plus totals of ended calls."""
+    now = datetime.now()
+    sessions = {}
+    for session_id, call in manager.session_states.items():
+        seconds = max((now - call["started_at"]).total_seconds(), 1e-3)
+        sessions[session_id] = {
+            "outbound_codec": call["audio_out_codec"].name.lower(),
+            "inbound_codec": call["audio_in_codec"].name.lower(),
+            "audio_bytes_out": call["audio_bytes_out"],
+            "audio_bytes_in": call["audio_bytes_in"],
+            "kbps_out": round(call["audio_bytes_out"] * 8 / 1000 / seconds, 1),
+            "kbps_in": round(call["audio_bytes_in"] * 8 / 1000 / seconds, 1),
+            "frames_rejected": call["audio_in_rejected"],
+            "seconds": round(seconds, 1),
+        }
+    return {"sessions": sessions, "ended": dict(manager.bandwidth_totals)}
+
+
+@app.get("/metrics/vad")
+async def vad_metrics():
+    """Caller audio seen by the VAD, the fraction skipped as silence, and turns detected."""
+    return vad_stats.get_vad_stats()
+
+
+@app.get("/profile")
+async def latency_profile():
+    """p50/p95/p99 per workflow node, LLM and Redis call, plus the critical path."""
+    return profiler.get_profile()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -346,6 +604,14 @@ async def root():
         "endpoints": {
             "websocket": "ws://localhost:8000/ws/call",
             "health": "GET /health",
+            "escalation_metrics": "GET /metrics/escalation",
+            "latency_profile": "GET /profile",
+            "budget_metrics": "GET /metrics/budget",
+            "tts_metrics": "GET /metrics/tts",
+            "phrase_cache_metrics": "GET /metrics/phrase-cache",
+            "stt_metrics": "GET /metrics/stt",
+            "bandwidth_metrics": "GET /metrics/bandwidth",
+            "vad_metrics": "GET /metrics/vad",
             "frontend": "http://localhost:3000",
         },
         "features": [